@@ -0,0 +1,508 @@
+"""
+Drives concurrent traffic at every route of api_spec.yaml and reports
+throughput and p50/p95/p99 latency per route, comparing them with
+stored baseline.
+
+Usage: python -m benchmarks.api_load [--users 20] [--reminders 50]
+    [--concurrency 16] [--duration 3] [--routes "GET /reminders/" ...]
+    [--baseline benchmarks/baseline.json] [--save-baseline]
+    [--threshold 0.2]
+
+Database is seeded with --users users having --reminders reminders each,
+then routes are loaded one after another, reads before writes.
+Baseline is only comparable with runs on the same machine with the same
+arguments, so record it with --save-baseline before making changes.
+Exits with code 1 if throughput of any route dropped or its p95/p99
+latency grew by more than threshold. Load is generated from the same
+process as server, so absolute numbers are lower than in production.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import re
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Any, Callable
+from urllib.parse import quote
+
+import aiohttp
+
+from .common import LatencyRecorder, running_application
+
+API_SPEC_PATH: Path = Path(__file__).parent.parent / "api_spec.yaml"
+DEFAULT_BASELINE_PATH: Path = Path(__file__).parent / "baseline.json"
+PASSWORD: str = "benchmark_pass"
+REMINDER_BODY: dict[str, Any] = {
+    "title": "Benchmark reminder",
+    "description": "Buy groceries and pick up the parcel on the way",
+    "color_code": "00FF00",
+    "triggered_at": "2030-01-01T10:00:00+00:00",
+    "is_periodic": False,
+    "trigger_period": 0
+}
+BATCH_SIZE: int = 10
+
+
+@dataclass
+class SeededUser:
+    """
+    User created before load, with reminders it owns.
+    """
+
+    username: str
+    token: str
+    reminder_ids: list[int] = field(default_factory=list)
+
+
+@dataclass
+class RequestSpec:
+    """
+    Single request of scenario.
+    """
+
+    path: str
+    json: Any = None
+    token: str | None = None
+
+
+@dataclass
+class Scenario:
+    """
+    Traffic sent to one route of API.
+    """
+
+    method: str
+    # Route as it's written in api_spec.yaml
+    route: str
+    make_request: Callable[[SeededUser, random.Random], RequestSpec]
+    # Variant of route, when it's loaded with different parameters
+    variant: str = ""
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.route}{self.variant}"
+
+
+class RouteResult:
+    """
+    Latencies and statuses of requests sent to route.
+    """
+
+    def __init__(self) -> None:
+        self.latencies: LatencyRecorder = LatencyRecorder()
+        self.statuses: dict[int, int] = {}
+        self.elapsed: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        return len(self.latencies.samples) / self.elapsed
+
+    @property
+    def errors(self) -> int:
+        return sum(
+            count for status, count in self.statuses.items()
+            if status >= 400
+        )
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "throughput": self.throughput,
+            "p50": self.latencies.percentile(50),
+            "p95": self.latencies.percentile(95),
+            "p99": self.latencies.percentile(99),
+        }
+
+
+def read_spec_routes(path: Path) -> set[str]:
+    """
+    Lists routes of API specification without parsing whole YAML.
+
+    :param path: path to api_spec.yaml.
+    :return: set of "METHOD /path" strings.
+    """
+    routes: set[str] = set()
+    current_path: str | None = None
+    for line in path.read_text(encoding="utf-8").splitlines():
+        path_match = re.match(r"^  (/\S*):\s*$", line)
+        if path_match:
+            current_path = path_match.group(1)
+            continue
+
+        method_match = re.match(
+            r"^    (get|post|put|patch|delete):\s*$", line
+        )
+        if method_match and current_path is not None:
+            routes.add(f"{method_match.group(1).upper()} {current_path}")
+
+    return routes
+
+
+def make_scenarios(since: str) -> list[Scenario]:
+    """
+    Creates scenarios for every route, reads first, then writes
+    and logins.
+
+    :param since: moment before database was seeded.
+    :return: list of scenarios.
+    """
+    new_users = itertools.count()
+
+    def random_reminder(user: SeededUser, rng: random.Random) -> str:
+        return f"/reminders/{rng.choice(user.reminder_ids)}"
+
+    def random_batch(user: SeededUser, rng: random.Random) -> list[int]:
+        return rng.sample(
+            user.reminder_ids, min(BATCH_SIZE, len(user.reminder_ids))
+        )
+
+    return [
+        Scenario(
+            "GET", "/reminders/",
+            lambda user, rng: RequestSpec("/reminders/", token=user.token)
+        ),
+        Scenario(
+            "GET", "/reminders/",
+            lambda user, rng: RequestSpec(
+                "/reminders/?limit=20", token=user.token
+            ),
+            variant="?limit=20"
+        ),
+        Scenario(
+            "GET", "/reminders/",
+            lambda user, rng: RequestSpec(
+                f"/reminders/?since={quote(since)}", token=user.token
+            ),
+            variant="?since"
+        ),
+        Scenario(
+            "GET", "/reminders/{reminderId}",
+            lambda user, rng: RequestSpec(
+                random_reminder(user, rng), token=user.token
+            )
+        ),
+        Scenario(
+            "POST", "/users/register",
+            lambda user, rng: RequestSpec(
+                "/users/register",
+                {
+                    "username": f"bench_new_{next(new_users):08d}",
+                    "password": PASSWORD
+                }
+            )
+        ),
+        Scenario(
+            "POST", "/users/logout",
+            lambda user, rng: RequestSpec("/users/logout", token=user.token)
+        ),
+        Scenario(
+            "POST", "/reminders/",
+            lambda user, rng: RequestSpec(
+                "/reminders/", REMINDER_BODY, user.token
+            )
+        ),
+        Scenario(
+            "POST", "/reminders/batch",
+            lambda user, rng: RequestSpec(
+                "/reminders/batch", [REMINDER_BODY] * BATCH_SIZE, user.token
+            )
+        ),
+        Scenario(
+            "PATCH", "/reminders/{reminderId}",
+            lambda user, rng: RequestSpec(
+                random_reminder(user, rng),
+                {"title": f"Updated {rng.randrange(1000)}"}, user.token
+            )
+        ),
+        Scenario(
+            "PATCH", "/reminders/batch",
+            lambda user, rng: RequestSpec(
+                "/reminders/batch",
+                {
+                    "ids": random_batch(user, rng),
+                    "fields": {"color_code": f"{rng.randrange(256**3):06X}"}
+                },
+                user.token
+            )
+        ),
+        Scenario(
+            "DELETE", "/reminders/{reminderId}",
+            lambda user, rng: RequestSpec(
+                random_reminder(user, rng), token=user.token
+            )
+        ),
+        Scenario(
+            "DELETE", "/reminders/batch",
+            lambda user, rng: RequestSpec(
+                "/reminders/batch", {"ids": random_batch(user, rng)},
+                user.token
+            )
+        ),
+        # Many logins drop oldest tokens of user, so it goes after all
+        # scenarios that use seeded tokens
+        Scenario(
+            "POST", "/users/login",
+            lambda user, rng: RequestSpec(
+                "/users/login",
+                {"username": user.username, "password": PASSWORD}
+            )
+        ),
+    ]
+
+
+async def seed_users(
+    client: aiohttp.ClientSession, base_url: str,
+    users: int, reminders: int
+) -> list[SeededUser]:
+    """
+    Registers users and creates their reminders through API.
+
+    :param client: http client.
+    :param base_url: url of server.
+    :param users: amount of users.
+    :param reminders: amount of reminders of each user.
+    :return: seeded users.
+    """
+    seeded: list[SeededUser] = []
+    for number in range(users):
+        credentials = {
+            "username": f"bench_user_{number:06d}", "password": PASSWORD
+        }
+        async with client.post(
+            f"{base_url}/users/register", json=credentials
+        ) as response:
+            response.raise_for_status()
+
+        async with client.post(
+            f"{base_url}/users/login", json=credentials
+        ) as response:
+            response.raise_for_status()
+            user = SeededUser(
+                credentials["username"], response.cookies["UserToken"].value
+            )
+
+        for offset in range(0, reminders, 1000):
+            async with client.post(
+                f"{base_url}/reminders/batch",
+                json=[REMINDER_BODY] * min(1000, reminders - offset),
+                headers={"Cookie": f"UserToken={user.token}"}
+            ) as response:
+                response.raise_for_status()
+                body = await response.json()
+                user.reminder_ids.extend(
+                    item["event_id"] for item in body["created"]
+                )
+
+        seeded.append(user)
+
+    return seeded
+
+
+async def load_route(
+    client: aiohttp.ClientSession, base_url: str, scenario: Scenario,
+    users: list[SeededUser], concurrency: int, duration: float
+) -> RouteResult:
+    """
+    Sends requests of scenario from several concurrent clients.
+
+    :param client: http client.
+    :param base_url: url of server.
+    :param scenario: scenario of route.
+    :param users: seeded users requests are made for.
+    :param concurrency: amount of concurrent clients.
+    :param duration: seconds of load.
+    :return: results of route.
+    """
+    result = RouteResult()
+    started_at: float = time.perf_counter()
+    deadline: float = started_at + duration
+
+    async def send_requests(seed: int) -> None:
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            request: RequestSpec = scenario.make_request(
+                rng.choice(users), rng
+            )
+            headers: dict[str, str] = {}
+            if request.token is not None:
+                headers["Cookie"] = f"UserToken={request.token}"
+
+            request_started_at: float = time.perf_counter()
+            async with client.request(
+                scenario.method, base_url + request.path,
+                json=request.json, headers=headers
+            ) as response:
+                await response.read()
+
+            result.latencies.record(request_started_at)
+            result.statuses[response.status] = result.statuses.get(
+                response.status, 0
+            ) + 1
+
+    await asyncio.gather(*map(send_requests, range(concurrency)))
+    result.elapsed = time.perf_counter() - started_at
+    return result
+
+
+def find_regressions(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]], threshold: float
+) -> list[str]:
+    """
+    Compares results with baseline.
+
+    :param results: metrics of routes.
+    :param baseline: metrics of routes from baseline.
+    :param threshold: allowed relative change.
+    :return: descriptions of regressions.
+    """
+    regressions: list[str] = []
+    for name, current in results.items():
+        previous: dict[str, float] | None = baseline.get(name)
+        if previous is None:
+            continue
+
+        if current["throughput"] < previous["throughput"] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {current['throughput']:.0f} req/s, "
+                f"baseline {previous['throughput']:.0f} req/s"
+            )
+
+        for percentile in ("p95", "p99"):
+            if current[percentile] > previous[percentile] * (1 + threshold):
+                regressions.append(
+                    f"{name}: {percentile} "
+                    f"{current[percentile] * 1000:.2f}ms, "
+                    f"baseline {previous[percentile] * 1000:.2f}ms"
+                )
+
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> int:
+    since: str = datetime.now(UTC).isoformat()
+    scenarios: list[Scenario] = make_scenarios(since)
+    uncovered: set[str] = read_spec_routes(API_SPEC_PATH) - {
+        f"{scenario.method} {scenario.route}" for scenario in scenarios
+    }
+    for route in sorted(uncovered):
+        print(f"warning: {route} from api_spec.yaml is not loaded")
+
+    if args.routes:
+        scenarios = [
+            scenario for scenario in scenarios
+            if scenario.name in args.routes
+        ]
+
+    results: dict[str, dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        db_url: str = args.database_url or (
+            f"sqlite+aiosqlite:///{Path(directory) / 'bench.db'}"
+        )
+        async with running_application(db_url) as server:
+            base_url: str = str(server.make_url("")).rstrip("/")
+            connector = aiohttp.TCPConnector(limit=args.concurrency)
+            async with aiohttp.ClientSession(
+                connector=connector,
+                cookie_jar=aiohttp.DummyCookieJar()
+            ) as client:
+                seeding_started_at: float = time.perf_counter()
+                users: list[SeededUser] = await seed_users(
+                    client, base_url, args.users, args.reminders
+                )
+                print(
+                    f"seeded {args.users} users with {args.reminders} "
+                    f"reminders each in "
+                    f"{time.perf_counter() - seeding_started_at:.1f}s"
+                )
+                print(
+                    f"{'route':<34} {'req/s':>8} {'p50':>9} {'p95':>9} "
+                    f"{'p99':>9} {'errors':>7}"
+                )
+                for scenario in scenarios:
+                    result: RouteResult = await load_route(
+                        client, base_url, scenario, users,
+                        args.concurrency, args.duration
+                    )
+                    results[scenario.name] = result.as_dict()
+                    print(
+                        f"{scenario.name:<34} {result.throughput:>8.0f} "
+                        f"{result.latencies.percentile(50) * 1000:>7.2f}ms "
+                        f"{result.latencies.percentile(95) * 1000:>7.2f}ms "
+                        f"{result.latencies.percentile(99) * 1000:>7.2f}ms "
+                        f"{result.errors:>7}"
+                    )
+
+    arguments: dict[str, Any] = {
+        "users": args.users, "reminders": args.reminders,
+        "concurrency": args.concurrency, "duration": args.duration
+    }
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(
+            {"arguments": arguments, "routes": results}, indent=2
+        ))
+        print(f"baseline saved to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}, run with --save-baseline")
+        return 0
+
+    baseline: dict[str, Any] = json.loads(args.baseline.read_text())
+    if baseline["arguments"] != arguments:
+        print(
+            f"warning: baseline was recorded with {baseline['arguments']}, "
+            f"results may be incomparable"
+        )
+
+    regressions: list[str] = find_regressions(
+        results, baseline["routes"], args.threshold
+    )
+    for regression in regressions:
+        print(f"regression: {regression}")
+
+    if not regressions:
+        print(f"no regressions beyond {args.threshold:.0%} of baseline")
+
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--reminders", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--duration", type=float, default=3.0,
+        help="seconds of load for each route"
+    )
+    parser.add_argument(
+        "--routes", nargs="+",
+        help="names of routes to load, as printed in results"
+    )
+    parser.add_argument(
+        "--database-url",
+        help="database to run against (temporary aiosqlite file by default,"
+             " other databases are recreated)"
+    )
+    parser.add_argument(
+        "--baseline", type=Path, default=DEFAULT_BASELINE_PATH
+    )
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2,
+        help="relative change of throughput or latency considered regression"
+    )
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
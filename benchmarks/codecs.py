@@ -0,0 +1,71 @@
+"""
+Compares JSON and msgpack codecs on typical lists of reminders:
+encode and decode time and payload size.
+
+Usage: python -m benchmarks.codecs [--sizes 10 100 1000] [--repeats N]
+"""
+import argparse
+import timeit
+from datetime import datetime, timedelta, UTC
+
+from src.DTO.codecs import Codec, JSON_CODEC, MSGPACK_CODEC
+from src.DTO.reminder_DTO import ReminderDTO
+
+
+def make_reminders(amount: int) -> list[ReminderDTO]:
+    now: datetime = datetime.now(UTC)
+    return [
+        ReminderDTO(
+            id=number,
+            title=f"Reminder number {number}",
+            description="Buy groceries and pick up the parcel on the way",
+            color_code=f"{number * 2654435761 % 256**3:06X}",
+            is_active=True,
+            is_periodic=number % 3 == 0,
+            created_at=now - timedelta(days=number),
+            last_edited_at=now - timedelta(hours=number),
+            triggered_at=now + timedelta(days=number % 30),
+            trigger_period=number % 3 * 7
+        )
+        for number in range(1, amount + 1)
+    ]
+
+
+def measure(
+    codec: Codec, reminders: list[ReminderDTO], repeats: int
+) -> tuple[float, float, int]:
+    body: bytes = codec.encode(reminders)
+    encode_time: float = min(timeit.repeat(
+        lambda: codec.encode(reminders), number=repeats, repeat=5
+    )) / repeats
+    decode_time: float = min(timeit.repeat(
+        lambda: codec.decode(body), number=repeats, repeat=5
+    )) / repeats
+    return encode_time, decode_time, len(body)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10, 100, 1000]
+    )
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'reminders':>9} {'codec':>20} {'encode':>10} "
+          f"{'decode':>10} {'bytes':>8}")
+    for size in args.sizes:
+        reminders: list[ReminderDTO] = make_reminders(size)
+        for codec in (JSON_CODEC, MSGPACK_CODEC):
+            encode_time, decode_time, length = measure(
+                codec, reminders, args.repeats
+            )
+            print(
+                f"{size:>9} {codec.content_type:>20} "
+                f"{encode_time * 1e6:>8.1f}us {decode_time * 1e6:>8.1f}us "
+                f"{length:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
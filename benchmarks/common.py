@@ -0,0 +1,68 @@
+import statistics
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.models.initialize_connector import (
+    create_engine, create_session_factory, reinitialize_db
+)
+from src.models.replicas import ReplicaOptions, ReplicaSet
+from src.views import init_application_routes
+
+
+@asynccontextmanager
+async def running_application(
+    connection_url: str
+) -> AsyncIterator[TestServer]:
+    """
+    Starts RemindMe application on random local port with fresh database.
+
+    :param connection_url: connection string for database
+    (aiosqlite is good enough for benchmarking).
+    :return: started test server.
+    """
+    engine = create_engine(connection_url)
+    await reinitialize_db(engine)
+
+    app: web.Application = web.Application()
+    app["session_maker"] = create_session_factory(engine)
+    app["replicas"] = ReplicaSet(app["session_maker"], ReplicaOptions())
+    init_application_routes(app)
+
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        yield server
+
+    finally:
+        await server.close()
+        await engine.dispose()
+
+
+class LatencyRecorder:
+    """
+    Collects latencies of requests in seconds.
+    """
+
+    def __init__(self) -> None:
+        self.samples: list[float] = []
+
+    def record(self, started_at: float) -> None:
+        self.samples.append(time.perf_counter() - started_at)
+
+    def percentile(self, percent: int) -> float:
+        if len(self.samples) < 2:
+            return self.samples[0] if self.samples else 0.0
+
+        return statistics.quantiles(self.samples, n=100)[percent - 1]
+
+    def summary(self) -> str:
+        return (
+            f"n={len(self.samples)} "
+            f"p50={self.percentile(50) * 1000:.2f}ms "
+            f"p95={self.percentile(95) * 1000:.2f}ms "
+            f"p99={self.percentile(99) * 1000:.2f}ms"
+        )
@@ -0,0 +1,117 @@
+"""
+Measures /reminders/ latency while /users/login is idle and under load.
+
+Usage: python -m benchmarks.login_load [--executor thread|process|inline]
+
+"inline" reproduces old behaviour, where hashing blocked event loop.
+Load is generated from the same process, so results are only meaningful
+on machines with more cores than hashing workers.
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import aiohttp
+
+from src.models.password_hasher import hash_password, password_hasher
+from .common import LatencyRecorder, running_application
+
+CREDENTIALS = {"username": "benchmark_user", "password": "benchmark_pass"}
+# Many logins drop oldest tokens of user, so flooding user differs
+# from polling one
+FLOOD_CREDENTIALS = {"username": "flood_user", "password": "benchmark_pass"}
+
+
+async def poll_reminders(
+    client: aiohttp.ClientSession, url: str,
+    recorder: LatencyRecorder, duration: float
+) -> None:
+    deadline: float = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started_at: float = time.perf_counter()
+        async with client.get(url) as response:
+            await response.read()
+        recorder.record(started_at)
+
+
+async def flood_logins(
+    url: str, duration: float, statuses: dict[int, int]
+) -> None:
+    deadline: float = time.perf_counter() + duration
+    async with aiohttp.ClientSession() as client:
+        while time.perf_counter() < deadline:
+            async with client.post(
+                url, json=FLOOD_CREDENTIALS
+            ) as response:
+                statuses[response.status] = statuses.get(
+                    response.status, 0
+                ) + 1
+
+
+async def hash_password_inline(password: str, salt: str) -> str:
+    return hash_password(password, salt)
+
+
+async def run(args: argparse.Namespace) -> None:
+    if args.executor == "inline":
+        setattr(password_hasher, "hash_password", hash_password_inline)
+
+    else:
+        password_hasher.configure(
+            args.executor, args.workers, args.max_queue
+        )
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_url = f"sqlite+aiosqlite:///{Path(directory) / 'bench.db'}"
+        async with running_application(db_url) as server:
+            client = aiohttp.ClientSession(
+                cookie_jar=aiohttp.CookieJar(unsafe=True)
+            )
+            for credentials in (CREDENTIALS, FLOOD_CREDENTIALS):
+                await client.post(
+                    server.make_url("/users/register"), json=credentials
+                )
+
+            await client.post(server.make_url("/users/login"), json=CREDENTIALS)
+            reminders_url = server.make_url("/reminders/")
+
+            idle = LatencyRecorder()
+            await poll_reminders(client, reminders_url, idle, args.duration)
+
+            loaded = LatencyRecorder()
+            statuses: dict[int, int] = {}
+            await asyncio.gather(
+                poll_reminders(client, reminders_url, loaded, args.duration),
+                *(
+                    flood_logins(
+                        server.make_url("/users/login"),
+                        args.duration, statuses
+                    )
+                    for _ in range(args.login_concurrency)
+                )
+            )
+            await client.close()
+
+    password_hasher.shutdown()
+    print(f"executor: {args.executor}")
+    print(f"/reminders/ idle:           {idle.summary()}")
+    print(f"/reminders/ under login load: {loaded.summary()}")
+    print(f"/users/login statuses: {statuses}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--executor", choices=("thread", "process", "inline"), default="thread"
+    )
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-queue", type=int, default=64)
+    parser.add_argument("--login-concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
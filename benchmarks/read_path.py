@@ -0,0 +1,117 @@
+"""
+Compares serializing users reminders from hydrated ORM objects against
+plain rows of REMINDER_COLUMNS, reporting time and peak memory.
+
+Usage: python -m benchmarks.read_path [--reminders N] [--repeats N]
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.DTO.reminder_DTO import ReminderDTO
+from src.models.initialize_connector import (
+    create_engine, create_session_factory, reinitialize_db
+)
+from src.models.reminder import Reminder
+from src.models.user import User
+
+
+async def serialize_orm(session: AsyncSession, user_id: int) -> bytes:
+    reminders = (
+        await session.execute(
+            select(Reminder).where(
+                Reminder.authored_by_user_id == user_id,
+                Reminder.is_active.is_(True)
+            ).order_by(Reminder.id)
+        )
+    ).scalars().all()
+    return orjson.dumps(
+        [ReminderDTO.from_reminder(reminder) for reminder in reminders]
+    )
+
+
+async def serialize_rows(session: AsyncSession, user_id: int) -> bytes:
+    reminders = await Reminder.get_active_reminders_of_user(user_id, session)
+    return orjson.dumps(
+        [ReminderDTO.from_row(reminder) for reminder in reminders]
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(
+            f"sqlite+aiosqlite:///{Path(directory) / 'bench.db'}"
+        )
+        await reinitialize_db(engine)
+        session_maker = create_session_factory(engine)
+
+        async with session_maker() as session:
+            await User.register_user(
+                "benchmark_user", "benchmark_pass", session
+            )
+
+        async with session_maker() as session, session.begin():
+            user_id: int = (
+                await session.execute(select(User.id))
+            ).scalar_one()
+            await Reminder.create_new_reminders(
+                user_id,
+                [
+                    {
+                        "title": f"Reminder {number}",
+                        "description": "Benchmark reminder description",
+                        "color_code": f"{number % 256**3:06X}",
+                        "triggered_at": datetime.now(UTC),
+                        "is_periodic": number % 2 == 0,
+                        "trigger_period": number % 30,
+                    }
+                    for number in range(args.reminders)
+                ],
+                session
+            )
+
+        serializers: dict[
+            str, Callable[[AsyncSession, int], Awaitable[bytes]]
+        ] = {"orm": serialize_orm, "rows": serialize_rows}
+        bodies: dict[str, bytes] = {}
+        for name, serialize in serializers.items():
+            timings: list[float] = []
+            for _ in range(args.repeats):
+                async with session_maker() as session, session.begin():
+                    started_at: float = time.perf_counter()
+                    bodies[name] = await serialize(session, user_id)
+                    timings.append(time.perf_counter() - started_at)
+
+            async with session_maker() as session, session.begin():
+                tracemalloc.start()
+                await serialize(session, user_id)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+            print(
+                f"{name:>4}: best {min(timings) * 1000:.1f}ms, "
+                f"peak memory {peak / 2**20:.1f}MiB"
+            )
+
+        print(f"identical bodies: {bodies['orm'] == bodies['rows']}")
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reminders", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=5)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
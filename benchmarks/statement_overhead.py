@@ -0,0 +1,106 @@
+"""
+Compares per call cost of building reminder lookup statements inline
+against executing prebuilt statements with bound parameters.
+
+Usage: python -m benchmarks.statement_overhead [--iterations N]
+
+Both variants select the same columns and hit SQLAlchemy compiled
+cache, so difference shows time spent constructing statement and
+computing its cache key.
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import and_, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.initialize_connector import (
+    create_engine, create_session_factory, reinitialize_db
+)
+from src.models.reminder import (
+    REMINDER_BY_ID_QUERY, REMINDER_COLUMNS, Reminder
+)
+from src.models.user import User
+
+
+async def fetch_inline(
+    session: AsyncSession, user_id: int, reminder_id: int
+) -> Row[Any] | None:
+    query = select(*REMINDER_COLUMNS).where(
+        and_(
+            Reminder.authored_by_user_id == user_id,
+            Reminder.id == reminder_id
+        )
+    )
+    return (await session.execute(query)).first()
+
+
+async def fetch_prebuilt(
+    session: AsyncSession, user_id: int, reminder_id: int
+) -> Row[Any] | None:
+    return (
+        await session.execute(
+            REMINDER_BY_ID_QUERY,
+            {"user_id": user_id, "reminder_id": reminder_id}
+        )
+    ).first()
+
+
+async def run(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(
+            f"sqlite+aiosqlite:///{Path(directory) / 'bench.db'}"
+        )
+        await reinitialize_db(engine)
+        session_maker = create_session_factory(engine)
+
+        async with session_maker() as session:
+            await User.register_user(
+                "benchmark_user", "benchmark_pass", session
+            )
+
+        async with session_maker() as session, session.begin():
+            user_id: int = (
+                await session.execute(select(User.id))
+            ).scalar_one()
+            reminder = await Reminder.create_new_reminder(
+                user_id, "Benchmark", "", "FFFFFF",
+                datetime.now(UTC), False, 0, session
+            )
+            assert reminder is not None
+            reminder_id: int = reminder.id
+
+        for name, fetch in (
+            ("inline", fetch_inline), ("prebuilt", fetch_prebuilt)
+        ):
+            async with session_maker() as session, session.begin():
+                # Warm up compiled cache and connection
+                await fetch(session, user_id, reminder_id)
+
+                started_at: float = time.perf_counter()
+                for _ in range(args.iterations):
+                    await fetch(session, user_id, reminder_id)
+
+                elapsed: float = time.perf_counter() - started_at
+
+            print(
+                f"{name:>8}: {elapsed / args.iterations * 1e6:.1f}us per call"
+            )
+
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=5000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
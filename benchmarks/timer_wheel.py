@@ -0,0 +1,115 @@
+"""
+Measures timer wheel of trigger schedule with many scheduled reminders:
+memory per entry, cost of scheduling and cancelling, and cost of ticks
+while whole horizon passes. Heap of (time, id) tuples is measured
+for comparison.
+
+Usage: python -m benchmarks.timer_wheel [--reminders 1000000]
+    [--horizon 86400] [--tick 0.1]
+"""
+import argparse
+import heapq
+import random
+import time
+import tracemalloc
+
+from src.models.trigger_schedule import TimerWheel
+
+ORIGIN: float = 1_700_000_000.0
+
+
+def measure_heap(times: list[float]) -> None:
+    tracemalloc.start()
+    started_at: float = time.perf_counter()
+    heap: list[tuple[float, int]] = []
+    for reminder_id, when in enumerate(times):
+        heapq.heappush(heap, (when, reminder_id))
+
+    elapsed: float = time.perf_counter() - started_at
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"heap:  schedule {elapsed / len(times) * 1e6:.2f}us/entry, "
+        f"{memory / len(times):.0f} bytes/entry"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reminders", type=int, default=1_000_000)
+    parser.add_argument("--horizon", type=float, default=86400.0)
+    parser.add_argument("--tick", type=float, default=0.1)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    times: list[float] = [
+        ORIGIN + rng.uniform(0, args.horizon) for _ in range(args.reminders)
+    ]
+
+    tracemalloc.start()
+    started_at: float = time.perf_counter()
+    wheel = TimerWheel(args.tick, origin=ORIGIN)
+    for reminder_id, when in enumerate(times):
+        wheel.schedule(reminder_id, when)
+
+    elapsed: float = time.perf_counter() - started_at
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"wheel: schedule {elapsed / args.reminders * 1e6:.2f}us/entry, "
+        f"{memory / args.reminders:.0f} bytes/entry"
+    )
+    measure_heap(times)
+
+    # Every tenth reminder is moved and every tenth is deactivated
+    changed: list[int] = rng.sample(
+        range(args.reminders), args.reminders // 5
+    )
+    moved: list[int] = changed[:len(changed) // 2]
+    cancelled: list[int] = changed[len(changed) // 2:]
+    started_at = time.perf_counter()
+    for reminder_id in moved:
+        times[reminder_id] = ORIGIN + rng.uniform(0, args.horizon)
+        wheel.schedule(reminder_id, times[reminder_id])
+
+    print(
+        f"wheel: reschedule "
+        f"{(time.perf_counter() - started_at) / len(moved) * 1e6:.2f}us"
+    )
+    started_at = time.perf_counter()
+    for reminder_id in cancelled:
+        wheel.cancel(reminder_id)
+
+    print(
+        f"wheel: cancel "
+        f"{(time.perf_counter() - started_at) / len(cancelled) * 1e6:.2f}us"
+    )
+
+    tick_durations: list[float] = []
+    fired: int = 0
+    late: float = 0.0
+    tick_count: int = int(args.horizon / args.tick) + 1
+    for number in range(1, tick_count + 1):
+        now: float = ORIGIN + number * args.tick
+        tick_started_at: float = time.perf_counter()
+        fired_ids: list[int] = wheel.advance(now)
+        tick_durations.append(time.perf_counter() - tick_started_at)
+        fired += len(fired_ids)
+        for reminder_id in fired_ids:
+            late = max(late, now - times[reminder_id])
+
+    tick_durations.sort()
+    print(
+        f"wheel: {tick_count} ticks, "
+        f"mean {sum(tick_durations) / tick_count * 1e6:.2f}us "
+        f"p99 {tick_durations[int(tick_count * 0.99)] * 1e6:.2f}us "
+        f"max {tick_durations[-1] * 1e6:.0f}us"
+    )
+    print(
+        f"wheel: fired {fired} of {args.reminders - len(cancelled)} "
+        f"reminders, at most {late * 1000:.0f}ms after trigger time"
+    )
+
+
+if __name__ == "__main__":
+    main()
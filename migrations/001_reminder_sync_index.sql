@@ -0,0 +1,3 @@
+-- Index used by GET /reminders/?since=... for fetching changed reminders
+CREATE INDEX IF NOT EXISTS ix_reminder_author_last_edited
+    ON reminder (authored_by_user_id, last_edited_at);
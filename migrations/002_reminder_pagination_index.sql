@@ -0,0 +1,3 @@
+-- Index used by GET /reminders/?limit=... for paginating reminders by id
+CREATE INDEX IF NOT EXISTS ix_reminder_author_id
+    ON reminder (authored_by_user_id, id);
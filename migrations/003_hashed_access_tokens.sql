@@ -0,0 +1,9 @@
+-- Stores SHA-256 digests of access tokens instead of tokens themselves,
+-- tokens issued before migration keep working
+BEGIN;
+ALTER TABLE "user" ADD COLUMN access_token_digest BYTEA;
+UPDATE "user" SET access_token_digest = sha256(convert_to(access_token, 'UTF8'));
+ALTER TABLE "user" ALTER COLUMN access_token_digest SET NOT NULL;
+CREATE UNIQUE INDEX ix_user_access_token_digest ON "user" (access_token_digest);
+ALTER TABLE "user" DROP COLUMN access_token;
+COMMIT;
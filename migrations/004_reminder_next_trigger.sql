@@ -0,0 +1,14 @@
+-- Next trigger time of reminders used by dispatcher. Reminders that were
+-- due before migration are not fired, periodic ones move to next occurrence
+BEGIN;
+ALTER TABLE reminder ADD COLUMN next_trigger_at TIMESTAMP WITH TIME ZONE;
+UPDATE reminder SET next_trigger_at = CASE
+    WHEN triggered_at > now() THEN triggered_at
+    WHEN is_periodic AND trigger_period > 0 THEN triggered_at
+        + trigger_period * interval '1 day' * (floor(
+            extract(EPOCH FROM now() - triggered_at) / (trigger_period * 86400)
+        ) + 1)
+END
+WHERE is_active;
+CREATE INDEX ix_reminder_next_trigger_at ON reminder (next_trigger_at);
+COMMIT;
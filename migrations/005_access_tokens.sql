@@ -0,0 +1,15 @@
+-- Every login gets its own access token instead of replacing the only
+-- token of user, tokens issued before migration keep working
+BEGIN;
+CREATE TABLE access_token (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES "user" (id),
+    digest BYTEA NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+CREATE INDEX ix_access_token_user_id ON access_token (user_id);
+CREATE UNIQUE INDEX ix_access_token_digest ON access_token (digest);
+INSERT INTO access_token (user_id, digest)
+    SELECT id, access_token_digest FROM "user";
+ALTER TABLE "user" DROP COLUMN access_token_digest;
+COMMIT;
@@ -0,0 +1,176 @@
+from dataclasses import fields, is_dataclass
+from datetime import datetime, UTC
+from functools import partial
+from operator import attrgetter
+from typing import Any, Callable, Iterable
+
+import msgpack  # type: ignore[import-untyped]
+import orjson
+
+
+class MalformedBody(ValueError):
+    """
+    Raised when request body can't be decoded.
+    """
+
+
+class Codec:
+    """
+    Encodes DTOs into bytes of specific media type and decodes
+    request bodies of that type.
+    """
+
+    def __init__(
+        self, content_type: str,
+        encode: Callable[[Any], bytes], decode: Callable[[bytes], Any],
+        decode_errors: tuple[type[Exception], ...]
+    ):
+        """
+        :param content_type: media type of encoded data.
+        :param encode: function that encodes value.
+        :param decode: function that decodes bytes.
+        :param decode_errors: exceptions raised by decode on invalid data.
+        """
+        self.content_type: str = content_type
+        self._encode: Callable[[Any], bytes] = encode
+        self._decode: Callable[[bytes], Any] = decode
+        self._decode_errors: tuple[type[Exception], ...] = decode_errors
+
+    def encode(self, value: Any) -> bytes:
+        """
+        Encodes value (DTOs, lists, dicts and primitive types).
+
+        :param value: value to encode.
+        :return: encoded bytes.
+        """
+        return self._encode(value)
+
+    def decode(self, data: bytes) -> Any:
+        """
+        Decodes bytes into python objects.
+
+        :param data: encoded bytes.
+        :return: decoded value.
+        :raise MalformedBody: if data is invalid.
+        """
+        try:
+            return self._decode(data)
+
+        except self._decode_errors as e:
+            raise MalformedBody("Body can't be decoded") from e
+
+
+# Field names and getter of their values by DTO classes
+_dto_fields: dict[type, tuple[tuple[str, ...], Callable[[Any], Any]]] = {}
+
+
+def dto_to_dict(value: Any) -> dict[str, Any]:
+    """
+    Converts dataclass DTO into dict of its fields.
+
+    :param value: DTO instance.
+    :return: dict with fields of DTO.
+    :raise TypeError: if value is not a dataclass instance.
+    """
+    entry = _dto_fields.get(type(value))
+    if entry is None:
+        if not is_dataclass(value) or isinstance(value, type):
+            raise TypeError(f"Can't encode {type(value).__name__}")
+
+        names: tuple[str, ...] = tuple(field.name for field in fields(value))
+        entry = _dto_fields[type(value)] = (
+            names,
+            attrgetter(*names) if len(names) > 1
+            else lambda dto: (getattr(dto, names[0]),)
+        )
+
+    return dict(zip(entry[0], entry[1](value)))
+
+
+def msgpack_default(value: Any) -> Any:
+    """
+    Converts values msgpack can't encode by itself.
+
+    :param value: DTO or datetime.
+    :return: dict with fields of DTO or msgpack timestamp.
+    :raise TypeError: if value is of unsupported type.
+    """
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            # SQLite doesn't keep time zones, values are in UTC
+            value = value.replace(tzinfo=UTC)
+
+        return msgpack.Timestamp.from_datetime(value)
+
+    return dto_to_dict(value)
+
+
+def encode_msgpack(value: Any) -> bytes:
+    """
+    Encodes value with msgpack, datetimes become msgpack timestamps.
+
+    :param value: DTO or other value to encode.
+    :return: encoded bytes.
+    """
+    # Aware datetimes are packed natively, naive ones are passed to hook
+    data: bytes = msgpack.packb(
+        value, default=msgpack_default, datetime=True
+    )
+    return data
+
+
+def encode_msgpack_array_header(length: int) -> bytes:
+    """
+    Encodes header of msgpack array, which is followed by its items
+    encoded one by one.
+
+    :param length: amount of items in array.
+    :return: encoded bytes.
+    """
+    return msgpack.Packer().pack_array_header(length)
+
+
+def encode_msgpack_items(values: Iterable[Any]) -> bytes:
+    """
+    Encodes values one after another as items of msgpack array,
+    whose header is written separately.
+
+    :param values: DTOs or other values to encode.
+    :return: concatenated encoded values.
+    """
+    packer = msgpack.Packer(default=msgpack_default, datetime=True)
+    return b"".join(map(packer.pack, values))
+
+
+def decode_datetime(value: Any) -> datetime:
+    """
+    Converts datetime field of decoded request body, which is ISO 8601
+    string in JSON and either string or timestamp in msgpack.
+
+    :param value: decoded field value.
+    :return: datetime value.
+    :raise TypeError: if value is neither string nor datetime.
+    :raise ValueError: if string is not in ISO 8601 format.
+    """
+    if isinstance(value, datetime):
+        return value
+
+    return datetime.fromisoformat(value)
+
+
+JSON_CODEC: Codec = Codec(
+    "application/json", orjson.dumps, orjson.loads, (orjson.JSONDecodeError,)
+)
+MSGPACK_CODEC: Codec = Codec(
+    "application/msgpack", encode_msgpack,
+    partial(msgpack.unpackb, timestamp=3),
+    (ValueError, TypeError, msgpack.UnpackException)
+)
+
+# Codecs by media types, including legacy names of msgpack
+CODECS: dict[str, Codec] = {
+    "application/json": JSON_CODEC,
+    "application/msgpack": MSGPACK_CODEC,
+    "application/x-msgpack": MSGPACK_CODEC,
+    "application/vnd.msgpack": MSGPACK_CODEC,
+}
@@ -0,0 +1,17 @@
+from datetime import datetime
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class DueReminderDTO:
+    """
+    Reminder that is due, handed to dispatcher sink.
+    """
+
+    id: int
+    user_id: int
+    title: str
+    description: str
+    color_code: str
+    # Moment reminder was scheduled to fire at
+    trigger_at: datetime
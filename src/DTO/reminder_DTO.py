@@ -1,10 +1,13 @@
 from datetime import datetime
 from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy.engine import Row
 
 from src.models.reminder import Reminder
 
 
-@dataclass
+@dataclass(slots=True)
 class ReminderDTO:
     """
     DTO for storing and converting Reminder object into JSON.
@@ -35,3 +38,29 @@ class ReminderDTO:
             triggered_at=reminder.triggered_at,
             trigger_period=reminder.trigger_period
         )
+
+    @classmethod
+    def from_row(cls, row: Row[Any]):
+        """
+        Builds DTO from row with columns of REMINDER_COLUMNS,
+        where color is already formatted by database.
+
+        :param row: row of reminder columns.
+        :return: DTO instance.
+        """
+        return cls(
+            id=row.id,
+            title=row.title,
+            description=row.description,
+            color_code=row.color_code,
+            is_active=row.is_active,
+            is_periodic=row.is_periodic,
+            created_at=row.created_at,
+            last_edited_at=row.last_edited_at,
+            triggered_at=row.triggered_at,
+            trigger_period=row.trigger_period
+        )
+
+    @property
+    def version(self) -> str:
+        return Reminder.make_version(self.id, self.last_edited_at)
@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class BatchItemErrorDTO:
+    """
+    Describes why item of batch request was not processed.
+    """
+    index: int
+    reason: str
+
+
+@dataclass
+class BatchItemCreatedDTO:
+    """
+    Stores id of reminder created from item of batch request.
+    """
+    index: int
+    event_id: int
+
+
+@dataclass
+class ReminderBatchCreatedDTO:
+    """
+    Stores results of creating reminders in batch.
+    """
+    created: list[BatchItemCreatedDTO]
+    errors: list[BatchItemErrorDTO]
+
+
+@dataclass
+class BatchReminderErrorDTO:
+    """
+    Describes why reminder from batch request was not modified.
+    """
+    id: int
+    reason: str
+
+
+@dataclass
+class ReminderBatchUpdatedDTO:
+    """
+    Stores results of updating or deactivating reminders in batch.
+    Reminders that don't exist or belong to other users are not_found.
+    """
+    updated: list[int]
+    not_found: list[int]
+    errors: list[BatchReminderErrorDTO]
@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+
+from .reminder_DTO import ReminderDTO
+
+
+@dataclass
+class ReminderPageDTO:
+    """
+    Stores page of reminders and cursor for fetching next page.
+    """
+    reminders: list[ReminderDTO]
+    next_cursor: str | None
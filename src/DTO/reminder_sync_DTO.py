@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from .reminder_DTO import ReminderDTO
+
+
+@dataclass
+class ReminderSyncDTO:
+    """
+    Stores reminders changed since previous sync and moment that
+    must be used as starting point of the next sync.
+    """
+    reminders: list[ReminderDTO]
+    watermark: datetime
@@ -1,16 +1,140 @@
+from functools import partial
+
 from aiohttp import web
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine, AsyncSession, async_sessionmaker
+)
 
+from src.loop_monitor import loop_monitor
+from src.metrics import MetricsOptions, instrument_queries, query_log
+from src.models.initialize_connector import preconnect_pool
+from src.models.password_hasher import password_hasher
+from src.models.reminder_dispatcher import ReminderDispatcher
+from src.models.replicas import ReplicaOptions, ReplicaSet
+from src.models.trigger_schedule import trigger_schedule
 from src.views import init_application_routes
+from src.views.loop_monitor import register_task_route
+from src.views.metrics import collect_request_metrics, handle_metrics
+from src.views.query_budget import track_request_queries
+
+
+async def shutdown_password_hasher(app: web.Application) -> None:
+    password_hasher.shutdown()
+
+
+async def start_loop_monitor(app: web.Application) -> None:
+    loop_monitor.start()
+
+
+async def stop_loop_monitor(app: web.Application) -> None:
+    await loop_monitor.stop()
+
+
+async def start_replicas(replicas: ReplicaSet, app: web.Application) -> None:
+    await replicas.start()
+
+
+async def stop_replicas(replicas: ReplicaSet, app: web.Application) -> None:
+    await replicas.stop()
+
+
+async def start_dispatcher(
+    dispatcher: ReminderDispatcher, app: web.Application
+) -> None:
+    await dispatcher.start()
+
+
+async def stop_dispatcher(
+    dispatcher: ReminderDispatcher, app: web.Application
+) -> None:
+    await dispatcher.stop()
+
+
+async def start_trigger_schedule(
+    session_factory: async_sessionmaker[AsyncSession],
+    dispatcher: ReminderDispatcher, app: web.Application
+) -> None:
+    await trigger_schedule.start(session_factory, dispatcher.wake)
+
+
+async def stop_trigger_schedule(app: web.Application) -> None:
+    await trigger_schedule.stop()
+
+
+async def start_metrics_server(
+    host: str, port: int, app: web.Application
+) -> None:
+    metrics_app: web.Application = web.Application()
+    metrics_app["metered_app"] = app
+    metrics_app.router.add_get("/metrics", handle_metrics)
+    runner: web.AppRunner = web.AppRunner(metrics_app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    app["metrics_runner"] = runner
+
+
+async def stop_metrics_server(app: web.Application) -> None:
+    await app["metrics_runner"].cleanup()
+
+
+async def open_pool_connections(
+    engine: AsyncEngine, connections: int, app: web.Application
+) -> None:
+    await preconnect_pool(engine, connections)
 
 
 def main(
     host: str, port: int,
-    session_factory: async_sessionmaker[AsyncSession]
+    session_factory: async_sessionmaker[AsyncSession],
+    reuse_port: bool = False,
+    preconnect: int = 0,
+    replicas: ReplicaSet | None = None,
+    metrics: MetricsOptions | None = None,
+    dispatcher: ReminderDispatcher | None = None
 ):
+    if replicas is None:
+        replicas = ReplicaSet(session_factory, ReplicaOptions())
+
     app: web.Application = web.Application()
     app["session_maker"] = session_factory
+    app["replicas"] = replicas
+    app["dispatcher"] = dispatcher
     session_factory()
     init_application_routes(app)
+    instrument_queries()
+    if metrics is not None and metrics.enabled:
+        app.middlewares.append(collect_request_metrics)
+        if metrics.on_application_port:
+            app.router.add_get("/metrics", handle_metrics)
+
+        else:
+            app.on_startup.append(
+                partial(start_metrics_server, metrics.host, metrics.port)
+            )
+            app.on_cleanup.append(stop_metrics_server)
+
+    if query_log.enabled:
+        app.middlewares.append(track_request_queries)
+
+    if loop_monitor.detects_stalls:
+        app.middlewares.append(register_task_route)
+
+    app.on_startup.append(
+        partial(open_pool_connections, session_factory.kw["bind"], preconnect)
+    )
+    app.on_startup.append(partial(start_replicas, replicas))
+    app.on_cleanup.append(partial(stop_replicas, replicas))
+    if dispatcher is not None:
+        app.on_startup.append(partial(start_dispatcher, dispatcher))
+        app.on_cleanup.append(partial(stop_dispatcher, dispatcher))
+        if dispatcher.options.enabled and trigger_schedule.enabled:
+            app.on_startup.append(partial(
+                start_trigger_schedule, session_factory, dispatcher
+            ))
+            app.on_cleanup.append(stop_trigger_schedule)
+
+    app.on_startup.append(start_loop_monitor)
+    app.on_cleanup.append(stop_loop_monitor)
+    app.on_cleanup.append(shutdown_password_hasher)
 
-    web.run_app(app, host=host, port=port)
+    web.run_app(app, host=host, port=port, reuse_port=reuse_port)
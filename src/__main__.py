@@ -1,23 +1,146 @@
 import asyncio
+import logging
 import tomllib
 
 from src import main
+from src.loop_monitor import loop_monitor
+from src.metrics import MetricsOptions, query_log
 from src.models import initialize_connector
+from src.models.access_token_cache import access_token_cache
+from src.models.password_hasher import password_hasher
+from src.models.reminder_dispatcher import (
+    DispatcherOptions, ReminderDispatcher
+)
+from src.models.reminders_list_cache import reminders_list_cache
+from src.models.replicas import ReplicaOptions, ReplicaSet
+from src.models.trigger_schedule import trigger_schedule
+from src.views.compression import response_compressor
+from src.supervisor import WorkerSupervisor, supports_reuse_port
 from src.models.initialize_connector import (
-    create_engine, initialize_session_maker
+    DatabaseOptions, create_engine, initialize_session_maker
 )
 
+logging.basicConfig(level=logging.INFO)
+
 with open("config.toml", "rb") as cfg:
     config = tomllib.load(cfg)["RemindMe"]
     host = config["host"]
     port = config["port"]
     debug_run = config["debug"]
     engine_conn_str = config["engine_connection"]
+    workers = config.get("workers", 1)
+    database_options = DatabaseOptions.from_config(
+        config.get("database", {})
+    )
+    replica_options = ReplicaOptions.from_config(
+        config.get("replicas", {})
+    )
+    dispatcher_options = DispatcherOptions.from_config(
+        config.get("dispatcher", {})
+    )
+    token_cache_config = config.get("token_cache", {})
+    hashing_config = config.get("password_hashing", {})
+    list_cache_config = config.get("reminders_cache", {})
+    compression_config = config.get("compression", {})
+    metrics_options = MetricsOptions.from_config(
+        config.get("metrics", {})
+    )
+    query_log_config = config.get("query_log", {})
+    loop_monitor_config = config.get("loop_monitor", {})
+    trigger_schedule_config = config.get("trigger_schedule", {})
+
+    access_token_cache.configure(
+        max_size=token_cache_config.get("max_size", 10000),
+        ttl=token_cache_config.get("ttl", 300)
+    )
+    reminders_list_cache.configure(
+        max_bytes=list_cache_config.get("max_bytes", 64 * 1024 * 1024),
+        ttl=list_cache_config.get("ttl", 60),
+        # Lists read from replicas right after write may be outdated
+        settle_time=replica_options.max_lag if (
+            replica_options.connections
+        ) else 0.0
+    )
+    response_compressor.configure(
+        min_size=compression_config.get("min_size", 1024),
+        offload_size=compression_config.get("offload_size", 64 * 1024),
+        level=compression_config.get("level", 6)
+    )
+    query_log.configure(
+        enabled=query_log_config.get("enabled", True),
+        slow_query_threshold=query_log_config.get(
+            "slow_query_threshold", 0.5
+        ),
+        server_timing=query_log_config.get("server_timing", False),
+        enforce_budgets=query_log_config.get("enforce_budgets", False)
+    )
+    loop_monitor.configure(
+        enabled=loop_monitor_config.get("enabled", True),
+        interval=loop_monitor_config.get("interval", 0.1),
+        stall_threshold=loop_monitor_config.get("stall_threshold", 0.25),
+        asyncio_debug=loop_monitor_config.get("asyncio_debug", False),
+        slow_callback_duration=loop_monitor_config.get(
+            "slow_callback_duration", 0.1
+        )
+    )
+    trigger_schedule.configure(
+        enabled=trigger_schedule_config.get("enabled", False),
+        horizon=trigger_schedule_config.get("horizon", 86400),
+        tick=trigger_schedule_config.get("tick", 0.1)
+    )
+    password_hasher.configure(
+        executor_kind=hashing_config.get("executor", "thread"),
+        workers=hashing_config.get("workers"),
+        max_queue=hashing_config.get("max_queue", 64)
+    )
 
     if debug_run:
         engine = create_engine(engine_conn_str)
         asyncio.run(initialize_connector.reinitialize_db(engine))
         del engine
 
-    session_factory = initialize_session_maker(engine_conn_str)
-    asyncio.run(main(host, port, session_factory))
+    if workers > 1 and not supports_reuse_port():
+        logging.warning(
+            "SO_REUSEPORT is not supported on this platform, "
+            "starting single worker"
+        )
+        workers = 1
+
+    if trigger_schedule.enabled and not dispatcher_options.enabled:
+        logging.warning(
+            "Trigger schedule only wakes dispatcher, "
+            "enable dispatcher to use it"
+        )
+
+    if workers > 1 and trigger_schedule.enabled:
+        logging.warning(
+            "Trigger schedule of each worker only sees changes made "
+            "through that worker, others are found by dispatcher polling"
+        )
+
+    if workers > 1 and metrics_options.on_application_port:
+        logging.warning(
+            "Workers share application port, so metrics of each worker "
+            "are served on its own port starting from metrics.port"
+        )
+
+    if workers > 1:
+        # Database is prepared once above, each worker creates its own engine
+        WorkerSupervisor(
+            host, port, engine_conn_str, database_options, workers,
+            replica_options, metrics_options, dispatcher_options
+        ).run()
+
+    else:
+        session_factory = initialize_session_maker(
+            engine_conn_str, database_options
+        )
+        main(
+            host, port, session_factory,
+            preconnect=database_options.preconnect,
+            replicas=ReplicaSet(
+                session_factory, replica_options, database_options
+            ),
+            metrics=metrics_options,
+            dispatcher=ReminderDispatcher(session_factory, dispatcher_options)
+        )
@@ -8,6 +8,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.DTO.reminder_created_DTO import ReminderCreatedDTO
 from src.models.reminder import Reminder
+from src.models.reminders_list_cache import reminders_list_cache
+from src.models.trigger_schedule import trigger_schedule
 from src.models.user import User
 
 
@@ -16,13 +18,13 @@ async def create_reminder(
     title: str, description: str, color_code: str,
     triggered_at: datetime, is_periodic: bool, trigger_period: int
 ) -> ReminderCreatedDTO:
-    user: User = await User.get_user_by_access_token(
+    user_id: int = await User.get_user_id_by_access_token(
         user_token, session
     )
 
     try:
         reminder: Reminder | None = await Reminder.create_new_reminder(
-            user.id, title, description, color_code, triggered_at,
+            user_id, title, description, color_code, triggered_at,
             is_periodic, trigger_period, session
         )
 
@@ -35,4 +37,8 @@ async def create_reminder(
     ) as e:
         raise ValueError("Incorrect data received") from e
 
+    reminders_list_cache.invalidate_on_commit(user_id, session)
+    trigger_schedule.update_on_commit(
+        session, [(reminder.id, triggered_at)]
+    )
     return ReminderCreatedDTO(True, reminder.id)
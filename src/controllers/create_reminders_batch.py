@@ -0,0 +1,68 @@
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.DTO.reminder_batch_DTO import (
+    BatchItemCreatedDTO, BatchItemErrorDTO, ReminderBatchCreatedDTO
+)
+from src.models.reminder import Reminder
+from src.models.reminders_list_cache import reminders_list_cache
+from src.models.trigger_schedule import trigger_schedule
+from src.models.user import User
+from .validate_reminder import check_reminder_fields
+
+
+async def create_reminders_batch(
+    user_token: str, session: AsyncSession,
+    new_reminders: dict[int, dict[str, Any]]
+) -> ReminderBatchCreatedDTO:
+    """
+    Creates several reminders at once for user whose token is provided.
+
+    :param user_token: users token of someone who creates reminders.
+    :param session: SQLAlchemy session.
+    :param new_reminders: fields of new reminders by their index
+    in request.
+    :return: DTO with ids of created reminders and errors of rejected ones.
+
+    :raise InvalidCredentials: if users token is not in database.
+    """
+    user_id: int = await User.get_user_id_by_access_token(
+        user_token, session
+    )
+
+    errors: list[BatchItemErrorDTO] = []
+    valid_indexes: list[int] = []
+    for index, fields in new_reminders.items():
+        try:
+            check_reminder_fields(fields)
+            valid_indexes.append(index)
+
+        except ValueError as e:
+            errors.append(BatchItemErrorDTO(index, str(e)))
+
+    ids: list[int] | None = await Reminder.create_new_reminders(
+        user_id, [new_reminders[index] for index in valid_indexes], session
+    )
+
+    if ids is None:
+        errors.extend(
+            BatchItemErrorDTO(index, "Rejected by database")
+            for index in valid_indexes
+        )
+        ids, valid_indexes = [], []
+
+    elif ids:
+        reminders_list_cache.invalidate_on_commit(user_id, session)
+        trigger_schedule.update_on_commit(session, (
+            (event_id, new_reminders[index]["triggered_at"])
+            for index, event_id in zip(valid_indexes, ids)
+        ))
+
+    return ReminderBatchCreatedDTO(
+        [
+            BatchItemCreatedDTO(index, event_id)
+            for index, event_id in zip(valid_indexes, ids)
+        ],
+        errors
+    )
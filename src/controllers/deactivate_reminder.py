@@ -2,7 +2,8 @@ from aiohttp import web
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.reminder import Reminder
-from src.models.user import User
+from src.models.reminders_list_cache import reminders_list_cache
+from src.models.trigger_schedule import trigger_schedule
 from .exceptions import ObjectNotFound
 
 
@@ -25,27 +26,25 @@ async def deactivate_specific_reminder(
     :raise HTTPInternalServerError: if objects were found, but
     deactivation failed.
     """
-    user: User = await User.get_user_by_access_token(
-        user_token, session
-    )
-
-    reminder: Reminder | None = await Reminder.get_reminder_by_id(
-        user.id, reminder_id, session
+    user_id: int | None = (
+        await Reminder.deactivate_reminder_by_access_token(
+            user_token, reminder_id, session
+        )
     )
 
-    if reminder is None:
+    if user_id is None:
         raise ObjectNotFound(
-            f"Reminder with id {reminder_id} was not found "
-            f"for user with id {user.id}"
+            f"Reminder with id {reminder_id} was not found for that user"
         )
 
-    event_id: int = reminder.id
-    is_deactivated: bool = await reminder.deactivate_reminder(session)
-    if not is_deactivated:
+    if not user_id:
         # Unknown reason, need to check logs
         raise web.HTTPInternalServerError()
 
+    reminders_list_cache.invalidate_on_commit(user_id, session)
+    trigger_schedule.update_on_commit(session, [(reminder_id, None)])
+
     return {
-        "deleted_event_id": event_id,
-        "has_been_deactivated": is_deactivated
+        "deleted_event_id": reminder_id,
+        "has_been_deactivated": True
     }
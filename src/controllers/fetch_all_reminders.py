@@ -1,19 +1,214 @@
+import base64
+import binascii
+from typing import Any, AsyncIterator, Sequence
+
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
+from src.DTO.codecs import Codec
 from src.DTO.reminder_DTO import ReminderDTO
+from src.DTO.reminder_page_DTO import ReminderPageDTO
 from src.models.reminder import Reminder
+from src.models.reminders_list_cache import (
+    CachedList, reminders_list_cache
+)
 from src.models.user import User
 
 
-async def fetch_all_reminders(
-    user_token: str, session: AsyncSession
-) -> list[ReminderDTO]:
-    user: User = await User.get_user_by_access_token(
+async def fetch_cached_reminders(
+    user_token: str, content_type: str, version: str, session: AsyncSession
+) -> CachedList | None:
+    """
+    Fetches encoded list of users active reminders from cache.
+
+    :param user_token: users token.
+    :param content_type: media type of encoded list.
+    :param version: current version of list from database.
+    :param session: SQLAlchemy session.
+    :return: cached list or None if list is not cached or outdated.
+
+    :raise InvalidCredentials: if users token is not in database.
+    """
+    user_id: int = await User.get_user_id_by_access_token(
+        user_token, session
+    )
+
+    return reminders_list_cache.get(user_id, content_type, version)
+
+
+async def fetch_encoded_reminders(
+    user_token: str, codec: Codec, session: AsyncSession
+) -> CachedList:
+    """
+    Fetches all users active reminders encoded by codec
+    and puts them into cache.
+
+    :param user_token: users token.
+    :param codec: codec of response.
+    :param session: SQLAlchemy session.
+    :return: encoded list with its version.
+
+    :raise InvalidCredentials: if users token is not in database.
+    """
+    user_id: int = await User.get_user_id_by_access_token(
+        user_token, session
+    )
+
+    generation: int = reminders_list_cache.generation
+    reminders: Sequence[
+        Row[Any]
+    ] = await Reminder.get_active_reminders_of_user(user_id, session)
+
+    # Version is computed from loaded rows, so it always matches body
+    version: str = Reminder.make_version(
+        len(reminders),
+        max(
+            (reminder.last_edited_at for reminder in reminders),
+            default=None
+        )
+    )
+    body: bytes = codec.encode(
+        [ReminderDTO.from_row(reminder) for reminder in reminders]
+    )
+    return reminders_list_cache.put(
+        user_id, codec.content_type, version, body, generation
+    )
+
+
+async def stream_all_reminders(
+    user_token: str, chunk_size: int, session: AsyncSession
+) -> AsyncIterator[list[ReminderDTO]]:
+    """
+    Fetches all users active reminders in chunks.
+
+    :param user_token: users token.
+    :param chunk_size: amount of reminders in each chunk.
+    :param session: SQLAlchemy session.
+    :return: async iterator of DTO chunks.
+
+    :raise InvalidCredentials: if users token is not in database.
+    """
+    user_id: int = await User.get_user_id_by_access_token(
         user_token, session
     )
 
-    reminders: tuple[
-        Reminder, ...
-    ] = await Reminder.get_active_reminders_of_user(
-        user.id, session
+    async for chunk in Reminder.stream_active_reminders_of_user(
+        user_id, chunk_size, session
+    ):
+        yield [ReminderDTO.from_row(reminder) for reminder in chunk]
+
+
+async def stream_counted_reminders(
+    user_token: str, chunk_size: int, session: AsyncSession
+) -> AsyncIterator[tuple[int, list[ReminderDTO]]]:
+    """
+    Fetches all users active reminders in chunks along with their amount,
+    which is known once first chunk is read.
+
+    :param user_token: users token.
+    :param chunk_size: amount of reminders in each chunk.
+    :param session: SQLAlchemy session.
+    :return: async iterator of pairs of total amount of reminders
+    and DTO chunk.
+
+    :raise InvalidCredentials: if users token is not in database.
+    """
+    user_id: int = await User.get_user_id_by_access_token(
+        user_token, session
     )
-    return [ReminderDTO.from_reminder(reminder) for reminder in reminders]
+
+    async for chunk in Reminder.stream_active_reminders_of_user(
+        user_id, chunk_size, session, counted=True
+    ):
+        if chunk:
+            yield chunk[0].total, [
+                ReminderDTO.from_row(reminder) for reminder in chunk
+            ]
+
+
+async def fetch_reminders_page(
+    user_token: str, limit: int, cursor: str | None, session: AsyncSession
+) -> ReminderPageDTO:
+    """
+    Fetches page of users active reminders.
+
+    :param user_token: users token.
+    :param limit: maximum amount of reminders on page.
+    :param cursor: cursor received with previous page
+    (None for first page).
+    :param session: SQLAlchemy session.
+    :return: DTO with reminders and cursor of next page
+    (None if it's the last page).
+
+    :raise InvalidCredentials: if users token is not in database.
+    :raise ValueError: if cursor is malformed.
+    """
+    after_id: int = decode_cursor(cursor) if cursor is not None else 0
+    user_id: int = await User.get_user_id_by_access_token(
+        user_token, session
+    )
+
+    # One extra reminder tells if there's next page
+    reminders: Sequence[
+        Row[Any]
+    ] = await Reminder.get_active_reminders_page(
+        user_id, after_id, limit + 1, session
+    )
+    has_next_page: bool = len(reminders) > limit
+    reminders = reminders[:limit]
+
+    return ReminderPageDTO(
+        [ReminderDTO.from_row(reminder) for reminder in reminders],
+        encode_cursor(reminders[-1].id) if has_next_page else None
+    )
+
+
+async def fetch_active_reminders_state(
+    user_token: str, session: AsyncSession
+) -> tuple[int, str]:
+    """
+    Fetches amount of users active reminders and version of their list
+    without loading it.
+
+    :param user_token: users token.
+    :param session: SQLAlchemy session.
+    :return: amount of reminders and version string.
+
+    :raise InvalidCredentials: if users token is not in database.
+    """
+    user_id: int = await User.get_user_id_by_access_token(
+        user_token, session
+    )
+
+    return await Reminder.get_active_reminders_state(user_id, session)
+
+
+def encode_cursor(reminder_id: int) -> str:
+    """
+    Makes opaque cursor pointing after specified reminder.
+
+    :param reminder_id: id of last reminder on page.
+    :return: cursor string.
+    """
+    return base64.urlsafe_b64encode(
+        str(reminder_id).encode("ascii")
+    ).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Gets id of reminder from cursor.
+
+    :param cursor: cursor string.
+    :return: id of last reminder on previous page.
+    :raise ValueError: if cursor is malformed.
+    """
+    try:
+        reminder_id = int(base64.urlsafe_b64decode(cursor.encode("ascii")))
+
+    except (binascii.Error, UnicodeEncodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    if reminder_id < 0:
+        raise ValueError("Invalid cursor")
+
+    return reminder_id
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta, UTC
+from typing import Any, Sequence
+
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.DTO.reminder_DTO import ReminderDTO
+from src.DTO.reminder_sync_DTO import ReminderSyncDTO
+from src.models.reminder import Reminder
+from src.models.user import User
+
+# Edit time is taken before transaction commits, so changes committed
+# shortly after sync may have older edit time than reminders it returned.
+# Watermark stays this far behind server clock, and reminders edited
+# within that period are sent once more on next sync.
+SYNC_WATERMARK_MARGIN: timedelta = timedelta(seconds=30)
+
+
+async def fetch_changed_reminders(
+    user_token: str, since: datetime, session: AsyncSession
+) -> ReminderSyncDTO:
+    """
+    Fetches reminders that were created, edited or deactivated
+    after previous sync (deactivated ones have is_active set to false).
+
+    :param user_token: users token of someone who syncs reminders.
+    :param since: watermark received from previous sync.
+    :param session: SQLAlchemy session.
+    :return: DTO with changed reminders and watermark for next sync.
+
+    :raise InvalidCredentials: if users token is not in database.
+    """
+    user_id: int = await User.get_user_id_by_access_token(
+        user_token, session
+    )
+
+    reminders: Sequence[
+        Row[Any]
+    ] = await Reminder.get_reminders_of_user_edited_since(
+        user_id, since, session
+    )
+
+    # Watermark is taken from server values, so clocks of client and
+    # server don't need to be in sync
+    watermark: datetime = since
+    if reminders:
+        last_edited_at: datetime = reminders[-1].last_edited_at
+        if last_edited_at.tzinfo is None:
+            # SQLite doesn't keep time zones, values are in UTC
+            last_edited_at = last_edited_at.replace(tzinfo=UTC)
+
+        watermark = max(since, min(
+            last_edited_at, datetime.now(UTC) - SYNC_WATERMARK_MARGIN
+        ))
+
+    return ReminderSyncDTO(
+        [ReminderDTO.from_row(reminder) for reminder in reminders],
+        watermark
+    )
@@ -1,8 +1,10 @@
+from typing import Any
+
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.DTO.reminder_DTO import ReminderDTO
 from src.models.reminder import Reminder
-from src.models.user import User
 from .exceptions import ObjectNotFound
 
 
@@ -22,18 +24,30 @@ async def fetch_specific_reminder(
     to user.
     :raise InvalidCredentials: if users token is not in database.
     """
-    user: User = await User.get_user_by_access_token(
-        user_token, session
-    )
-
-    reminder: Reminder | None = await Reminder.get_reminder_by_id(
-        user.id, reminder_id, session
+    reminder: Row[Any] | None = await Reminder.get_reminder_by_access_token(
+        user_token, reminder_id, session
     )
 
     if reminder is None:
         raise ObjectNotFound(
-            f"Reminder with id {reminder_id} was not found "
-            f"for user with id {user.id}"
+            f"Reminder with id {reminder_id} was not found for that user"
         )
 
-    return ReminderDTO.from_reminder(reminder)
+    return ReminderDTO.from_row(reminder)
+
+
+async def fetch_specific_reminder_version(
+    user_token: str, reminder_id: int, session: AsyncSession
+) -> str | None:
+    """
+    Fetches version of specified reminder without loading it.
+
+    :param user_token: users token of someone who wants to fetch reminder.
+    :param reminder_id: id of reminder.
+    :param session: SQLAlchemy session.
+    :return: version string or None if reminder is not found
+    or token is invalid.
+    """
+    return await Reminder.get_reminder_version_by_access_token(
+        user_token, reminder_id, session
+    )
@@ -5,7 +5,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.controllers.exceptions import ObjectNotFound
 from src.models.reminder import Reminder
-from src.models.user import User
+from src.models.reminders_list_cache import reminders_list_cache
+from src.models.trigger_schedule import trigger_schedule
 
 
 async def update_specific_reminder(
@@ -41,19 +42,6 @@ async def update_specific_reminder(
     to user.
     :raise InvalidCredentials: if users token is not in database.
     """
-    user: User = await User.get_user_by_access_token(
-        user_token, session
-    )
-    reminder: Reminder | None = await Reminder.get_reminder_by_id(
-        user.id, reminder_id, session
-    )
-
-    if reminder is None:
-        raise ObjectNotFound(
-            f"Reminder with id {reminder_id} was not found "
-            f"for user with id {user.id}"
-        )
-
     fields: dict[str, Any] = {}
 
     if title is not None:
@@ -77,4 +65,24 @@ async def update_specific_reminder(
     if len(fields) == 0:
         raise ValueError("Fields not updated")
 
-    return await reminder.update_reminder(session, **fields)
+    result: tuple[list[str], int, datetime | None] | None = (
+        await Reminder.update_reminder_by_access_token(
+            user_token, reminder_id, session, **fields
+        )
+    )
+
+    if result is None:
+        raise ObjectNotFound(
+            f"Reminder with id {reminder_id} was not found for that user"
+        )
+
+    updated_fields, user_id, next_trigger_at = result
+    if updated_fields:
+        reminders_list_cache.invalidate_on_commit(user_id, session)
+
+    if not Reminder.SCHEDULE_FIELDS.isdisjoint(updated_fields):
+        trigger_schedule.update_on_commit(
+            session, [(reminder_id, next_trigger_at)]
+        )
+
+    return updated_fields
@@ -0,0 +1,164 @@
+from datetime import datetime, UTC
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.DTO.reminder_batch_DTO import (
+    BatchReminderErrorDTO, ReminderBatchUpdatedDTO
+)
+from src.models.reminder import Reminder
+from src.models.reminders_list_cache import reminders_list_cache
+from src.models.trigger_schedule import trigger_schedule
+from src.models.user import User
+from .validate_reminder import check_reminder_fields
+
+
+async def update_reminders_batch(
+    user_token: str, session: AsyncSession,
+    updates: dict[int, dict[str, Any]]
+) -> ReminderBatchUpdatedDTO:
+    """
+    Updates fields of several reminders created by user, whose token is
+    provided. Reminders receiving same values are updated with
+    single statement.
+
+    :param user_token: users token of someone who updates reminders.
+    :param session: SQLAlchemy session.
+    :param updates: fields to update by id of reminder.
+    :return: DTO with ids of updated and not found reminders
+    and errors of rejected ones.
+
+    :raise InvalidCredentials: if users token is not in database.
+    """
+    user_id: int = await User.get_user_id_by_access_token(
+        user_token, session
+    )
+
+    errors: list[BatchReminderErrorDTO] = []
+    # Reminders grouped by values they receive
+    groups: dict[tuple[tuple[str, Any], ...], list[int]] = {}
+    for reminder_id, fields in updates.items():
+        try:
+            if not fields or not fields.keys() <= Reminder.MODIFIABLE_FIELDS:
+                raise ValueError("Unknown or missing fields")
+
+            check_reminder_fields(fields)
+
+        except ValueError as e:
+            errors.append(BatchReminderErrorDTO(reminder_id, str(e)))
+            continue
+
+        except (TypeError, AttributeError):
+            errors.append(
+                BatchReminderErrorDTO(reminder_id, "Invalid field type")
+            )
+            continue
+
+        values: dict[str, Any] = dict(fields)
+        if "color_code" in values:
+            values["color_code"] = Reminder.convert_from_hex_to_int_color(
+                values["color_code"]
+            )
+
+        groups.setdefault(tuple(sorted(values.items())), []).append(
+            reminder_id
+        )
+
+    valid_ids: list[int] = [
+        reminder_id for group in groups.values() for reminder_id in group
+    ]
+    edited_at: datetime = datetime.now(UTC)
+    updated_ids: list[int] = []
+    for group_values, reminder_ids in groups.items():
+        result: dict[int, datetime | None] | None = (
+            await Reminder.update_reminders_of_user(
+                user_id, reminder_ids,
+                {**dict(group_values), "last_edited_at": edited_at},
+                session
+            )
+        )
+
+        if result is None:
+            # Transaction is rolled back, so none of updates are saved
+            return ReminderBatchUpdatedDTO(
+                [], [],
+                errors + [
+                    BatchReminderErrorDTO(reminder_id, "Rejected by database")
+                    for reminder_id in valid_ids
+                ]
+            )
+
+        updated_ids.extend(result)
+        if not Reminder.SCHEDULE_FIELDS.isdisjoint(dict(group_values)):
+            trigger_schedule.update_on_commit(session, result.items())
+
+    if updated_ids:
+        reminders_list_cache.invalidate_on_commit(user_id, session)
+
+    return make_batch_result(valid_ids, updated_ids, errors)
+
+
+async def deactivate_reminders_batch(
+    user_token: str, session: AsyncSession, reminder_ids: list[int]
+) -> ReminderBatchUpdatedDTO:
+    """
+    Deactivates several reminders created by user, whose token is
+    provided, with single statement.
+
+    :param user_token: users token of someone who deactivates reminders.
+    :param session: SQLAlchemy session.
+    :param reminder_ids: ids of reminders to deactivate.
+    :return: DTO with ids of deactivated and not found reminders.
+
+    :raise InvalidCredentials: if users token is not in database.
+    """
+    user_id: int = await User.get_user_id_by_access_token(
+        user_token, session
+    )
+
+    result: dict[int, datetime | None] | None = (
+        await Reminder.update_reminders_of_user(
+            user_id, reminder_ids,
+            {"is_active": False, "last_edited_at": datetime.now(UTC)},
+            session
+        )
+    )
+
+    if result is None:
+        return ReminderBatchUpdatedDTO(
+            [], [],
+            [
+                BatchReminderErrorDTO(reminder_id, "Rejected by database")
+                for reminder_id in reminder_ids
+            ]
+        )
+
+    if result:
+        reminders_list_cache.invalidate_on_commit(user_id, session)
+        trigger_schedule.update_on_commit(session, result.items())
+
+    return make_batch_result(reminder_ids, list(result), [])
+
+
+def make_batch_result(
+    requested_ids: list[int], updated_ids: list[int],
+    errors: list[BatchReminderErrorDTO]
+) -> ReminderBatchUpdatedDTO:
+    """
+    Combines ids of requested and updated reminders into batch result.
+
+    :param requested_ids: ids of valid reminders from request.
+    :param updated_ids: ids of reminders that were updated.
+    :param errors: errors of rejected reminders.
+    :return: DTO with batch results.
+    """
+    updated: set[int] = set(updated_ids)
+
+    return ReminderBatchUpdatedDTO(
+        sorted(updated),
+        [
+            reminder_id for reminder_id in requested_ids
+            if reminder_id not in updated
+        ],
+        errors
+    )
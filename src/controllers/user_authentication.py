@@ -11,7 +11,7 @@ async def authenticate_user(
     """
     Authenticates user by checking if provided username
     is associated with provided password
-    and returns access token as response.
+    and issues new access token (tokens issued earlier keep working).
 
     :param username: users login.
     :param password: users password in open form.
@@ -25,4 +25,16 @@ async def authenticate_user(
     user = await User.get_user_by_login_and_password(
         username, password, session
     )
-    return user.access_token
+    return await User.issue_access_token(user, session)
+
+
+async def log_out_user(access_token: str, session: AsyncSession) -> bool:
+    """
+    Revokes access token, so it stops working (cached copies
+    of other workers expire with token cache ttl).
+
+    :param access_token: users access token.
+    :param session: SQLAlchemy session.
+    :return: True if token was valid.
+    """
+    return await User.revoke_access_token(access_token, session)
@@ -0,0 +1,55 @@
+from typing import Any
+
+from src.models.reminder import Reminder
+
+# Mirrors constraints of reminder table, so invalid items of batch
+# requests are rejected one by one instead of failing whole statement
+TITLE_MAX_LENGTH: int = 65
+DESCRIPTION_MAX_LENGTH: int = 240
+# Longest period in days, keeps period within integer column and next
+# occurrences within range of datetime
+TRIGGER_PERIOD_MAX: int = 36500
+
+
+def check_reminder_fields(fields: dict[str, Any]) -> None:
+    """
+    Checks that provided reminder fields will be accepted by database.
+    Fields that are missing are not checked.
+
+    :param fields: fields of new or updated reminder.
+    :return: nothing.
+    :raise ValueError: with reason if any field is invalid.
+    """
+    for text_field in ("title", "description", "color_code"):
+        if text_field in fields and not isinstance(fields[text_field], str):
+            raise ValueError(f"Invalid {text_field} type")
+
+    if "title" in fields and not (
+        0 < len(fields["title"]) <= TITLE_MAX_LENGTH
+    ):
+        raise ValueError("Invalid title length")
+
+    if (
+        "description" in fields
+        and len(fields["description"]) > DESCRIPTION_MAX_LENGTH
+    ):
+        raise ValueError("Invalid description length")
+
+    if "trigger_period" in fields and (
+        not isinstance(fields["trigger_period"], int)
+        or isinstance(fields["trigger_period"], bool)
+        or not 0 <= fields["trigger_period"] <= TRIGGER_PERIOD_MAX
+    ):
+        raise ValueError("Invalid trigger period")
+
+    if "is_periodic" in fields and not isinstance(
+        fields["is_periodic"], bool
+    ):
+        raise ValueError("Invalid is_periodic value")
+
+    if "color_code" in fields:
+        try:
+            Reminder.convert_from_hex_to_int_color(fields["color_code"])
+
+        except ValueError as e:
+            raise ValueError("Invalid color code") from e
@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from types import FrameType
+
+from src.metrics import Histogram
+
+# Upper bounds of event loop lag histogram buckets in seconds
+LOOP_LAG_BUCKETS: tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+)
+
+logger = logging.getLogger(__name__)
+
+
+class LoopMonitor:
+    """
+    Measures how late event loop runs scheduled callbacks and reports
+    calls blocking it. Task in event loop sleeps for fixed interval and
+    records how much later it was woken up, while watchdog thread checks
+    that task keeps waking up and logs stack of event loop thread
+    if it doesn't.
+    """
+
+    def __init__(
+        self, enabled: bool = True, interval: float = 0.1,
+        stall_threshold: float = 0.25, asyncio_debug: bool = False,
+        slow_callback_duration: float = 0.1
+    ):
+        """
+        :param enabled: measure event loop lag.
+        :param interval: seconds between measurements.
+        :param stall_threshold: event loop blocked for that amount of
+        seconds is reported with stack of blocking call (0 disables).
+        :param asyncio_debug: run event loop in asyncio debug mode,
+        which logs slow callbacks (slows down whole application).
+        :param slow_callback_duration: callbacks running that amount of
+        seconds or longer are logged in asyncio debug mode.
+        """
+        self.enabled: bool = enabled
+        self.interval: float = interval
+        self.stall_threshold: float = stall_threshold
+        self.asyncio_debug: bool = asyncio_debug
+        self.slow_callback_duration: float = slow_callback_duration
+        self.lag: Histogram = Histogram(LOOP_LAG_BUCKETS)
+        self.stalls: int = 0
+        # Routes of requests handled by tasks, read by watchdog thread
+        # to tell which request blocked event loop
+        self.task_routes: dict[asyncio.Task, str] = {}
+        self._heartbeat: float = 0.0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped: threading.Event = threading.Event()
+
+    def configure(
+        self, enabled: bool, interval: float, stall_threshold: float,
+        asyncio_debug: bool, slow_callback_duration: float
+    ) -> None:
+        """
+        Changes monitoring settings, takes effect on next start.
+
+        :param enabled: measure event loop lag.
+        :param interval: seconds between measurements.
+        :param stall_threshold: minimal reported blocking time in seconds.
+        :param asyncio_debug: run event loop in asyncio debug mode.
+        :param slow_callback_duration: minimal duration of callbacks
+        logged in asyncio debug mode.
+        :return: nothing.
+        """
+        self.enabled = enabled
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self.asyncio_debug = asyncio_debug
+        self.slow_callback_duration = slow_callback_duration
+
+    @property
+    def detects_stalls(self) -> bool:
+        return self.enabled and self.stall_threshold > 0
+
+    def start(self) -> None:
+        """
+        Starts measuring lag of running event loop and watchdog thread.
+
+        :return: nothing.
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        if self.asyncio_debug:
+            loop.set_debug(True)
+            loop.slow_callback_duration = self.slow_callback_duration
+
+        if not self.enabled:
+            return
+
+        self._loop = loop
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._task = loop.create_task(self._measure_lag())
+        if self.detects_stalls:
+            self._stopped.clear()
+            self._watchdog = threading.Thread(
+                target=self._watch, name="loop-watchdog", daemon=True
+            )
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        """
+        Stops measurements and watchdog thread.
+
+        :return: nothing.
+        """
+        self._stopped.set()
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+
+            except asyncio.CancelledError:
+                pass
+
+            self._task = None
+
+    async def _measure_lag(self) -> None:
+        while True:
+            expected_at: float = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            self._heartbeat = time.monotonic()
+            self.lag.observe(max(self._heartbeat - expected_at, 0.0))
+
+    def _watch(self) -> None:
+        # Heartbeat of last reported stall, so it's reported once
+        reported_heartbeat: float | None = None
+        while not self._stopped.wait(self.stall_threshold / 2):
+            heartbeat: float = self._heartbeat
+            blocked_for: float = time.monotonic() - heartbeat - self.interval
+            if (
+                blocked_for >= self.stall_threshold
+                and heartbeat != reported_heartbeat
+            ):
+                reported_heartbeat = heartbeat
+                self.stalls += 1
+                self._report_stall(blocked_for)
+
+    def _report_stall(self, blocked_for: float) -> None:
+        """
+        Logs stack of event loop thread and route of request
+        it's currently handling (called from watchdog thread).
+
+        :param blocked_for: seconds event loop is blocked for.
+        :return: nothing.
+        """
+        assert self._loop is not None and self._loop_thread_id is not None
+        frame: FrameType | None = sys._current_frames().get(
+            self._loop_thread_id
+        )
+        if frame is None:
+            return
+
+        task: asyncio.Task | None = asyncio.current_task(self._loop)
+        route: str = self.task_routes.get(
+            task, "background task"
+        ) if task is not None else "event loop callback"
+        logger.warning(
+            "Event loop blocked for at least %.1f ms in %s:\n%s",
+            blocked_for * 1000, route,
+            "".join(traceback.format_stack(frame))
+        )
+
+
+# Configured on application startup
+loop_monitor: LoopMonitor = LoopMonitor()
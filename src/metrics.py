@@ -0,0 +1,336 @@
+import logging
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass, fields
+from typing import Any, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.default import DefaultExecutionContext
+
+# Upper bounds of histogram buckets in seconds
+REQUEST_BUCKETS: tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+QUERY_BUCKETS: tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5
+)
+POOL_WAIT_BUCKETS: tuple[float, ...] = (
+    0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MetricsOptions:
+    """
+    Metrics endpoint settings ([RemindMe.metrics] config table).
+    """
+
+    enabled: bool = False
+    # Address of separate metrics listener, loopback keeps it private
+    host: str = "127.0.0.1"
+    # Port of separate metrics listener, each worker listens on next one
+    port: int = 9100
+    # Serve unauthenticated /metrics on application port instead
+    # (single worker only, since workers share that port)
+    on_application_port: bool = False
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "MetricsOptions":
+        """
+        Creates options from config table, ignoring unknown keys.
+
+        :param config: [RemindMe.metrics] table contents.
+        :return: options instance.
+        """
+        known_fields: set[str] = {option.name for option in fields(cls)}
+        return cls(**{
+            key: value for key, value in config.items()
+            if key in known_fields
+        })
+
+
+def escape_label(value: str) -> str:
+    """
+    Escapes label value for Prometheus text format.
+
+    :param value: label value.
+    :return: escaped value.
+    """
+    return value.replace(
+        "\\", "\\\\"
+    ).replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class Histogram:
+    """
+    Histogram with fixed buckets, that only increments counters
+    on observation.
+    """
+
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        """
+        :param bounds: sorted upper bounds of buckets.
+        """
+        self.bounds: tuple[float, ...] = bounds
+        # Last bucket counts values above all bounds
+        self.counts: list[int] = [0] * (len(bounds) + 1)
+        self.total: float = 0.0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        """
+        Records observed value.
+
+        :param value: observed value.
+        :return: nothing.
+        """
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def render(self, name: str, labels: str = "") -> Iterator[str]:
+        """
+        Formats histogram samples in Prometheus text format.
+
+        :param name: name of metric.
+        :param labels: formatted labels without braces
+        (empty if there's none).
+        :return: lines of samples.
+        """
+        prefix: str = f"{labels}," if labels else ""
+        cumulative: int = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}'
+
+        yield f'{name}_bucket{{{prefix}le="+Inf"}} {self.count}'
+        braced: str = f"{{{labels}}}" if labels else ""
+        yield f"{name}_sum{braced} {self.total}"
+        yield f"{name}_count{braced} {self.count}"
+
+
+class Metrics:
+    """
+    Process wide histograms of handled requests and executed queries.
+    Histograms are created on first observation of each label set,
+    after that observations only increment counters.
+    """
+
+    QUERY_KINDS: tuple[str, ...] = ("select", "insert", "update", "delete")
+
+    def __init__(self) -> None:
+        # route -> method -> status -> histogram
+        self.requests: dict[str, dict[str, dict[int, Histogram]]] = {}
+        self.queries: dict[str, Histogram] = {
+            kind: Histogram(QUERY_BUCKETS) for kind in self.QUERY_KINDS
+        }
+        self.query_errors: int = 0
+
+    def observe_request(
+        self, route: str, method: str, status: int, duration: float
+    ) -> None:
+        """
+        Records handled request.
+
+        :param route: route pattern that handled request.
+        :param method: http method.
+        :param status: http status of response.
+        :param duration: seconds spent handling request.
+        :return: nothing.
+        """
+        by_method: dict[str, dict[int, Histogram]] | None = (
+            self.requests.get(route)
+        )
+        if by_method is None:
+            by_method = self.requests[route] = {}
+
+        by_status: dict[int, Histogram] | None = by_method.get(method)
+        if by_status is None:
+            by_status = by_method[method] = {}
+
+        histogram: Histogram | None = by_status.get(status)
+        if histogram is None:
+            histogram = by_status[status] = Histogram(REQUEST_BUCKETS)
+
+        histogram.observe(duration)
+
+    def render(self) -> Iterator[str]:
+        """
+        Formats requests and queries metrics in Prometheus text format.
+
+        :return: lines of metrics.
+        """
+        yield (
+            "# HELP remindme_http_request_duration_seconds "
+            "Time spent handling requests"
+        )
+        yield "# TYPE remindme_http_request_duration_seconds histogram"
+        for route, by_method in self.requests.items():
+            for method, by_status in by_method.items():
+                for status, histogram in by_status.items():
+                    yield from histogram.render(
+                        "remindme_http_request_duration_seconds",
+                        f'route="{escape_label(route)}",'
+                        f'method="{method}",status="{status}"'
+                    )
+
+        yield (
+            "# HELP remindme_db_query_duration_seconds "
+            "Time spent executing database queries"
+        )
+        yield "# TYPE remindme_db_query_duration_seconds histogram"
+        for kind, histogram in self.queries.items():
+            yield from histogram.render(
+                "remindme_db_query_duration_seconds", f'kind="{kind}"'
+            )
+
+        yield "# HELP remindme_db_query_errors_total Failed database queries"
+        yield "# TYPE remindme_db_query_errors_total counter"
+        yield f"remindme_db_query_errors_total {self.query_errors}"
+
+
+class RequestQueries:
+    """
+    Counters of statements executed while handling single request.
+    """
+
+    __slots__ = ("route", "count", "duration")
+
+    def __init__(self, route: str):
+        """
+        :param route: route pattern that handles request.
+        """
+        self.route: str = route
+        self.count: int = 0
+        # Seconds spent executing statements
+        self.duration: float = 0.0
+
+
+class QueryLog:
+    """
+    Settings of per request accounting of database statements.
+    """
+
+    def __init__(
+        self, enabled: bool = True, slow_query_threshold: float = 0.5,
+        server_timing: bool = False, enforce_budgets: bool = False
+    ):
+        """
+        :param enabled: count statements of each request.
+        :param slow_query_threshold: statements running that amount of
+        seconds or longer are logged (0 disables logging).
+        :param server_timing: send Server-Timing header with amount of
+        statements and time spent on them.
+        :param enforce_budgets: fail requests executing more statements
+        than their handler declared (for tests).
+        """
+        self.enabled: bool = enabled
+        self.slow_query_threshold: float = slow_query_threshold
+        self.server_timing: bool = server_timing
+        self.enforce_budgets: bool = enforce_budgets
+
+    def configure(
+        self, enabled: bool, slow_query_threshold: float,
+        server_timing: bool, enforce_budgets: bool
+    ) -> None:
+        """
+        Changes query accounting settings.
+
+        :param enabled: count statements of each request.
+        :param slow_query_threshold: minimal duration of logged statements
+        in seconds.
+        :param server_timing: send Server-Timing header.
+        :param enforce_budgets: fail requests exceeding query budget.
+        :return: nothing.
+        """
+        self.enabled = enabled
+        self.slow_query_threshold = slow_query_threshold
+        self.server_timing = server_timing
+        self.enforce_budgets = enforce_budgets
+
+
+# Shared by whole process
+metrics: Metrics = Metrics()
+# Configured on application startup
+query_log: QueryLog = QueryLog()
+# Statements of request handled by current task
+current_request_queries: ContextVar[
+    RequestQueries | None
+] = ContextVar("current_request_queries", default=None)
+
+
+def start_query_timer(
+    conn: Any, cursor: Any, statement: str, parameters: Any,
+    context: DefaultExecutionContext | None, executemany: bool
+) -> None:
+    if context is not None:
+        context._metrics_started_at = time.perf_counter()  # type: ignore
+
+
+def observe_query(
+    conn: Any, cursor: Any, statement: str, parameters: Any,
+    context: DefaultExecutionContext | None, executemany: bool
+) -> None:
+    started_at: float | None = getattr(context, "_metrics_started_at", None)
+    if context is None or started_at is None:
+        return
+
+    if context.isinsert:
+        kind: str = "insert"
+
+    elif context.isupdate:
+        kind = "update"
+
+    elif context.isdelete:
+        kind = "delete"
+
+    else:
+        kind = "select"
+
+    duration: float = time.perf_counter() - started_at
+    metrics.queries[kind].observe(duration)
+
+    queries: RequestQueries | None = current_request_queries.get()
+    if queries is not None:
+        # Statement split into several batches (insertmanyvalues)
+        # runs with same context and is counted once
+        if not getattr(context, "_metrics_counted", False):
+            context._metrics_counted = True  # type: ignore
+            queries.count += 1
+
+        queries.duration += duration
+
+    threshold: float = query_log.slow_query_threshold
+    if threshold and duration >= threshold:
+        # Parameters are not logged, since they contain tokens
+        logger.warning(
+            "Slow query (%.1f ms) in %s: %s", duration * 1000,
+            queries.route if queries is not None else "background task",
+            statement
+        )
+
+
+def count_query_error(context: Any) -> None:
+    metrics.query_errors += 1
+
+
+def instrument_queries() -> None:
+    """
+    Starts measuring queries of all engines (including existing ones).
+
+    :return: nothing.
+    """
+    if event.contains(Engine, "after_cursor_execute", observe_query):
+        return
+
+    event.listen(Engine, "before_cursor_execute", start_query_timer)
+    event.listen(Engine, "after_cursor_execute", observe_query)
+    event.listen(Engine, "handle_error", count_query_error)
@@ -0,0 +1,30 @@
+import datetime
+
+from sqlalchemy import func, ForeignKey, DateTime, LargeBinary
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .initialize_connector import OrmBase
+
+
+class AccessToken(OrmBase):
+    """
+    Class that represents access token issued to user on login used by ORM.
+    Every login gets its own token, so signing in on one device
+    doesn't sign out others.
+    """
+
+    __tablename__ = "access_token"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("user.id"), index=True
+    )
+    # SHA-256 digest of token, token itself is known only to client
+    digest: Mapped[bytes] = mapped_column(
+        LargeBinary(32), unique=True, index=True
+    )
+    # When token was issued
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now()
+    )
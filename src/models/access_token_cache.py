@@ -0,0 +1,154 @@
+import time
+from collections import OrderedDict
+from typing import Iterable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+# Key of session.info with digests of tokens dropped from cache on commit
+PENDING_INVALIDATIONS_KEY: str = "invalidated_access_tokens"
+
+
+class AccessTokenCache:
+    """
+    Bounded LRU cache with TTL that maps digests of users access tokens
+    to users ids, so authenticated requests can skip database lookup.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 300.0):
+        """
+        :param max_size: maximum amount of tokens stored in cache
+        (0 disables caching).
+        :param ttl: how many seconds cached token is considered valid.
+        """
+        self.max_size: int = max_size
+        self.ttl: float = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        # token digest -> (user id, monotonic time of expiration)
+        self._entries: OrderedDict[
+            bytes, tuple[int, float]
+        ] = OrderedDict()
+
+    def configure(self, max_size: int, ttl: float) -> None:
+        """
+        Changes cache limits and drops all cached tokens.
+
+        :param max_size: maximum amount of tokens stored in cache.
+        :param ttl: how many seconds cached token is considered valid.
+        :return: nothing.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clear()
+
+    def get(self, access_token_digest: bytes) -> int | None:
+        """
+        Gets id of user who owns token.
+
+        :param access_token_digest: digest of users access token.
+        :return: users id or None if token is not cached or expired.
+        """
+        entry: tuple[int, float] | None = self._entries.get(
+            access_token_digest
+        )
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        user_id, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[access_token_digest]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(access_token_digest)
+        self.hits += 1
+        return user_id
+
+    def put(self, access_token_digest: bytes, user_id: int) -> None:
+        """
+        Saves token to user id mapping, evicting least recently used tokens
+        if cache is full.
+
+        :param access_token_digest: digest of users access token.
+        :param user_id: id of user who owns token.
+        :return: nothing.
+        """
+        if self.max_size <= 0:
+            return
+
+        self._entries[access_token_digest] = (
+            user_id, time.monotonic() + self.ttl
+        )
+        self._entries.move_to_end(access_token_digest)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, access_token_digest: bytes) -> None:
+        """
+        Removes token from cache (must be called when token is
+        revoked).
+
+        :param access_token_digest: digest of users access token.
+        :return: nothing.
+        """
+        self._entries.pop(access_token_digest, None)
+
+    @staticmethod
+    def invalidate_on_commit(
+        access_token_digests: Iterable[bytes], session: AsyncSession
+    ) -> None:
+        """
+        Schedules removal of tokens from cache for the moment session
+        commits, so concurrent requests can't cache them again
+        before they are deleted.
+
+        :param access_token_digests: digests of revoked tokens.
+        :param session: SQLAlchemy session that deletes tokens.
+        :return: nothing.
+        """
+        session.info.setdefault(PENDING_INVALIDATIONS_KEY, set()).update(
+            access_token_digests
+        )
+
+    def clear(self) -> None:
+        """
+        Removes all tokens from cache.
+
+        :return: nothing.
+        """
+        self._entries.clear()
+
+    @property
+    def hit_ratio(self) -> float:
+        """
+        Ratio of cache hits to all lookups.
+
+        :return: float value in range from 0 to 1.
+        """
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared by whole process, configured on application startup
+access_token_cache: AccessTokenCache = AccessTokenCache()
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_committed_tokens(session: Session) -> None:
+    for access_token_digest in session.info.pop(
+        PENDING_INVALIDATIONS_KEY, ()
+    ):
+        access_token_cache.invalidate(access_token_digest)
+
+
+@event.listens_for(Session, "after_rollback")
+def forget_rolled_back_tokens(session: Session) -> None:
+    session.info.pop(PENDING_INVALIDATIONS_KEY, None)
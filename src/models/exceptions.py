@@ -2,3 +2,9 @@ class InvalidCredentials(Exception):
     """
     Raised when user provided invalid credentials to access data.
     """
+
+
+class HashingQueueFull(Exception):
+    """
+    Raised when password hashing executor has too many pending jobs.
+    """
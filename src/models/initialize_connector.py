@@ -1,18 +1,186 @@
+import asyncio
+import time
+from dataclasses import dataclass, field, fields
+from typing import Any
+
+from sqlalchemy import exc, make_url
 from sqlalchemy.ext.asyncio import (
     AsyncAttrs, AsyncSession, AsyncEngine,
     create_async_engine, async_sessionmaker
 )
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+from src.metrics import Histogram, POOL_WAIT_BUCKETS
+
+
+@dataclass
+class DatabaseOptions:
+    """
+    Engine and connection pool settings ([RemindMe.database] config table).
+    """
+
+    pool_size: int = 5
+    max_overflow: int = 10
+    # Seconds to wait for free connection before raising error
+    pool_timeout: float = 30.0
+    # Seconds after which connection is recreated (-1 disables recycling)
+    pool_recycle: int = -1
+    pool_pre_ping: bool = False
+    # Only used by asyncpg driver
+    prepared_statement_cache_size: int = 100
+    # How many connections are opened on application startup
+    preconnect: int = 0
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "DatabaseOptions":
+        """
+        Creates options from config table, ignoring unknown keys.
+
+        :param config: [RemindMe.database] table contents.
+        :return: options instance.
+        """
+        known_fields: set[str] = {option.name for option in fields(cls)}
+        return cls(**{
+            key: value for key, value in config.items()
+            if key in known_fields
+        })
+
+
+@dataclass
+class PoolStatistics:
+    """
+    Counters of connection checkouts from pool.
+    """
+
+    checkouts: int = 0
+    timeouts: int = 0
+    # Seconds spent waiting for connections in total
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    waits: Histogram = field(
+        default_factory=lambda: Histogram(POOL_WAIT_BUCKETS)
+    )
+
+    def record_checkout(self, wait: float) -> None:
+        self.checkouts += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.waits.observe(wait)
+
+    @property
+    def average_wait(self) -> float:
+        return self.total_wait / self.checkouts if self.checkouts else 0.0
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Connection pool that measures how long checkouts wait for connection.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.statistics: PoolStatistics = PoolStatistics()
+
+    def connect(self) -> PoolProxiedConnection:
+        started_at: float = time.perf_counter()
+        try:
+            return super().connect()
 
+        except exc.TimeoutError:
+            self.statistics.timeouts += 1
+            raise
 
-def create_engine(connection_url: str) -> AsyncEngine:
+        finally:
+            self.statistics.record_checkout(
+                time.perf_counter() - started_at
+            )
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        assert isinstance(pool, InstrumentedQueuePool)
+        pool.statistics = self.statistics
+        return pool
+
+
+def create_engine(
+    connection_url: str, options: DatabaseOptions | None = None
+) -> AsyncEngine:
     """
     Creates db engine.
 
     :param connection_url: string with initialization parameters for engine.
+    :param options: pool and driver settings.
     :return: engine instance.
     """
-    return create_async_engine(connection_url)
+    if options is None:
+        options = DatabaseOptions()
+
+    url = make_url(connection_url)
+    if url.get_backend_name() == "sqlite" and url.database in (
+        None, "", ":memory:"
+    ):
+        # In-memory databases use dialects own pool
+        return create_async_engine(url)
+
+    connect_args: dict[str, Any] = {}
+    if url.get_driver_name() == "asyncpg":
+        connect_args["prepared_statement_cache_size"] = (
+            options.prepared_statement_cache_size
+        )
+
+    return create_async_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=options.pool_size,
+        max_overflow=options.max_overflow,
+        pool_timeout=options.pool_timeout,
+        pool_recycle=options.pool_recycle,
+        pool_pre_ping=options.pool_pre_ping,
+        connect_args=connect_args
+    )
+
+
+def get_pool_statistics(engine: AsyncEngine) -> dict[str, int | float]:
+    """
+    Collects current state of engines connection pool.
+
+    :param engine: provided engine.
+    :return: dict with pool counters, empty if pool is not instrumented.
+    """
+    pool = engine.pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return {}
+
+    return {
+        "size": pool.size(),
+        "in_use": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "checkouts": pool.statistics.checkouts,
+        "timeouts": pool.statistics.timeouts,
+        "average_wait": pool.statistics.average_wait,
+        "max_wait": pool.statistics.max_wait,
+    }
+
+
+async def preconnect_pool(engine: AsyncEngine, connections: int) -> None:
+    """
+    Opens connections to database ahead of time, so first requests
+    don't pay for establishing them.
+
+    :param engine: provided engine.
+    :param connections: amount of connections to open.
+    :return: nothing.
+    """
+    if connections <= 0:
+        return
+
+    opened = await asyncio.gather(
+        *(engine.connect().start() for _ in range(connections))
+    )
+    for connection in opened:
+        await connection.close()
 
 
 def create_session_factory(
@@ -28,16 +196,17 @@ def create_session_factory(
 
 
 def initialize_session_maker(
-    connection_url: str
+    connection_url: str, options: DatabaseOptions | None = None
 ) -> async_sessionmaker[AsyncSession]:
     """
     Combines engine creation and session factory creation.
 
     :param connection_url: string with initialization parameters for engine.
+    :param options: pool and driver settings.
     :return: async_sessionmaker factory.
     """
     return create_session_factory(
-        create_engine(connection_url)
+        create_engine(connection_url, options)
     )
 
 
@@ -53,6 +222,9 @@ async def reinitialize_db(engine: AsyncEngine) -> None:
         await conn.run_sync(OrmBase.metadata.drop_all)
         await conn.run_sync(OrmBase.metadata.create_all)
 
+    # Pooled connections are bound to current event loop and process
+    await engine.dispose()
+
 
 class OrmBase(AsyncAttrs, DeclarativeBase):
     """
@@ -0,0 +1,129 @@
+import asyncio
+from concurrent.futures import (
+    Executor, ProcessPoolExecutor, ThreadPoolExecutor
+)
+from hashlib import pbkdf2_hmac
+
+from .exceptions import HashingQueueFull
+
+HASH_ITERATIONS: int = 10000
+
+
+def hash_password(password: str, salt: str) -> str:
+    """
+    Computes PBKDF2 hash of password (blocking call).
+
+    :param password: users plain password.
+    :param salt: users salt.
+    :return: HEX representation of hash.
+    """
+    return pbkdf2_hmac(
+        'sha256', password.encode('utf-8'),
+        salt=salt.encode('utf-8'), iterations=HASH_ITERATIONS
+    ).hex()
+
+
+class PasswordHasher:
+    """
+    Runs password hashing in thread or process pool, so event loop
+    is not blocked while hashing, and limits amount of pending jobs.
+    """
+
+    EXECUTOR_KINDS: frozenset[str] = frozenset({"thread", "process"})
+
+    def __init__(
+        self, executor_kind: str = "thread",
+        workers: int | None = None, max_queue: int = 64
+    ):
+        """
+        :param executor_kind: "thread" or "process".
+        :param workers: amount of workers in pool
+        (None lets executor decide).
+        :param max_queue: how many hashing jobs may be pending at once
+        before new ones are rejected.
+        :raise ValueError: if unknown executor kind is provided.
+        """
+        if executor_kind not in self.EXECUTOR_KINDS:
+            raise ValueError(f"Unknown executor kind: {executor_kind}")
+
+        self.executor_kind: str = executor_kind
+        self.workers: int | None = workers
+        self.max_queue: int = max_queue
+        self.pending: int = 0
+        self.rejected: int = 0
+        self._executor: Executor | None = None
+
+    def configure(
+        self, executor_kind: str, workers: int | None, max_queue: int
+    ) -> None:
+        """
+        Changes executor settings, shutting down existing executor.
+
+        :param executor_kind: "thread" or "process".
+        :param workers: amount of workers in pool.
+        :param max_queue: how many hashing jobs may be pending at once.
+        :return: nothing.
+        :raise ValueError: if unknown executor kind is provided.
+        """
+        if executor_kind not in self.EXECUTOR_KINDS:
+            raise ValueError(f"Unknown executor kind: {executor_kind}")
+
+        self.shutdown()
+        self.executor_kind = executor_kind
+        self.workers = workers
+        self.max_queue = max_queue
+
+    @property
+    def executor(self) -> Executor:
+        """
+        Lazily creates executor, so it's created in the process
+        that will use it.
+
+        :return: executor instance.
+        """
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(self.workers)
+
+            else:
+                self._executor = ThreadPoolExecutor(
+                    self.workers, thread_name_prefix="password_hasher"
+                )
+
+        return self._executor
+
+    async def hash_password(self, password: str, salt: str) -> str:
+        """
+        Computes PBKDF2 hash of password in executor.
+
+        :param password: users plain password.
+        :param salt: users salt.
+        :return: HEX representation of hash.
+        :raise HashingQueueFull: if too many hashing jobs are pending.
+        """
+        if self.pending >= self.max_queue:
+            self.rejected += 1
+            raise HashingQueueFull()
+
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, hash_password, password, salt
+            )
+
+        finally:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        """
+        Shuts down executor if it was created.
+
+        :return: nothing.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Shared by whole process, configured on application startup
+password_hasher: PasswordHasher = PasswordHasher()
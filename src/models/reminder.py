@@ -1,16 +1,23 @@
 from __future__ import annotations
 
 import datetime
+from typing import Any, AsyncIterator, ClassVar, Sequence, cast
 
 from sqlalchemy import (
-    and_, select, func,
-    String, CheckConstraint, ForeignKey, DateTime
+    and_, bindparam, insert, select, update, func,
+    String, CheckConstraint, ForeignKey, DateTime, Index, Table
 )
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.engine import CursorResult, Row
+from sqlalchemy.exc import DataError, IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column
 
+from .access_token import AccessToken
+from .access_token_cache import access_token_cache
+from .exceptions import InvalidCredentials
 from .initialize_connector import OrmBase
+from .sql_functions import hex_color, next_occurrence_at
+from .user import User, hash_access_token
 
 
 class Reminder(OrmBase):
@@ -19,6 +26,17 @@ class Reminder(OrmBase):
     """
 
     __tablename__ = "reminder"
+    __table_args__ = (
+        # Used for fetching reminders changed since last sync
+        Index(
+            "ix_reminder_author_last_edited",
+            "authored_by_user_id", "last_edited_at"
+        ),
+        # Used for paginating users reminders by id
+        Index("ix_reminder_author_id", "authored_by_user_id", "id"),
+        # Used by dispatcher for finding due reminders
+        Index("ix_reminder_next_trigger_at", "next_trigger_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     authored_by_user_id: Mapped[int] = mapped_column(
@@ -48,7 +66,8 @@ class Reminder(OrmBase):
         DateTime(timezone=True),
         server_default=func.now()
     )
-    # When was the last edit (used for syncing and overriding old reminders
+    # When was the last edit (used for syncing and overriding old reminders).
+    # Set by application on every write, so all edits use the same clock
     last_edited_at: Mapped[datetime.datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now()
@@ -63,61 +82,258 @@ class Reminder(OrmBase):
             "trigger_period >= 0"
         )
     )
+    # When dispatcher fires reminder next time (None if it won't)
+    next_trigger_at: Mapped[datetime.datetime | None] = mapped_column(
+        DateTime(timezone=True)
+    )
 
-    async def update_reminder(
-        self, session: AsyncSession, **fields
-    ) -> list[str]:
+    MODIFIABLE_FIELDS: ClassVar[frozenset[str]] = frozenset({
+        'title', 'description',
+        'color_code', 'is_periodic',
+        'triggered_at', 'trigger_period',
+    })
+    # Fields that change when reminder fires next time
+    SCHEDULE_FIELDS: ClassVar[frozenset[str]] = frozenset({
+        'is_periodic', 'triggered_at', 'trigger_period',
+    })
+
+    @classmethod
+    def _owned_by_token(cls, access_token: str) -> tuple[Any, int | None]:
         """
-        Modifies allowed fields of specific reminder.
+        Builds filter that matches reminders of user who owns access token.
 
-        :param session: SQLAlchemy session.
-        :param fields: fields to update. Allowed fields are:
-        title, description, color_code,
-        is_periodic, triggered_at, trigger_period.
-        :return: list of fields names that were modified.
+        :param access_token: users access token.
+        :return: filter expression and cached user id (None if token
+        is resolved by subquery).
         """
+        access_token_digest: bytes = hash_access_token(access_token)
+        user_id: int | None = access_token_cache.get(access_token_digest)
+        if user_id is not None:
+            return cls.authored_by_user_id == user_id, user_id
 
-        MODIFIABLE_FIELDS: frozenset[str] = frozenset({
-            'title', 'description',
-            'color_code', 'is_periodic',
-            'triggered_at', 'trigger_period',
-        })
+        return cls.authored_by_user_id == select(AccessToken.user_id).where(
+            AccessToken.digest == access_token_digest
+        ).scalar_subquery(), None
 
-        fields_to_modify = set(fields.keys()) & MODIFIABLE_FIELDS
-        modified_fields = []
+    @classmethod
+    def _with_next_trigger(cls, values: dict[str, Any]) -> dict[str, Any]:
+        """
+        Adds next trigger time to values of UPDATE statement
+        if they change schedule of reminders.
 
-        try:
-            if 'color_code' in fields_to_modify:
-                fields_to_modify.remove('color_code')
-                modified_fields.append('color_code')
-                self.color_code: int = self.convert_from_hex_to_int_color(
-                    fields['color_code']
+        :param values: new values of columns.
+        :return: values including next_trigger_at if it changes.
+        """
+        if values.get("is_active") is False:
+            return {**values, "next_trigger_at": None}
+
+        if "triggered_at" in values:
+            return {**values, "next_trigger_at": values["triggered_at"]}
+
+        if "is_periodic" in values or "trigger_period" in values:
+            return {
+                **values,
+                "next_trigger_at": next_occurrence_at(
+                    cls.triggered_at,
+                    values.get("is_periodic", cls.is_periodic),
+                    values.get("trigger_period", cls.trigger_period),
+                    cls.next_trigger_at,
+                    values.get("last_edited_at")
+                    or datetime.datetime.now(datetime.UTC)
                 )
+            }
+
+        return values
 
-            for key in fields_to_modify:
-                # dynamically update all fields
-                setattr(self, key, fields[key])
-                modified_fields.append(key)
+    @classmethod
+    async def _execute_owned_update(
+        cls, access_token: str, reminder_id: int,
+        values: dict[str, Any], session: AsyncSession
+    ) -> tuple[int, datetime.datetime | None] | None:
+        """
+        Runs single UPDATE on reminder of user who owns access token.
 
-            self.last_edited_at = datetime.datetime.now(datetime.UTC)
-            # Try commiting changes to database to check if values are ok
-            await session.commit()
-            return modified_fields
+        :param access_token: users access token.
+        :param reminder_id: ID of reminder to update.
+        :param values: new values of columns.
+        :param session: SQLAlchemy session.
+        :return: ID of user who owns updated reminder (0 if no such
+        reminder for that user) with its next trigger time, None if values
+        were rejected by database.
+        :raise InvalidCredentials: if there is no such access token in db.
+        """
+        owner_filter, user_id = cls._owned_by_token(access_token)
+        values = cls._with_next_trigger(values)
+        query = update(cls).where(
+            and_(owner_filter, cls.id == reminder_id)
+        ).values(**values).execution_options(synchronize_session=False)
+
+        try:
+            if session.get_bind().dialect.update_returning:
+                row: Row[Any] | None = (
+                    await session.execute(query.returning(
+                        cls.authored_by_user_id, cls.next_trigger_at
+                    ))
+                ).first()
+                if row is not None:
+                    return row.authored_by_user_id, row.next_trigger_at
+
+            else:
+                result = cast(
+                    CursorResult[Any], await session.execute(query)
+                )
+                if result.rowcount > 0:
+                    next_trigger_at: Any = values.get("next_trigger_at")
+                    if isinstance(next_trigger_at, next_occurrence_at):
+                        next_trigger_at = await session.scalar(
+                            select(cls.next_trigger_at).where(
+                                cls.id == reminder_id
+                            )
+                        )
+
+                    return (
+                        user_id if user_id is not None else (
+                            await User.get_user_id_by_access_token(
+                                access_token, session
+                            )
+                        ),
+                        next_trigger_at
+                    )
 
         except IntegrityError:
             await session.rollback()
-            return []
+            return None
+
+        if user_id is None:
+            # Tells apart invalid token from missing reminder
+            await User.get_user_id_by_access_token(access_token, session)
+
+        return 0, None
+
+    @classmethod
+    async def update_reminders_of_user(
+        cls, user_id: int, reminder_ids: list[int],
+        values: dict[str, Any], session: AsyncSession
+    ) -> dict[int, datetime.datetime | None] | None:
+        """
+        Sets same values on several reminders of user with single UPDATE
+        statement. Color code must already be converted to integer.
+
+        :param user_id: user who owns reminders.
+        :param reminder_ids: IDs of reminders to update.
+        :param values: new values of columns.
+        :param session: SQLAlchemy session.
+        :return: IDs of reminders that belong to user and were updated
+        mapped to their next trigger times or None if values were rejected
+        by database.
+        """
+        owner_filter = and_(
+            cls.authored_by_user_id == user_id,
+            cls.id.in_(reminder_ids)
+        )
+        query = update(cls).where(owner_filter).values(
+            **cls._with_next_trigger(values)
+        ).execution_options(synchronize_session=False)
 
-    async def deactivate_reminder(self, session: AsyncSession) -> bool:
         try:
-            self.is_active: bool = False
-            self.last_edited_at = datetime.datetime.now(datetime.UTC)
-            await session.commit()
-            return True
+            if session.get_bind().dialect.update_returning:
+                return dict(
+                    (await session.execute(query.returning(
+                        cls.id, cls.next_trigger_at
+                    ))).tuples().all()
+                )
 
-        except IntegrityError:
+            # Filter doesn't depend on updated columns
+            await session.execute(query)
+            return dict(
+                (await session.execute(
+                    select(cls.id, cls.next_trigger_at).where(owner_filter)
+                )).tuples().all()
+            )
+
+        except (IntegrityError, DataError):
             await session.rollback()
-            return False
+            return None
+
+    @classmethod
+    async def update_reminder_by_access_token(
+        cls, access_token: str, reminder_id: int,
+        session: AsyncSession, **fields: Any
+    ) -> tuple[list[str], int, datetime.datetime | None] | None:
+        """
+        Modifies allowed fields of specific reminder with single UPDATE
+        statement.
+
+        :param access_token: access token of user who owns reminder.
+        :param reminder_id: ID of reminder to update.
+        :param session: SQLAlchemy session.
+        :param fields: fields to update. Allowed fields are:
+        title, description, color_code,
+        is_periodic, triggered_at, trigger_period.
+        :return: list of fields names that were modified (empty if values
+        were rejected by database) with ID of user who owns reminder
+        (0 if rejected) and its next trigger time, or None if there's
+        no such reminder for that user.
+        :raise InvalidCredentials: if there is no such access token in db.
+        :raise ValueError: if color code is invalid.
+        """
+        values: dict[str, Any] = {
+            key: value for key, value in fields.items()
+            if key in cls.MODIFIABLE_FIELDS
+        }
+
+        if 'color_code' in values:
+            values['color_code'] = cls.convert_from_hex_to_int_color(
+                values['color_code']
+            )
+
+        modified_fields: list[str] = list(values.keys())
+        values['last_edited_at'] = datetime.datetime.now(datetime.UTC)
+
+        result: tuple[int, datetime.datetime | None] | None = (
+            await cls._execute_owned_update(
+                access_token, reminder_id, values, session
+            )
+        )
+
+        if result is None:
+            return [], 0, None
+
+        owner_id, next_trigger_at = result
+        return (
+            (modified_fields, owner_id, next_trigger_at) if owner_id
+            else None
+        )
+
+    @classmethod
+    async def deactivate_reminder_by_access_token(
+        cls, access_token: str, reminder_id: int, session: AsyncSession
+    ) -> int | None:
+        """
+        Marks specific reminder as inactive with single UPDATE statement.
+
+        :param access_token: access token of user who owns reminder.
+        :param reminder_id: ID of reminder to deactivate.
+        :param session: SQLAlchemy session.
+        :return: ID of user who owns deactivated reminder, 0 if database
+        rejected update or None if there's no such reminder for that user.
+        :raise InvalidCredentials: if there is no such access token in db.
+        """
+        result: tuple[int, datetime.datetime | None] | None = (
+            await cls._execute_owned_update(
+                access_token, reminder_id,
+                {
+                    'is_active': False,
+                    'last_edited_at': datetime.datetime.now(datetime.UTC)
+                },
+                session
+            )
+        )
+
+        if result is None:
+            return 0
+
+        return result[0] if result[0] else None
 
     @classmethod
     async def create_new_reminder(
@@ -125,6 +341,7 @@ class Reminder(OrmBase):
         color_code: str, triggered_at: datetime.datetime,
         is_periodic: bool, trigger_period: int, session: AsyncSession
     ) -> Reminder | None:
+        created_at: datetime.datetime = datetime.datetime.now(datetime.UTC)
         reminder = cls(
             authored_by_user_id=user_id,
             title=title,
@@ -132,7 +349,10 @@ class Reminder(OrmBase):
             color_code=cls.convert_from_hex_to_int_color(color_code),
             triggered_at=triggered_at,
             is_periodic=is_periodic,
-            trigger_period=trigger_period
+            trigger_period=trigger_period,
+            next_trigger_at=triggered_at,
+            created_at=created_at,
+            last_edited_at=created_at
         )
 
         async with session.begin_nested() as tr:
@@ -146,47 +366,266 @@ class Reminder(OrmBase):
 
         return reminder
 
+    @classmethod
+    async def create_new_reminders(
+        cls, user_id: int, reminders: list[dict[str, Any]],
+        session: AsyncSession
+    ) -> list[int] | None:
+        """
+        Creates several reminders with single multi-row INSERT statement.
+
+        :param user_id: user who creates reminders.
+        :param reminders: dicts with title, description, color_code
+        (HEX string), triggered_at, is_periodic and trigger_period.
+        :param session: SQLAlchemy session.
+        :return: ids of created reminders in the same order as
+        provided ones or None if database rejected any of them.
+        :raise ValueError: if any color code is invalid.
+        """
+        created_at: datetime.datetime = datetime.datetime.now(datetime.UTC)
+        rows: list[dict[str, Any]] = [
+            {
+                "authored_by_user_id": user_id,
+                "title": reminder["title"],
+                "description": reminder["description"],
+                "color_code": cls.convert_from_hex_to_int_color(
+                    reminder["color_code"]
+                ),
+                "triggered_at": reminder["triggered_at"],
+                "is_periodic": reminder["is_periodic"],
+                "trigger_period": reminder["trigger_period"],
+                "next_trigger_at": reminder["triggered_at"],
+                "created_at": created_at,
+                "last_edited_at": created_at,
+            }
+            for reminder in reminders
+        ]
+
+        if not rows:
+            return []
+
+        query = insert(cls).returning(cls.id, sort_by_parameter_order=True)
+        try:
+            return list((await session.scalars(query, rows)).all())
+
+        except (IntegrityError, DataError):
+            await session.rollback()
+            return None
+
     @classmethod
     async def get_reminder_by_id(
         cls, user_id: int, reminder_id: int, session: AsyncSession
-    ) -> Reminder | None:
+    ) -> Row[Any] | None:
         """
         Fetches reminder by its ID and ID of user who authored reminder.
 
         :param user_id: user who requests reminder by ID.
         :param reminder_id: ID of reminder to fetch.
         :param session: SQLAlchemy session.
-        :return: instance of Reminder or None in case there's
-        no such Reminder for that user.
+        :return: row with columns of REMINDER_COLUMNS or None in case
+        there's no such Reminder for that user.
         """
-        query = select(cls).where(
-            and_(
-                cls.authored_by_user_id == user_id,
-                cls.id == reminder_id
+        return (
+            await session.execute(
+                REMINDER_BY_ID_QUERY,
+                {"user_id": user_id, "reminder_id": reminder_id}
             )
-        )
-        result: Reminder | None = (await session.execute(query)).scalar()
-        return result
+        ).first()
+
+    @classmethod
+    async def get_reminder_by_access_token(
+        cls, access_token: str, reminder_id: int, session: AsyncSession
+    ) -> Row[Any] | None:
+        """
+        Fetches reminder by its ID and access token of user who authored
+        reminder, resolving token and reminder with single query.
+
+        :param access_token: access token of user who requests reminder.
+        :param reminder_id: ID of reminder to fetch.
+        :param session: SQLAlchemy session.
+        :return: row with columns of REMINDER_COLUMNS or None in case
+        there's no such Reminder for that user.
+        :raise InvalidCredentials: if there is no such access token in db.
+        """
+        access_token_digest: bytes = hash_access_token(access_token)
+        user_id: int | None = access_token_cache.get(access_token_digest)
+        if user_id is not None:
+            return await cls.get_reminder_by_id(user_id, reminder_id, session)
+
+        row = (
+            await session.execute(
+                REMINDER_BY_ACCESS_TOKEN_QUERY,
+                {
+                    "access_token_digest": access_token_digest,
+                    "reminder_id": reminder_id
+                }
+            )
+        ).first()
+
+        if row is None:
+            raise InvalidCredentials()
+
+        access_token_cache.put(access_token_digest, row.owner_id)
+        return row if row.id is not None else None
 
     @classmethod
     async def get_active_reminders_of_user(
         cls, user_id: int, session: AsyncSession
-    ) -> tuple[Reminder, ...]:
+    ) -> Sequence[Row[Any]]:
         """
         Fetches all active reminders that belong to specified user.
 
         :param user_id: user whose reminders need to be fetched.
         :param session: SQLAlchemy session.
-        :return: tuple of Reminder objects.
+        :return: rows with columns of REMINDER_COLUMNS ordered by id.
         """
-        query = select(cls).where(
-            and_(
-                cls.authored_by_user_id == user_id,
-                cls.is_active.is_(True)
+        return (
+            await session.execute(
+                ACTIVE_REMINDERS_QUERY, {"user_id": user_id}
             )
-        )
+        ).all()
 
-        return tuple((await session.execute(query)).scalars().all())
+    @classmethod
+    async def get_active_reminders_state(
+        cls, user_id: int, session: AsyncSession
+    ) -> tuple[int, str]:
+        """
+        Counts users active reminders and computes version of their list
+        without loading reminders.
+
+        :param user_id: user whose reminders version is needed.
+        :param session: SQLAlchemy session.
+        :return: amount of active reminders and version string that
+        changes whenever list changes.
+        """
+        count, last_edited_at = (
+            await session.execute(
+                ACTIVE_REMINDERS_STATE_QUERY, {"user_id": user_id}
+            )
+        ).one()
+
+        return count, cls.make_version(count, last_edited_at)
+
+    @classmethod
+    async def get_reminder_version_by_access_token(
+        cls, access_token: str, reminder_id: int, session: AsyncSession
+    ) -> str | None:
+        """
+        Computes version of specific reminder without loading it.
+
+        :param access_token: access token of user who owns reminder.
+        :param reminder_id: ID of reminder.
+        :param session: SQLAlchemy session.
+        :return: version string or None if reminder is not found
+        (or token is invalid).
+        """
+        access_token_digest: bytes = hash_access_token(access_token)
+        user_id: int | None = access_token_cache.get(access_token_digest)
+        last_edited_at: datetime.datetime | None
+        if user_id is not None:
+            last_edited_at = await session.scalar(
+                REMINDER_EDIT_TIME_QUERY,
+                {"user_id": user_id, "reminder_id": reminder_id}
+            )
+
+        else:
+            last_edited_at = await session.scalar(
+                REMINDER_EDIT_TIME_BY_ACCESS_TOKEN_QUERY,
+                {
+                    "access_token_digest": access_token_digest,
+                    "reminder_id": reminder_id
+                }
+            )
+
+        if last_edited_at is None:
+            return None
+
+        return cls.make_version(reminder_id, last_edited_at)
+
+    @staticmethod
+    def make_version(
+        number: int, last_edited_at: datetime.datetime | None
+    ) -> str:
+        """
+        Builds version string used as ETag.
+
+        :param number: amount of reminders in list or id of reminder.
+        :param last_edited_at: latest edit time.
+        :return: version string.
+        """
+        if last_edited_at is None:
+            return f"{number}"
+
+        return f"{number}-{last_edited_at.strftime('%Y%m%d%H%M%S%f')}"
+
+    @classmethod
+    async def get_reminders_of_user_edited_since(
+        cls, user_id: int, since: datetime.datetime, session: AsyncSession
+    ) -> Sequence[Row[Any]]:
+        """
+        Fetches reminders of specified user that were created, edited or
+        deactivated after specified moment, including deactivated ones.
+
+        :param user_id: user whose reminders need to be fetched.
+        :param since: moment of previous sync.
+        :param session: SQLAlchemy session.
+        :return: rows with columns of REMINDER_COLUMNS ordered
+        by last edit time.
+        """
+        return (
+            await session.execute(
+                REMINDERS_EDITED_SINCE_QUERY,
+                {"user_id": user_id, "since": since}
+            )
+        ).all()
+
+    @classmethod
+    async def get_active_reminders_page(
+        cls, user_id: int, after_id: int, limit: int, session: AsyncSession
+    ) -> Sequence[Row[Any]]:
+        """
+        Fetches page of active reminders ordered by id, starting after
+        specified id (keyset pagination).
+
+        :param user_id: user whose reminders need to be fetched.
+        :param after_id: id of last reminder on previous page
+        (0 for first page).
+        :param limit: maximum amount of reminders on page.
+        :param session: SQLAlchemy session.
+        :return: rows with columns of REMINDER_COLUMNS.
+        """
+        return (
+            await session.execute(
+                ACTIVE_REMINDERS_PAGE_QUERY,
+                {"user_id": user_id, "after_id": after_id, "limit": limit}
+            )
+        ).all()
+
+    @classmethod
+    async def stream_active_reminders_of_user(
+        cls, user_id: int, chunk_size: int, session: AsyncSession,
+        counted: bool = False
+    ) -> AsyncIterator[Sequence[Row[Any]]]:
+        """
+        Fetches active reminders of user in chunks using server-side
+        cursor, so whole list is never held in memory.
+
+        :param user_id: user whose reminders need to be fetched.
+        :param chunk_size: amount of reminders in each chunk.
+        :param session: SQLAlchemy session.
+        :param counted: add total column with amount of fetched reminders
+        to every row.
+        :return: async iterator of chunks of rows with columns
+        of REMINDER_COLUMNS ordered by id.
+        """
+        result = await session.stream(
+            COUNTED_ACTIVE_REMINDERS_QUERY if counted
+            else ACTIVE_REMINDERS_QUERY,
+            {"user_id": user_id},
+            execution_options={"yield_per": chunk_size}
+        )
+        async for chunk in result.partitions():
+            yield chunk
 
     @classmethod
     async def get_deactivated_reminders_of_user(
@@ -198,14 +637,76 @@ class Reminder(OrmBase):
         :param session: SQLAlchemy session.
         :return: tuple of Reminder objects.
         """
-        query = select(cls).where(
-            and_(
-                cls.authored_by_user_id == user_id,
-                cls.is_active.is_(False)
-            )
+        return tuple(
+            (
+                await session.execute(
+                    DEACTIVATED_REMINDERS_QUERY, {"user_id": user_id}
+                )
+            ).scalars().all()
         )
 
-        return tuple((await session.execute(query)).scalars().all())
+    @classmethod
+    async def claim_due_reminders(
+        cls, now: datetime.datetime, limit: int, skip_locked: bool,
+        session: AsyncSession
+    ) -> Sequence[Row[Any]]:
+        """
+        Fetches active reminders whose next trigger time has come,
+        earliest first. Rows stay locked until transaction ends if
+        database supports skipping locked rows, so other dispatchers
+        claim different reminders.
+
+        :param now: current moment.
+        :param limit: maximum amount of reminders.
+        :param skip_locked: lock rows with FOR UPDATE SKIP LOCKED.
+        :param session: SQLAlchemy session.
+        :return: rows with columns of DUE_REMINDER_COLUMNS.
+        """
+        return (
+            await session.execute(
+                DUE_REMINDERS_LOCKING_QUERY if skip_locked
+                else DUE_REMINDERS_QUERY,
+                {"now": now, "limit": limit}
+            )
+        ).all()
+
+    @classmethod
+    async def get_triggers_between(
+        cls, after: datetime.datetime, until: datetime.datetime,
+        session: AsyncSession
+    ) -> Sequence[Row[Any]]:
+        """
+        Fetches next trigger times of active reminders that fire
+        within specified period.
+
+        :param after: start of period (exclusive).
+        :param until: end of period (inclusive).
+        :param session: SQLAlchemy session.
+        :return: rows with id and next_trigger_at.
+        """
+        return (
+            await session.execute(
+                TRIGGERS_BETWEEN_QUERY, {"after": after, "until": until}
+            )
+        ).all()
+
+    @classmethod
+    async def reschedule_reminders(
+        cls, schedule: list[dict[str, Any]], session: AsyncSession
+    ) -> None:
+        """
+        Sets next trigger time of fired reminders with single
+        executemany statement. Reminders rescheduled by their owners
+        after being claimed are not changed.
+
+        :param schedule: dicts with reminder_id, claimed_at (trigger time
+        reminder was claimed with) and next_trigger_at (None if reminder
+        won't fire again).
+        :param session: SQLAlchemy session.
+        :return: nothing.
+        """
+        if schedule:
+            await session.execute(RESCHEDULE_REMINDER_QUERY, schedule)
 
     @staticmethod
     def convert_from_hex_to_int_color(hex_color: str) -> int:
@@ -234,3 +735,128 @@ class Reminder(OrmBase):
         :return:
         """
         return f'{color:x}'.zfill(6).upper()
+
+
+# Statements are built once and executed with bound parameters, so calls
+# don't pay for constructing them and computing their cache keys
+_owned_by_user = Reminder.authored_by_user_id == bindparam("user_id")
+_owned_by_access_token = Reminder.authored_by_user_id == select(
+    AccessToken.user_id
+).where(
+    AccessToken.digest == bindparam("access_token_digest")
+).scalar_subquery()
+
+# Columns sent to clients, selected as plain rows so read-only requests
+# don't build ORM objects and track them in session
+REMINDER_COLUMNS = (
+    Reminder.id,
+    Reminder.title,
+    Reminder.description,
+    hex_color(Reminder.color_code).label("color_code"),
+    Reminder.is_active,
+    Reminder.is_periodic,
+    Reminder.created_at,
+    Reminder.last_edited_at,
+    Reminder.triggered_at,
+    Reminder.trigger_period,
+)
+
+REMINDER_BY_ID_QUERY = select(*REMINDER_COLUMNS).where(
+    and_(_owned_by_user, Reminder.id == bindparam("reminder_id"))
+)
+REMINDER_BY_ACCESS_TOKEN_QUERY = select(
+    AccessToken.user_id.label("owner_id"), *REMINDER_COLUMNS
+).outerjoin(
+    Reminder,
+    and_(
+        Reminder.authored_by_user_id == AccessToken.user_id,
+        Reminder.id == bindparam("reminder_id")
+    )
+).where(AccessToken.digest == bindparam("access_token_digest"))
+REMINDER_EDIT_TIME_QUERY = select(Reminder.last_edited_at).where(
+    and_(_owned_by_user, Reminder.id == bindparam("reminder_id"))
+)
+REMINDER_EDIT_TIME_BY_ACCESS_TOKEN_QUERY = select(
+    Reminder.last_edited_at
+).where(
+    and_(_owned_by_access_token, Reminder.id == bindparam("reminder_id"))
+)
+ACTIVE_REMINDERS_QUERY = select(*REMINDER_COLUMNS).where(
+    and_(_owned_by_user, Reminder.is_active.is_(True))
+).order_by(Reminder.id)
+# Every row also carries amount of rows in result, so stream knows length
+# of list read by the same statement before it ends
+COUNTED_ACTIVE_REMINDERS_QUERY = select(
+    *REMINDER_COLUMNS, func.count().over().label("total")
+).where(
+    and_(_owned_by_user, Reminder.is_active.is_(True))
+).order_by(Reminder.id)
+ACTIVE_REMINDERS_STATE_QUERY = select(
+    func.count(Reminder.id), func.max(Reminder.last_edited_at)
+).where(
+    and_(_owned_by_user, Reminder.is_active.is_(True))
+)
+ACTIVE_REMINDERS_PAGE_QUERY = select(*REMINDER_COLUMNS).where(
+    and_(
+        _owned_by_user,
+        Reminder.is_active.is_(True),
+        Reminder.id > bindparam("after_id")
+    )
+).order_by(Reminder.id).limit(bindparam("limit"))
+DEACTIVATED_REMINDERS_QUERY = select(Reminder).where(
+    and_(_owned_by_user, Reminder.is_active.is_(False))
+)
+REMINDERS_EDITED_SINCE_QUERY = select(*REMINDER_COLUMNS).where(
+    and_(
+        _owned_by_user,
+        Reminder.last_edited_at > bindparam(
+            "since", type_=DateTime(timezone=True)
+        )
+    )
+).order_by(Reminder.last_edited_at)
+DUE_REMINDER_COLUMNS = (
+    Reminder.id,
+    Reminder.authored_by_user_id,
+    Reminder.title,
+    Reminder.description,
+    hex_color(Reminder.color_code).label("color_code"),
+    Reminder.is_periodic,
+    Reminder.trigger_period,
+    Reminder.next_trigger_at,
+)
+DUE_REMINDERS_QUERY = select(*DUE_REMINDER_COLUMNS).where(
+    and_(
+        Reminder.next_trigger_at <= bindparam(
+            "now", type_=DateTime(timezone=True)
+        ),
+        Reminder.is_active.is_(True)
+    )
+).order_by(Reminder.next_trigger_at).limit(bindparam("limit"))
+TRIGGERS_BETWEEN_QUERY = select(Reminder.id, Reminder.next_trigger_at).where(
+    and_(
+        Reminder.next_trigger_at > bindparam(
+            "after", type_=DateTime(timezone=True)
+        ),
+        Reminder.next_trigger_at <= bindparam(
+            "until", type_=DateTime(timezone=True)
+        ),
+        Reminder.is_active.is_(True)
+    )
+)
+DUE_REMINDERS_LOCKING_QUERY = DUE_REMINDERS_QUERY.with_for_update(
+    skip_locked=True
+)
+_reminder_table = cast(Table, Reminder.__table__)
+# Core statement, so it's executed as executemany with row parameters
+RESCHEDULE_REMINDER_QUERY = update(_reminder_table).where(
+    and_(
+        _reminder_table.c.id == bindparam("reminder_id"),
+        _reminder_table.c.next_trigger_at == bindparam(
+            "claimed_at", type_=DateTime(timezone=True)
+        )
+    )
+).values(
+    next_trigger_at=bindparam(
+        "next_trigger_at", type_=DateTime(timezone=True)
+    )
+)
@@ -0,0 +1,459 @@
+import asyncio
+import datetime
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, fields
+from typing import Any, Iterable, Sequence
+
+import aiohttp
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine, AsyncSession, async_sessionmaker
+)
+
+from src.DTO.codecs import JSON_CODEC
+from src.DTO.due_reminder_DTO import DueReminderDTO
+from .reminder import Reminder
+from .trigger_schedule import trigger_schedule
+
+logger = logging.getLogger(__name__)
+
+# Dialects that can skip rows locked by other dispatchers
+SKIP_LOCKED_DIALECTS: frozenset[str] = frozenset(
+    {"postgresql", "mysql", "mariadb", "oracle"}
+)
+
+
+@dataclass
+class DispatcherOptions:
+    """
+    Reminder dispatcher settings ([RemindMe.dispatcher] config table).
+    """
+
+    enabled: bool = False
+    # Seconds between checks for due reminders
+    interval: float = 1.0
+    # Maximum amount of reminders claimed by one transaction
+    batch_size: int = 100
+    # "log" or "webhook"
+    sink: str = "log"
+    # Url due reminders are posted to by webhook sink
+    webhook_url: str = ""
+    # Seconds given to webhook to accept reminders
+    webhook_timeout: float = 5.0
+    # Failed deliveries after which reminder is given up on
+    # and written to dead letter log
+    max_attempts: int = 10
+    # Upper limit of seconds between retries of failed delivery,
+    # which start at interval and double after every failure
+    max_retry_delay: float = 300.0
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "DispatcherOptions":
+        """
+        Creates options from config table, ignoring unknown keys.
+
+        :param config: [RemindMe.dispatcher] table contents.
+        :return: options instance.
+        """
+        known_fields: set[str] = {option.name for option in fields(cls)}
+        return cls(**{
+            key: value for key, value in config.items()
+            if key in known_fields
+        })
+
+
+class ReminderSink(ABC):
+    """
+    Receives due reminders from dispatcher. Reminders are considered
+    delivered when deliver returns, exception makes dispatcher
+    deliver them again later.
+    """
+
+    @abstractmethod
+    async def deliver(self, reminders: Sequence[DueReminderDTO]) -> None:
+        """
+        Delivers due reminders.
+
+        :param reminders: reminders that are due.
+        :return: nothing.
+        """
+
+    async def close(self) -> None:
+        """
+        Releases resources of sink.
+
+        :return: nothing.
+        """
+
+
+class LogSink(ReminderSink):
+    """
+    Writes due reminders to log.
+    """
+
+    async def deliver(self, reminders: Sequence[DueReminderDTO]) -> None:
+        for reminder in reminders:
+            logger.info(
+                "Reminder %s of user %s is due at %s: %s",
+                reminder.id, reminder.user_id,
+                reminder.trigger_at.isoformat(), reminder.title
+            )
+
+
+class QueueSink(ReminderSink):
+    """
+    Puts due reminders into asyncio queue read by consumers
+    in the same process.
+    """
+
+    def __init__(self, queue: asyncio.Queue[DueReminderDTO] | None = None):
+        """
+        :param queue: queue for reminders (unbounded one if not provided).
+        """
+        self.queue: asyncio.Queue[DueReminderDTO] = (
+            queue if queue is not None else asyncio.Queue()
+        )
+
+    async def deliver(self, reminders: Sequence[DueReminderDTO]) -> None:
+        for reminder in reminders:
+            await self.queue.put(reminder)
+
+
+class WebhookSink(ReminderSink):
+    """
+    Posts due reminders to url as JSON array, any response status
+    other than 2xx makes dispatcher retry them later.
+    """
+
+    def __init__(self, url: str, timeout: float):
+        """
+        :param url: url receiving reminders.
+        :param timeout: seconds given to receiver to respond.
+        """
+        self.url: str = url
+        self.timeout: aiohttp.ClientTimeout = aiohttp.ClientTimeout(
+            total=timeout
+        )
+        self._client: aiohttp.ClientSession | None = None
+
+    async def deliver(self, reminders: Sequence[DueReminderDTO]) -> None:
+        if self._client is None:
+            self._client = aiohttp.ClientSession(timeout=self.timeout)
+
+        async with self._client.post(
+            self.url, data=JSON_CODEC.encode(list(reminders)),
+            headers={"Content-Type": JSON_CODEC.content_type}
+        ) as response:
+            response.raise_for_status()
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+def create_sink(options: DispatcherOptions) -> ReminderSink:
+    """
+    Creates sink configured by options.
+
+    :param options: dispatcher settings.
+    :return: sink instance.
+    :raise ValueError: if sink is unknown or webhook has no url.
+    """
+    if options.sink == "log":
+        return LogSink()
+
+    if options.sink == "webhook":
+        if not options.webhook_url:
+            raise ValueError("Webhook sink requires webhook_url")
+
+        return WebhookSink(options.webhook_url, options.webhook_timeout)
+
+    raise ValueError(f"Unknown reminder sink: {options.sink}")
+
+
+def supports_skip_locked(engine: AsyncEngine) -> bool:
+    """
+    Checks if several dispatchers can claim reminders
+    of database concurrently.
+
+    :param engine: engine of database.
+    :return: True if database can skip locked rows.
+    """
+    return engine.dialect.name in SKIP_LOCKED_DIALECTS
+
+
+def next_occurrence(
+    trigger_at: datetime.datetime, is_periodic: bool,
+    trigger_period: int, now: datetime.datetime
+) -> datetime.datetime | None:
+    """
+    Computes next trigger time of fired reminder. Occurrences missed
+    while reminders were not dispatched are skipped.
+
+    :param trigger_at: trigger time reminder fired for.
+    :param is_periodic: reminder repeats itself.
+    :param trigger_period: days between occurrences.
+    :param now: current moment.
+    :return: first occurrence after now or None if reminder
+    won't fire again.
+    """
+    if not is_periodic or trigger_period <= 0:
+        return None
+
+    period: datetime.timedelta = datetime.timedelta(days=trigger_period)
+    return trigger_at + ((now - trigger_at) // period + 1) * period
+
+
+class ReminderDispatcher:
+    """
+    Fires reminders when their trigger time comes, handing them to sink
+    and advancing periodic ones to their next occurrence.
+
+    Due reminders are claimed in batches by transactions that lock them
+    with FOR UPDATE SKIP LOCKED, so dispatchers on several nodes never
+    claim same reminder. Sink receives reminders before transaction is
+    committed, so reminders whose delivery failed are claimed again,
+    and reminders are delivered at least once. Databases without
+    SKIP LOCKED (SQLite) must be dispatched by single process.
+
+    Failed deliveries are retried with exponential backoff. Reminders
+    whose delivery failed max_attempts times are written to dead letter
+    log and rescheduled as if delivered, so they don't block others.
+    Attempts are counted by every dispatcher on its own.
+    """
+
+    def __init__(
+        self, session_maker: async_sessionmaker[AsyncSession],
+        options: DispatcherOptions, sink: ReminderSink | None = None
+    ):
+        """
+        :param session_maker: session factory of primary database.
+        :param options: dispatcher settings.
+        :param sink: receiver of due reminders (created from options
+        if not provided).
+        :raise ValueError: if sink configured by options is invalid.
+        """
+        self.session_maker: async_sessionmaker[AsyncSession] = session_maker
+        self.options: DispatcherOptions = options
+        self.sink: ReminderSink = (
+            sink if sink is not None else create_sink(options)
+        )
+        self.skip_locked: bool = supports_skip_locked(
+            session_maker.kw["bind"]
+        )
+        self.dispatched: int = 0
+        self.failures: int = 0
+        self.dead_lettered: int = 0
+        # Failed deliveries of reminders by id and trigger time
+        self._attempts: dict[tuple[int, datetime.datetime], int] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._wakeup: asyncio.Event = asyncio.Event()
+
+    def wake(self, *args: Any) -> None:
+        """
+        Makes dispatcher check for due reminders without waiting
+        for interval to pass.
+
+        :param args: ignored (ids of due reminders from schedule).
+        :return: nothing.
+        """
+        self._wakeup.set()
+
+    async def dispatch_due(
+        self, now: datetime.datetime | None = None
+    ) -> int:
+        """
+        Claims single batch of due reminders, delivers them to sink
+        and reschedules them in one transaction.
+
+        :param now: current moment (taken from clock if not provided).
+        :return: amount of dispatched reminders.
+        :raise Exception: if sink failed to deliver reminders.
+        """
+        if now is None:
+            now = datetime.datetime.now(datetime.UTC)
+
+        async with self.session_maker() as session:
+            rows: Sequence[Row[Any]] = await Reminder.claim_due_reminders(
+                now, self.options.batch_size, self.skip_locked, session
+            )
+            if not rows:
+                # Nothing is stuck, forget attempts of rescheduled ones
+                self._attempts.clear()
+                return 0
+
+            reminders: list[DueReminderDTO] = []
+            schedule: list[dict[str, Any]] = []
+            for row in rows:
+                trigger_at: datetime.datetime = row.next_trigger_at
+                if trigger_at.tzinfo is None:
+                    # SQLite doesn't keep time zones, values are in UTC
+                    trigger_at = trigger_at.replace(tzinfo=datetime.UTC)
+
+                reminders.append(DueReminderDTO(
+                    row.id, row.authored_by_user_id, row.title,
+                    row.description, row.color_code, trigger_at
+                ))
+                schedule.append({
+                    "reminder_id": row.id,
+                    "claimed_at": row.next_trigger_at,
+                    "next_trigger_at": next_occurrence(
+                        trigger_at, row.is_periodic, row.trigger_period, now
+                    )
+                })
+
+            try:
+                await self.sink.deliver(reminders)
+
+            except Exception:
+                given_up: set[int] = self._count_failed_delivery(reminders)
+                if not given_up:
+                    raise
+
+                # Rest of batch stays due and is retried after backoff
+                self._write_dead_letters(
+                    reminder for reminder in reminders
+                    if reminder.id in given_up
+                )
+                await self._reschedule([
+                    item for item in schedule
+                    if item["reminder_id"] in given_up
+                ], session)
+                self.dead_lettered += len(given_up)
+                raise
+
+            await self._reschedule(schedule, session)
+
+        for reminder in reminders:
+            self._attempts.pop((reminder.id, reminder.trigger_at), None)
+
+        self.dispatched += len(reminders)
+        return len(reminders)
+
+    def _count_failed_delivery(
+        self, reminders: Sequence[DueReminderDTO]
+    ) -> set[int]:
+        """
+        Counts failed delivery attempt of reminders.
+
+        :param reminders: reminders that weren't delivered.
+        :return: ids of reminders that ran out of attempts.
+        """
+        given_up: set[int] = set()
+        for reminder in reminders:
+            key: tuple[int, datetime.datetime] = (
+                reminder.id, reminder.trigger_at
+            )
+            attempts: int = self._attempts.get(key, 0) + 1
+            if attempts >= self.options.max_attempts:
+                self._attempts.pop(key, None)
+                given_up.add(reminder.id)
+
+            else:
+                self._attempts[key] = attempts
+
+        return given_up
+
+    def _write_dead_letters(self, reminders: Iterable[DueReminderDTO]) -> None:
+        """
+        Logs reminders that couldn't be delivered, so they can be
+        recovered by hand.
+
+        :param reminders: reminders given up on.
+        :return: nothing.
+        """
+        for reminder in reminders:
+            logger.error(
+                "Giving up on reminder %s of user %s due at %s after %s "
+                "failed deliveries: %s",
+                reminder.id, reminder.user_id,
+                reminder.trigger_at.isoformat(), self.options.max_attempts,
+                JSON_CODEC.encode(reminder).decode()
+            )
+
+    @staticmethod
+    async def _reschedule(
+        schedule: list[dict[str, Any]], session: AsyncSession
+    ) -> None:
+        """
+        Moves fired reminders to their next occurrence and commits.
+
+        :param schedule: reminder ids, claimed and next trigger times.
+        :param session: session that claimed reminders.
+        :return: nothing.
+        """
+        await Reminder.reschedule_reminders(schedule, session)
+        trigger_schedule.update_on_commit(session, (
+            (item["reminder_id"], item["next_trigger_at"])
+            for item in schedule
+        ))
+        await session.commit()
+
+    def retry_delay(self, failures: int) -> float:
+        """
+        Computes pause after consecutive failed dispatches.
+
+        :param failures: dispatches failed in a row.
+        :return: seconds to wait before next attempt.
+        """
+        return min(
+            self.options.interval * 2 ** min(failures - 1, 32),
+            self.options.max_retry_delay
+        )
+
+    async def _run(self) -> None:
+        failed_in_row: int = 0
+        while True:
+            try:
+                dispatched: int = await self.dispatch_due()
+                failed_in_row = 0
+
+            except Exception:
+                self.failures += 1
+                failed_in_row += 1
+                logger.exception("Failed to dispatch due reminders")
+                # Wakeups don't shorten backoff of failing sink
+                await asyncio.sleep(self.retry_delay(failed_in_row))
+                self._wakeup.clear()
+                continue
+
+            # Full batch means more reminders may be due already
+            if dispatched < self.options.batch_size:
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), self.options.interval
+                    )
+
+                except TimeoutError:
+                    pass
+
+            self._wakeup.clear()
+
+    async def start(self) -> None:
+        """
+        Starts dispatching reminders in background if it's enabled.
+
+        :return: nothing.
+        """
+        if self.options.enabled:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stops dispatching and closes sink.
+
+        :return: nothing.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+
+            except asyncio.CancelledError:
+                pass
+
+            self._task = None
+
+        await self.sink.close()
@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+# Key of session.info with ids of users whose lists must be dropped on commit
+PENDING_INVALIDATIONS_KEY: str = "invalidated_reminders_lists"
+
+
+class CachedList:
+    """
+    Encoded list of users active reminders along with its
+    compressed variants.
+    """
+
+    __slots__ = (
+        "user_id", "content_type", "version", "body",
+        "compressed", "expires_at", "cache"
+    )
+
+    def __init__(
+        self, user_id: int, content_type: str, version: str, body: bytes
+    ):
+        """
+        :param user_id: id of user who owns reminders.
+        :param content_type: media type of encoded list.
+        :param version: version of list.
+        :param body: encoded list.
+        """
+        self.user_id: int = user_id
+        self.content_type: str = content_type
+        self.version: str = version
+        self.body: bytes = body
+        self.compressed: dict[str, bytes] = {}
+        self.expires_at: float = 0.0
+        # Cache that accounts memory of compressed variants
+        # (None if list isn't cached)
+        self.cache: RemindersListCache | None = None
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(map(len, self.compressed.values()))
+
+    def get_compressed(self, encoding: str) -> bytes | None:
+        """
+        Gets body compressed with specified encoding.
+
+        :param encoding: name of content encoding.
+        :return: compressed body or None if it wasn't compressed yet.
+        """
+        return self.compressed.get(encoding)
+
+    def put_compressed(self, encoding: str, data: bytes) -> None:
+        """
+        Saves compressed variant of body, if list is still cached.
+
+        :param encoding: name of content encoding.
+        :param data: compressed body.
+        :return: nothing.
+        """
+        if self.cache is not None:
+            self.cache.add_compressed(self, encoding, data)
+
+
+class RemindersListCache:
+    """
+    LRU cache with memory budget and TTL that maps users ids and media
+    types to already encoded lists of users active reminders, so repeated
+    requests skip both database query and serialization. Compressed
+    variants of lists are kept within same memory budget.
+
+    Each invalidation gets number from increasing counter, and lists read
+    before last invalidation of their user are not stored, so request
+    that raced with write can't put outdated list back into cache.
+    Lists read within settle time after invalidation aren't stored either,
+    since they may come from replica that hasn't received write yet.
+
+    Invalidation only reaches cache of current process, so cached list
+    is served only if its version matches current state of list read
+    from database, and lists changed through other workers are never
+    served.
+    """
+
+    def __init__(
+        self, max_bytes: int = 64 * 1024 * 1024, ttl: float = 60.0,
+        settle_time: float = 0.0
+    ):
+        """
+        :param max_bytes: maximum total size of cached bodies
+        (0 disables caching).
+        :param ttl: how many seconds cached list is kept since
+        it was stored.
+        :param settle_time: how many seconds after invalidation users list
+        isn't stored (maximum lag of read replicas).
+        """
+        self.max_bytes: int = max_bytes
+        self.ttl: float = ttl
+        self.settle_time: float = settle_time
+        self.hits: int = 0
+        self.misses: int = 0
+        self.size_bytes: int = 0
+        self.generation: int = 0
+        self._entries: OrderedDict[
+            tuple[int, str], CachedList
+        ] = OrderedDict()
+        # Media types lists were encoded with
+        self._content_types: set[str] = set()
+        # user id -> generation and monotonic time of last invalidation
+        self._invalidated_at: OrderedDict[
+            int, tuple[int, float]
+        ] = OrderedDict()
+        # Lists read before that generation are never stored
+        self._oldest_generation: int = 0
+
+    def configure(
+        self, max_bytes: int, ttl: float, settle_time: float = 0.0
+    ) -> None:
+        """
+        Changes cache limits and drops all cached lists.
+
+        :param max_bytes: maximum total size of cached bodies.
+        :param ttl: how many seconds cached list is considered valid.
+        :param settle_time: how many seconds after invalidation users list
+        isn't stored.
+        :return: nothing.
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.settle_time = settle_time
+        self.clear()
+
+    def get(
+        self, user_id: int, content_type: str, version: str
+    ) -> CachedList | None:
+        """
+        Gets encoded list of users active reminders.
+
+        :param user_id: id of user who owns reminders.
+        :param content_type: media type of encoded list.
+        :param version: current version of list.
+        :return: cached list or None if list is not cached, expired
+        or outdated.
+        """
+        key: tuple[int, str] = (user_id, content_type)
+        entry: CachedList | None = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if (
+            entry.version != version
+            or entry.expires_at <= time.monotonic()
+        ):
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(
+        self, user_id: int, content_type: str,
+        version: str, body: bytes, generation: int
+    ) -> CachedList:
+        """
+        Saves encoded list, evicting least recently used lists
+        if memory budget is exceeded.
+
+        :param user_id: id of user who owns reminders.
+        :param content_type: media type of encoded list.
+        :param version: version of list.
+        :param body: encoded list.
+        :param generation: value of generation attribute taken before
+        list was read from database.
+        :return: list object (not attached to cache if it wasn't saved).
+        """
+        entry: CachedList = CachedList(user_id, content_type, version, body)
+        if len(body) > self.max_bytes:
+            return entry
+
+        if generation < self._oldest_generation:
+            return entry
+
+        invalidated_at: tuple[int, float] | None = self._invalidated_at.get(
+            user_id
+        )
+        if invalidated_at is not None and (
+            generation < invalidated_at[0]
+            or time.monotonic() - invalidated_at[1] < self.settle_time
+        ):
+            return entry
+
+        key: tuple[int, str] = (user_id, content_type)
+        self._remove(key)
+        entry.cache = self
+        entry.expires_at = time.monotonic() + self.ttl
+        self._entries[key] = entry
+        self._content_types.add(content_type)
+        self.size_bytes += len(body)
+        self._evict()
+
+        return entry
+
+    def add_compressed(
+        self, entry: CachedList, encoding: str, data: bytes
+    ) -> None:
+        """
+        Saves compressed variant of cached list.
+
+        :param entry: cached list.
+        :param encoding: name of content encoding.
+        :param data: compressed body.
+        :return: nothing.
+        """
+        key: tuple[int, str] = (entry.user_id, entry.content_type)
+        if self._entries.get(key) is not entry:
+            return
+
+        previous: bytes | None = entry.compressed.get(encoding)
+        entry.compressed[encoding] = data
+        self.size_bytes += len(data) - len(previous or b"")
+        self._entries.move_to_end(key)
+        self._evict()
+
+    def _evict(self) -> None:
+        while self.size_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            evicted.cache = None
+            self.size_bytes -= evicted.size
+
+    def invalidate(self, user_id: int) -> None:
+        """
+        Removes users list from cache (must be called after users
+        reminders are changed).
+
+        :param user_id: id of user whose reminders were changed.
+        :return: nothing.
+        """
+        for content_type in self._content_types:
+            self._remove((user_id, content_type))
+
+        self.generation += 1
+        now: float = time.monotonic()
+        self._invalidated_at[user_id] = (self.generation, now)
+        self._invalidated_at.move_to_end(user_id)
+
+        # Only recent invalidations matter for reads in progress,
+        # older ones are replaced by single lower bound
+        while len(self._invalidated_at) > max(len(self._entries), 1024):
+            _, (generation, invalidated_at) = next(
+                iter(self._invalidated_at.items())
+            )
+            if now - invalidated_at < self.settle_time:
+                break
+
+            self._invalidated_at.popitem(last=False)
+            self._oldest_generation = generation
+
+    @staticmethod
+    def invalidate_on_commit(user_id: int, session: AsyncSession) -> None:
+        """
+        Schedules invalidation of users list for the moment session
+        commits, so concurrent requests can't cache uncommitted state.
+
+        :param user_id: id of user whose reminders are changed.
+        :param session: SQLAlchemy session that changes reminders.
+        :return: nothing.
+        """
+        session.info.setdefault(PENDING_INVALIDATIONS_KEY, set()).add(user_id)
+
+    def clear(self) -> None:
+        """
+        Removes all lists from cache.
+
+        :return: nothing.
+        """
+        for entry in self._entries.values():
+            entry.cache = None
+
+        self._entries.clear()
+        self.size_bytes = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """
+        Ratio of cache hits to all lookups.
+
+        :return: float value in range from 0 to 1.
+        """
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def _remove(self, key: tuple[int, str]) -> None:
+        entry: CachedList | None = self._entries.pop(key, None)
+        if entry is not None:
+            entry.cache = None
+            self.size_bytes -= entry.size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared by whole process, configured on application startup
+reminders_list_cache: RemindersListCache = RemindersListCache()
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_committed_lists(session: Session) -> None:
+    for user_id in session.info.pop(PENDING_INVALIDATIONS_KEY, ()):
+        reminders_list_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def forget_rolled_back_lists(session: Session) -> None:
+    session.info.pop(PENDING_INVALIDATIONS_KEY, None)
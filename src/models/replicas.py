@@ -0,0 +1,212 @@
+import asyncio
+import itertools
+import logging
+from dataclasses import dataclass, field, fields
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine, AsyncSession, async_sessionmaker
+)
+
+from .initialize_connector import (
+    DatabaseOptions, create_engine, create_session_factory
+)
+
+logger = logging.getLogger(__name__)
+
+# Seconds replica is behind primary, zero when all received WAL is replayed
+POSTGRES_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+    "THEN 0 ELSE COALESCE(EXTRACT(EPOCH FROM "
+    "now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+HEALTH_CHECK_QUERY = text("SELECT 1")
+
+
+@dataclass
+class ReplicaOptions:
+    """
+    Read replicas settings ([RemindMe.replicas] config table).
+    """
+
+    # Connection strings of replicas, reads use primary if it's empty
+    connections: list[str] = field(default_factory=list)
+    # Seconds between health checks of replicas
+    health_check_interval: float = 5.0
+    # Seconds given to replica to answer health check
+    health_check_timeout: float = 2.0
+    # Replicas lagging behind primary more than that amount of seconds
+    # are not used (only checked on PostgreSQL)
+    max_lag: float = 10.0
+    # Seconds after write during which clients reads go to primary
+    read_after_write: float = 10.0
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "ReplicaOptions":
+        """
+        Creates options from config table, ignoring unknown keys.
+
+        :param config: [RemindMe.replicas] table contents.
+        :return: options instance.
+        """
+        known_fields: set[str] = {option.name for option in fields(cls)}
+        return cls(**{
+            key: value for key, value in config.items()
+            if key in known_fields
+        })
+
+
+class Replica:
+    """
+    Read replica of database with its own connection pool.
+    """
+
+    def __init__(self, connection_url: str, options: DatabaseOptions):
+        """
+        :param connection_url: string with initialization
+        parameters for engine.
+        :param options: pool and driver settings.
+        """
+        self.engine: AsyncEngine = create_engine(connection_url, options)
+        self.session_maker: async_sessionmaker[
+            AsyncSession
+        ] = create_session_factory(self.engine)
+        self.name: str = self.engine.url.render_as_string(hide_password=True)
+        # Replicas are used only after first successful health check
+        self.healthy: bool = False
+        self.lag: float = 0.0
+
+
+class ReplicaSet:
+    """
+    Routes read-only sessions to healthy replicas in round-robin order,
+    falling back to primary database if none of replicas is available.
+    Replicas are checked periodically in background, and replica that
+    failed query is excluded until next successful check.
+    """
+
+    def __init__(
+        self, primary: async_sessionmaker[AsyncSession],
+        options: ReplicaOptions,
+        database_options: DatabaseOptions | None = None
+    ):
+        """
+        :param primary: session factory of primary database.
+        :param options: replicas settings.
+        :param database_options: pool and driver settings of replicas.
+        """
+        if database_options is None:
+            database_options = DatabaseOptions()
+
+        self.primary: async_sessionmaker[AsyncSession] = primary
+        self.options: ReplicaOptions = options
+        self.replicas: list[Replica] = [
+            Replica(connection_url, database_options)
+            for connection_url in options.connections
+        ]
+        self._order = itertools.cycle(self.replicas)
+        self._health_checks: asyncio.Task[None] | None = None
+
+    def pick(self) -> Replica | None:
+        """
+        Picks next healthy replica.
+
+        :return: replica or None if there's no healthy replicas.
+        """
+        for _ in range(len(self.replicas)):
+            replica: Replica = next(self._order)
+            if replica.healthy:
+                return replica
+
+        return None
+
+    def mark_unhealthy(self, replica: Replica) -> None:
+        """
+        Excludes replica from reads until its next successful health check.
+
+        :param replica: replica that failed.
+        :return: nothing.
+        """
+        if replica.healthy:
+            logger.warning("Replica %s is unavailable", replica.name)
+
+        replica.healthy = False
+
+    async def check_replica(self, replica: Replica) -> None:
+        """
+        Checks that replica answers queries and isn't lagging too much.
+
+        :param replica: replica to check.
+        :return: nothing.
+        """
+        try:
+            async with asyncio.timeout(self.options.health_check_timeout):
+                async with replica.engine.connect() as connection:
+                    await connection.execute(HEALTH_CHECK_QUERY)
+                    if connection.dialect.name == "postgresql":
+                        replica.lag = float(
+                            await connection.scalar(POSTGRES_LAG_QUERY) or 0
+                        )
+
+        except Exception as e:
+            if replica.healthy:
+                logger.warning(
+                    "Replica %s failed health check: %r", replica.name, e
+                )
+
+            replica.healthy = False
+            return
+
+        if replica.lag > self.options.max_lag:
+            if replica.healthy:
+                logger.warning(
+                    "Replica %s lags for %.1f seconds",
+                    replica.name, replica.lag
+                )
+
+            replica.healthy = False
+            return
+
+        if not replica.healthy:
+            logger.info("Replica %s is available", replica.name)
+
+        replica.healthy = True
+
+    async def check_health(self) -> None:
+        """
+        Checks all replicas concurrently.
+
+        :return: nothing.
+        """
+        await asyncio.gather(*map(self.check_replica, self.replicas))
+
+    async def _run_health_checks(self) -> None:
+        while True:
+            await asyncio.sleep(self.options.health_check_interval)
+            await self.check_health()
+
+    async def start(self) -> None:
+        """
+        Checks replicas and starts periodic health checks in background.
+
+        :return: nothing.
+        """
+        if not self.replicas:
+            return
+
+        await self.check_health()
+        self._health_checks = asyncio.create_task(self._run_health_checks())
+
+    async def stop(self) -> None:
+        """
+        Stops health checks and closes replicas connections.
+
+        :return: nothing.
+        """
+        if self._health_checks is not None:
+            self._health_checks.cancel()
+            self._health_checks = None
+
+        for replica in self.replicas:
+            await replica.engine.dispose()
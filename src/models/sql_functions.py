@@ -0,0 +1,84 @@
+import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class hex_color(FunctionElement[str]):
+    """
+    Formats integer color as upper case RRGGBB string in database,
+    so read queries return colors ready for serialization.
+    """
+
+    name = "hex_color"
+    type = String()
+    inherit_cache = True
+
+
+@compiles(hex_color)
+def compile_hex_color(
+    element: hex_color, compiler: SQLCompiler, **kw: Any
+) -> str:
+    return (
+        f"upper(lpad(to_hex({compiler.process(element.clauses, **kw)}), "
+        "6, '0'))"
+    )
+
+
+@compiles(hex_color, "sqlite")
+def compile_hex_color_sqlite(
+    element: hex_color, compiler: SQLCompiler, **kw: Any
+) -> str:
+    return f"printf('%06X', {compiler.process(element.clauses, **kw)})"
+
+
+class next_occurrence_at(FunctionElement[datetime.datetime]):
+    """
+    Computes next trigger time of reminder after its schedule
+    changes, from triggered_at, is_periodic, trigger_period,
+    next_trigger_at and current moment. Reminders that haven't fired
+    yet keep triggered_at, non-periodic ones that have fired won't
+    fire again and periodic ones move to first occurrence after now.
+    """
+
+    name = "next_occurrence_at"
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+
+@compiles(next_occurrence_at)
+def compile_next_occurrence_at(
+    element: next_occurrence_at, compiler: SQLCompiler, **kw: Any
+) -> str:
+    triggered_at, is_periodic, period, next_trigger_at, now = (
+        compiler.process(clause, **kw) for clause in element.clauses
+    )
+    return (
+        f"CASE WHEN {next_trigger_at} = {triggered_at} "
+        f"OR {triggered_at} > {now} THEN {triggered_at} "
+        f"WHEN NOT {is_periodic} OR {period} <= 0 THEN NULL "
+        f"ELSE {triggered_at} + (floor(extract(epoch FROM "
+        f"({now} - {triggered_at})) / ({period} * 86400)) + 1) "
+        f"* {period} * interval '86400 seconds' END"
+    )
+
+
+@compiles(next_occurrence_at, "sqlite")
+def compile_next_occurrence_at_sqlite(
+    element: next_occurrence_at, compiler: SQLCompiler, **kw: Any
+) -> str:
+    triggered_at, is_periodic, period, next_trigger_at, now = (
+        compiler.process(clause, **kw) for clause in element.clauses
+    )
+    # Adds whole days to date and keeps time of day as stored
+    return (
+        f"CASE WHEN {next_trigger_at} = {triggered_at} "
+        f"OR {triggered_at} > {now} THEN {triggered_at} "
+        f"WHEN NOT {is_periodic} OR {period} <= 0 THEN NULL "
+        f"ELSE date({triggered_at}, '+' || ((CAST((julianday({now}) "
+        f"- julianday({triggered_at})) / {period} AS INTEGER) + 1) "
+        f"* {period}) || ' days') || substr({triggered_at}, 11) END"
+    )
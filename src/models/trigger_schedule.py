@@ -0,0 +1,418 @@
+import asyncio
+import datetime
+import logging
+import math
+import time
+from array import array
+from typing import Any, Callable, Iterable, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from .reminder import Reminder
+
+logger = logging.getLogger(__name__)
+
+# Key of session.info with trigger changes applied to schedule on commit
+PENDING_TRIGGERS_KEY: str = "pending_reminder_triggers"
+
+
+class TimerWheel:
+    """
+    Hierarchical timing wheel of reminder ids. Each level has 256 slots,
+    slot of first level spans one tick and slots of every next level span
+    whole previous level. Entries move to lower level when time reaches
+    their slot, so every tick costs constant time besides firing.
+
+    Entries are kept in parallel arrays linked into doubly linked list
+    of their slot, so scheduled reminder takes a few dozen bytes plus
+    entry of id index, and is cancelled in constant time.
+    """
+
+    SLOT_BITS: int = 8
+    SLOTS: int = 1 << SLOT_BITS
+    SLOT_MASK: int = SLOTS - 1
+
+    __slots__ = (
+        "tick", "levels", "origin", "current", "_heads", "_ids",
+        "_deadlines", "_next", "_prev", "_slots", "_positions", "_free"
+    )
+
+    def __init__(
+        self, tick: float, levels: int = 4, origin: float | None = None
+    ):
+        """
+        :param tick: seconds in one tick (precision of firing).
+        :param levels: amount of levels, entries further than
+        256 ** levels ticks are moved closer as time passes.
+        :param origin: moment of tick zero in seconds since epoch
+        (current time if not provided).
+        """
+        self.tick: float = tick
+        self.levels: int = levels
+        self.origin: float = time.time() if origin is None else origin
+        # Last processed tick
+        self.current: int = 0
+        # Index of first entry in each slot of each level (-1 if empty)
+        self._heads: array[int] = array("i", [-1]) * (levels * self.SLOTS)
+        self._ids: array[int] = array("q")
+        self._deadlines: array[int] = array("q")
+        self._next: array[int] = array("i")
+        self._prev: array[int] = array("i")
+        self._slots: array[int] = array("H")
+        # Reminder id -> index of its entry
+        self._positions: dict[int, int] = {}
+        # First unused entry, unused entries are chained by _next
+        self._free: int = -1
+
+    def schedule(self, reminder_id: int, when: float) -> None:
+        """
+        Schedules reminder, replacing its previous trigger time.
+        Reminders scheduled in the past fire on next tick.
+
+        :param reminder_id: id of reminder.
+        :param when: trigger time in seconds since epoch.
+        :return: nothing.
+        """
+        self.cancel(reminder_id)
+        deadline: int = max(
+            math.ceil((when - self.origin) / self.tick), self.current + 1
+        )
+
+        position: int = self._free
+        if position >= 0:
+            self._free = self._next[position]
+            self._ids[position] = reminder_id
+            self._deadlines[position] = deadline
+
+        else:
+            position = len(self._ids)
+            self._ids.append(reminder_id)
+            self._deadlines.append(deadline)
+            self._next.append(-1)
+            self._prev.append(-1)
+            self._slots.append(0)
+
+        self._positions[reminder_id] = position
+        self._link(position)
+
+    def cancel(self, reminder_id: int) -> bool:
+        """
+        Removes reminder from wheel.
+
+        :param reminder_id: id of reminder.
+        :return: True if reminder was scheduled.
+        """
+        position: int | None = self._positions.pop(reminder_id, None)
+        if position is None:
+            return False
+
+        self._unlink(position)
+        self._next[position] = self._free
+        self._free = position
+        return True
+
+    def advance(self, now: float) -> list[int]:
+        """
+        Processes ticks up to specified moment.
+
+        :param now: current time in seconds since epoch.
+        :return: ids of reminders whose trigger time has come.
+        """
+        target: int = math.floor((now - self.origin) / self.tick)
+        fired: list[int] = []
+        while self.current < target:
+            self.current += 1
+            if not self.current & self.SLOT_MASK:
+                self._cascade()
+
+            slot: int = self.current & self.SLOT_MASK
+            position: int = self._heads[slot]
+            self._heads[slot] = -1
+            while position >= 0:
+                next_position: int = self._next[position]
+                reminder_id: int = self._ids[position]
+                del self._positions[reminder_id]
+                fired.append(reminder_id)
+                self._next[position] = self._free
+                self._free = position
+                position = next_position
+
+        return fired
+
+    def _cascade(self) -> None:
+        """
+        Moves entries of higher levels slots, that current tick has
+        reached, to lower levels.
+
+        :return: nothing.
+        """
+        for level in range(1, self.levels):
+            shift: int = self.SLOT_BITS * level
+            slot: int = level * self.SLOTS + (
+                (self.current >> shift) & self.SLOT_MASK
+            )
+            position: int = self._heads[slot]
+            self._heads[slot] = -1
+            while position >= 0:
+                next_position: int = self._next[position]
+                self._link(position)
+                position = next_position
+
+            # Next level is reached only when this one wraps around
+            if (self.current >> shift) & self.SLOT_MASK:
+                break
+
+    def _link(self, position: int) -> None:
+        deadline: int = self._deadlines[position]
+        delta: int = deadline - self.current
+        level: int = 0
+        while (
+            level < self.levels - 1
+            and delta >> (self.SLOT_BITS * (level + 1))
+        ):
+            level += 1
+
+        span_end: int = self.current + (
+            1 << (self.SLOT_BITS * self.levels)
+        ) - 1
+        slot: int = level * self.SLOTS + (
+            (min(deadline, span_end) >> (self.SLOT_BITS * level))
+            & self.SLOT_MASK
+        )
+
+        head: int = self._heads[slot]
+        self._next[position] = head
+        self._prev[position] = -1
+        if head >= 0:
+            self._prev[head] = position
+
+        self._heads[slot] = position
+        self._slots[position] = slot
+
+    def _unlink(self, position: int) -> None:
+        next_position: int = self._next[position]
+        prev_position: int = self._prev[position]
+        if prev_position >= 0:
+            self._next[prev_position] = next_position
+
+        else:
+            self._heads[self._slots[position]] = next_position
+
+        if next_position >= 0:
+            self._prev[next_position] = prev_position
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, reminder_id: int) -> bool:
+        return reminder_id in self._positions
+
+
+def as_timestamp(moment: datetime.datetime) -> float:
+    """
+    Converts trigger time into seconds since epoch.
+
+    :param moment: trigger time, naive values are in UTC.
+    :return: seconds since epoch.
+    """
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=datetime.UTC)
+
+    return moment.timestamp()
+
+
+class TriggerSchedule:
+    """
+    In-process index of reminders that fire within horizon, which wakes
+    callback (dispatcher) when their trigger time comes, so database
+    doesn't have to be polled for due reminders. Controllers report
+    changed trigger times, which are applied once session commits,
+    and reminders further than horizon are loaded as time passes.
+
+    Database stays source of truth: schedule only tells when to look,
+    so its entries don't have to be exact.
+    """
+
+    def __init__(
+        self, enabled: bool = False, horizon: float = 86400.0,
+        tick: float = 0.1
+    ):
+        """
+        :param enabled: keep schedule of upcoming triggers.
+        :param horizon: seconds ahead reminders are loaded for.
+        :param tick: seconds between checks for due reminders.
+        """
+        self.enabled: bool = enabled
+        self.horizon: float = horizon
+        self.tick: float = tick
+        self.wheel: TimerWheel = TimerWheel(tick)
+        # Reminders triggering later than that are not in wheel
+        self.loaded_until: float = 0.0
+        # Trigger times committed while load is running (None if it isn't),
+        # they are newer than rows read by load
+        self._updated_during_load: dict[int, float | None] | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    def configure(self, enabled: bool, horizon: float, tick: float) -> None:
+        """
+        Changes schedule settings, takes effect on next start.
+
+        :param enabled: keep schedule of upcoming triggers.
+        :param horizon: seconds ahead reminders are loaded for.
+        :param tick: seconds between checks for due reminders.
+        :return: nothing.
+        """
+        self.enabled = enabled
+        self.horizon = horizon
+        self.tick = tick
+
+    def update(self, reminder_id: int, when: float | None) -> None:
+        """
+        Changes trigger time of reminder.
+
+        :param reminder_id: id of reminder.
+        :param when: next trigger time in seconds since epoch
+        (None if reminder won't fire).
+        :return: nothing.
+        """
+        if self._updated_during_load is not None:
+            self._updated_during_load[reminder_id] = when
+
+        if when is not None and when <= self.loaded_until:
+            self.wheel.schedule(reminder_id, when)
+
+        else:
+            self.wheel.cancel(reminder_id)
+
+    def update_on_commit(
+        self, session: AsyncSession,
+        triggers: Iterable[tuple[int, datetime.datetime | None]]
+    ) -> None:
+        """
+        Schedules trigger times changes for the moment session commits.
+
+        :param session: SQLAlchemy session that changes reminders.
+        :param triggers: pairs of reminder id and its next trigger time
+        (None if reminder won't fire).
+        :return: nothing.
+        """
+        if not self.enabled:
+            return
+
+        session.info.setdefault(PENDING_TRIGGERS_KEY, []).extend(
+            (reminder_id, None if when is None else as_timestamp(when))
+            for reminder_id, when in triggers
+        )
+
+    async def load(
+        self, session_maker: async_sessionmaker[AsyncSession], until: float
+    ) -> None:
+        """
+        Adds reminders triggering before specified moment to wheel.
+        Trigger times updated while rows are read replace loaded ones.
+
+        :param session_maker: session factory of primary database.
+        :param until: end of loaded period in seconds since epoch.
+        :return: nothing.
+        """
+        updated: dict[int, float | None] = {}
+        self._updated_during_load = updated
+        try:
+            async with session_maker() as session:
+                rows: Sequence[Row[Any]] = (
+                    await Reminder.get_triggers_between(
+                        datetime.datetime.fromtimestamp(
+                            self.loaded_until, datetime.UTC
+                        ),
+                        datetime.datetime.fromtimestamp(until, datetime.UTC),
+                        session
+                    )
+                )
+
+        finally:
+            self._updated_during_load = None
+
+        self.loaded_until = until
+        for reminder_id, next_trigger_at in rows:
+            if reminder_id not in updated:
+                self.wheel.schedule(
+                    reminder_id, as_timestamp(next_trigger_at)
+                )
+
+        # Updates that were beyond previous loaded_until were cancelled
+        for reminder_id, when in updated.items():
+            self.update(reminder_id, when)
+
+    async def _run(
+        self, session_maker: async_sessionmaker[AsyncSession],
+        callback: Callable[[list[int]], None]
+    ) -> None:
+        while True:
+            await asyncio.sleep(self.tick)
+            now: float = time.time()
+            fired: list[int] = self.wheel.advance(now)
+            if fired:
+                callback(fired)
+
+            if self.loaded_until - now < self.horizon / 2:
+                try:
+                    await self.load(session_maker, now + self.horizon)
+
+                except Exception:
+                    logger.exception("Failed to load upcoming reminders")
+
+    async def start(
+        self, session_maker: async_sessionmaker[AsyncSession],
+        callback: Callable[[list[int]], None]
+    ) -> None:
+        """
+        Loads reminders triggering within horizon and starts firing
+        callback in background if schedule is enabled.
+
+        :param session_maker: session factory of primary database.
+        :param callback: called with ids of reminders that are due.
+        :return: nothing.
+        """
+        if not self.enabled:
+            return
+
+        now: float = time.time()
+        self.wheel = TimerWheel(self.tick, origin=now)
+        self.loaded_until = 0.0
+        await self.load(session_maker, now + self.horizon)
+        logger.info("Scheduled %s upcoming reminders", len(self.wheel))
+        self._task = asyncio.create_task(self._run(session_maker, callback))
+
+    async def stop(self) -> None:
+        """
+        Stops firing callback.
+
+        :return: nothing.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+
+            except asyncio.CancelledError:
+                pass
+
+            self._task = None
+
+
+# Shared by whole process, configured on application startup
+trigger_schedule: TriggerSchedule = TriggerSchedule()
+
+
+@event.listens_for(Session, "after_commit")
+def apply_committed_triggers(session: Session) -> None:
+    for reminder_id, when in session.info.pop(PENDING_TRIGGERS_KEY, ()):
+        trigger_schedule.update(reminder_id, when)
+
+
+@event.listens_for(Session, "after_rollback")
+def forget_rolled_back_triggers(session: Session) -> None:
+    session.info.pop(PENDING_TRIGGERS_KEY, None)
@@ -1,16 +1,45 @@
 from __future__ import annotations
 
 import datetime
+import hashlib
 import secrets
-from hashlib import pbkdf2_hmac
+from typing import Any, Sequence, cast
 
-from sqlalchemy import func, select, DateTime
+from sqlalchemy import (
+    and_, bindparam, delete, func, insert, select, DateTime
+)
+from sqlalchemy.engine import CursorResult
 from sqlalchemy.exc import IntegrityError, NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column
 
+from .access_token import AccessToken
+from .access_token_cache import access_token_cache
 from .exceptions import InvalidCredentials
 from .initialize_connector import OrmBase
+from .password_hasher import password_hasher
+
+# Key of session.info with ids of users whose tokens session already checked
+SESSION_USER_IDS_KEY: str = "user_ids_by_access_token"
+# Bytes of randomness in access token
+ACCESS_TOKEN_BYTES: int = 32
+# Tokens of user issued before that many newer ones stop working
+MAX_ACCESS_TOKENS_PER_USER: int = 20
+
+
+def hash_access_token(access_token: str) -> bytes:
+    """
+    Computes digest of access token, which is stored in database
+    instead of token itself. Tokens are random, so plain SHA-256
+    is enough and no salt is needed.
+
+    :param access_token: users access token.
+    :return: 32 bytes of SHA-256 digest.
+    """
+    # Cookies with undecodable bytes are kept as surrogates by aiohttp
+    return hashlib.sha256(
+        access_token.encode("utf-8", "surrogateescape")
+    ).digest()
 
 
 class User(OrmBase):
@@ -28,7 +57,6 @@ class User(OrmBase):
     username: Mapped[str] = mapped_column(unique=True, index=True)
     salt: Mapped[str]
     password: Mapped[str]
-    access_token: Mapped[str] = mapped_column(unique=True, index=True)
 
     @classmethod
     async def register_user(
@@ -41,20 +69,18 @@ class User(OrmBase):
         :param password: users password.
         :param session: SQLAlchemy session.
         :return: boolean value representing if use has been saved to database
+        :raise HashingQueueFull: if password hashing executor is saturated.
         """
         salt = secrets.token_urlsafe(64)
-        password_hash: str = pbkdf2_hmac(
-            'sha256', password.encode('utf-8'),
-            salt=salt.encode('utf-8'), iterations=10000
-        ).hex()
-        access_token: str = await cls.get_unique_access_token(session)
-
+        password_hash: str = await password_hasher.hash_password(
+            password, salt
+        )
+        # Tokens are issued on login
         session.add(
             cls(
                 username=username,
                 password=password_hash,
-                salt=salt,
-                access_token=access_token
+                salt=salt
             )
         )
         try:
@@ -80,15 +106,20 @@ class User(OrmBase):
         :raise InvalidCredentials: when password in db
         and provided by user are mismatching.
         :raise ValueError: if user is not registered.
+        :raise HashingQueueFull: if password hashing executor is saturated.
         """
         query = select(cls).where(User.username == username)
         try:
             result: User = (await session.execute(query)).scalars().one()
 
-            password_hash: str = pbkdf2_hmac(
-                'sha256', password.encode('utf-8'),
-                salt=result.salt.encode('utf-8'), iterations=10000
-            ).hex()
+            # Connection isn't needed while password is hashed, so it's
+            # returned to pool (detached user keeps its loaded attributes)
+            session.expunge(result)
+            await session.commit()
+
+            password_hash: str = await password_hasher.hash_password(
+                password, result.salt
+            )
 
             if result.password == password_hash:
                 return result
@@ -99,6 +130,76 @@ class User(OrmBase):
         except NoResultFound:
             raise ValueError("No such user registered")
 
+    @classmethod
+    async def issue_access_token(
+        cls, user: User, session: AsyncSession
+    ) -> str:
+        """
+        Issues new access token to user, tokens issued earlier keep
+        working until user gets MAX_ACCESS_TOKENS_PER_USER newer ones.
+
+        :param user: user who receives token.
+        :param session: SQLAlchemy session.
+        :return: new access token.
+        """
+        access_token: str = cls.generate_access_token()
+        # Unique constraint rejects digest collision, which is
+        # as likely as guessing token
+        await session.execute(
+            INSERT_ACCESS_TOKEN_QUERY,
+            {
+                "user_id": user.id,
+                "access_token_digest": hash_access_token(access_token)
+            }
+        )
+        parameters: dict[str, int] = {
+            "user_id": user.id, "limit": MAX_ACCESS_TOKENS_PER_USER
+        }
+        if session.get_bind().dialect.delete_returning:
+            dropped_digests: Sequence[bytes] = (
+                await session.scalars(
+                    DELETE_OLD_ACCESS_TOKENS_QUERY.returning(
+                        AccessToken.digest
+                    ),
+                    parameters
+                )
+            ).all()
+
+        else:
+            dropped_digests = (
+                await session.scalars(OLD_ACCESS_TOKENS_QUERY, parameters)
+            ).all()
+            await session.execute(DELETE_OLD_ACCESS_TOKENS_QUERY, parameters)
+
+        # Tokens of other workers caches stay there until their ttl passes
+        access_token_cache.invalidate_on_commit(dropped_digests, session)
+        return access_token
+
+    @classmethod
+    async def revoke_access_token(
+        cls, access_token: str, session: AsyncSession
+    ) -> bool:
+        """
+        Deletes access token, so it can't be used anymore.
+
+        :param access_token: users access token.
+        :param session: SQLAlchemy session.
+        :return: True if token existed.
+        """
+        access_token_digest: bytes = hash_access_token(access_token)
+        result = cast(
+            CursorResult[Any],
+            await session.execute(
+                DELETE_ACCESS_TOKEN_QUERY,
+                {"access_token_digest": access_token_digest}
+            )
+        )
+        access_token_cache.invalidate_on_commit(
+            [access_token_digest], session
+        )
+        session.info.get(SESSION_USER_IDS_KEY, {}).pop(access_token, None)
+        return result.rowcount > 0
+
     @classmethod
     async def get_user_by_access_token(
         cls, access_token: str, session: AsyncSession
@@ -112,30 +213,95 @@ class User(OrmBase):
         :raise InvalidCredentials: if there is no such access token in db.
         """
         try:
-            query = select(cls).where(cls.access_token == access_token)
-            result: User = (await session.execute(query)).scalars().one()
+            result: User = (
+                await session.execute(
+                    USER_BY_ACCESS_TOKEN_QUERY,
+                    {"access_token_digest": hash_access_token(access_token)}
+                )
+            ).scalars().one()
 
             return result
 
         except NoResultFound:
             raise InvalidCredentials()
 
+    @classmethod
+    async def get_user_id_by_access_token(
+        cls, access_token: str, session: AsyncSession
+    ) -> int:
+        """
+        Gets id of user by access token, using tokens already checked by
+        session and in-process cache before querying db.
+
+        :param access_token: users access token.
+        :param session: SQlAlchemy session.
+        :return: id of user who owns access_token.
+        :raise InvalidCredentials: if there is no such access token in db.
+        """
+        checked_tokens: dict[str, int] = session.info.setdefault(
+            SESSION_USER_IDS_KEY, {}
+        )
+        user_id: int | None = checked_tokens.get(access_token)
+        if user_id is not None:
+            return user_id
+
+        access_token_digest: bytes = hash_access_token(access_token)
+        user_id = access_token_cache.get(access_token_digest)
+        if user_id is not None:
+            checked_tokens[access_token] = user_id
+            return user_id
+
+        try:
+            user_id = (
+                await session.execute(
+                    USER_ID_BY_ACCESS_TOKEN_QUERY,
+                    {"access_token_digest": access_token_digest}
+                )
+            ).scalars().one()
+
+        except NoResultFound:
+            raise InvalidCredentials()
+
+        access_token_cache.put(access_token_digest, user_id)
+        checked_tokens[access_token] = user_id
+        return user_id
+
     @staticmethod
-    async def get_unique_access_token(session: AsyncSession) -> str:
+    def generate_access_token() -> str:
         """
-        Generates unique access token for usage later.
+        Generates random access token.
 
-        :param session: SQLAlchemy session.
-        :return: not registered token.
+        :return: URL-safe token.
         """
-        access_token: str = secrets.token_urlsafe(128)
+        return secrets.token_urlsafe(ACCESS_TOKEN_BYTES)
 
-        token_exists_check = select(
-            func.count(User.id)
-        ).where(
-            User.access_token == access_token
-        )
-        while await session.scalar(token_exists_check):
-            access_token = secrets.token_urlsafe(128)
 
-        return access_token
+# Statements are built once and executed with bound parameters, so calls
+# don't pay for constructing them and computing their cache keys
+USER_BY_ACCESS_TOKEN_QUERY = select(User).join(
+    AccessToken, AccessToken.user_id == User.id
+).where(AccessToken.digest == bindparam("access_token_digest"))
+USER_ID_BY_ACCESS_TOKEN_QUERY = select(AccessToken.user_id).where(
+    AccessToken.digest == bindparam("access_token_digest")
+)
+INSERT_ACCESS_TOKEN_QUERY = insert(AccessToken).values(
+    user_id=bindparam("user_id"),
+    digest=bindparam("access_token_digest")
+)
+DELETE_ACCESS_TOKEN_QUERY = delete(AccessToken).where(
+    AccessToken.digest == bindparam("access_token_digest")
+).execution_options(synchronize_session=False)
+_older_than_newest_tokens = and_(
+    AccessToken.user_id == bindparam("user_id"),
+    AccessToken.id.not_in(
+        select(AccessToken.id).where(
+            AccessToken.user_id == bindparam("user_id")
+        ).order_by(AccessToken.id.desc()).limit(bindparam("limit"))
+    )
+)
+OLD_ACCESS_TOKENS_QUERY = select(AccessToken.digest).where(
+    _older_than_newest_tokens
+)
+DELETE_OLD_ACCESS_TOKENS_QUERY = delete(AccessToken).where(
+    _older_than_newest_tokens
+).execution_options(synchronize_session=False)
@@ -0,0 +1,245 @@
+import logging
+import signal
+import socket
+import time
+from dataclasses import replace
+from multiprocessing import get_context
+from multiprocessing.connection import wait
+from multiprocessing.process import BaseProcess
+from types import FrameType
+
+from src.metrics import MetricsOptions
+from src.models.initialize_connector import DatabaseOptions
+from src.models.reminder_dispatcher import DispatcherOptions
+from src.models.replicas import ReplicaOptions
+
+logger = logging.getLogger(__name__)
+
+# Seconds given to worker to finish in-flight requests before it's killed
+SHUTDOWN_TIMEOUT: float = 30.0
+# Minimal delay before restarting crashed worker, so we don't spin
+RESTART_DELAY: float = 1.0
+
+
+def supports_reuse_port() -> bool:
+    """
+    Checks if current platform can share listening port between processes.
+
+    :return: True if SO_REUSEPORT is available.
+    """
+    return hasattr(socket, "SO_REUSEPORT")
+
+
+def run_worker(
+    host: str, port: int,
+    connection_url: str, database_options: DatabaseOptions,
+    replica_options: ReplicaOptions,
+    metrics_options: MetricsOptions,
+    dispatcher_options: DispatcherOptions,
+    index: int
+) -> None:
+    """
+    Entrypoint of worker process, that creates its own engine
+    and serves application on shared port.
+
+    :param host: address to listen on.
+    :param port: port to listen on.
+    :param connection_url: string with initialization parameters for engine.
+    :param database_options: pool and driver settings.
+    :param replica_options: read replicas settings.
+    :param metrics_options: metrics endpoint settings of this worker.
+    :param dispatcher_options: reminder dispatcher settings.
+    :param index: number of worker.
+    :return: nothing.
+    """
+    from src import main
+    from src.models.initialize_connector import initialize_session_maker
+    from src.models.reminder_dispatcher import (
+        ReminderDispatcher, supports_skip_locked
+    )
+    from src.models.replicas import ReplicaSet
+
+    # Parent handles restart requests, workers must ignore them
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    session_factory = initialize_session_maker(
+        connection_url, database_options
+    )
+    # Without SKIP LOCKED workers would fire same reminders
+    if index > 0 and not supports_skip_locked(session_factory.kw["bind"]):
+        dispatcher_options = replace(dispatcher_options, enabled=False)
+
+    main(
+        host, port, session_factory,
+        reuse_port=True,
+        preconnect=database_options.preconnect,
+        replicas=ReplicaSet(
+            session_factory, replica_options, database_options
+        ),
+        metrics=metrics_options,
+        dispatcher=ReminderDispatcher(session_factory, dispatcher_options)
+    )
+
+
+class WorkerSupervisor:
+    """
+    Starts several worker processes that share one port through SO_REUSEPORT,
+    restarts crashed ones and handles graceful restart and shutdown.
+
+    SIGHUP restarts workers one by one, SIGTERM and SIGINT stop all of them.
+    """
+
+    def __init__(
+        self, host: str, port: int, connection_url: str,
+        database_options: DatabaseOptions, workers: int,
+        replica_options: ReplicaOptions | None = None,
+        metrics_options: MetricsOptions | None = None,
+        dispatcher_options: DispatcherOptions | None = None
+    ):
+        """
+        :param host: address to listen on.
+        :param port: port to listen on.
+        :param connection_url: string with initialization
+        parameters for engine.
+        :param database_options: pool and driver settings for each worker.
+        :param workers: amount of worker processes.
+        :param replica_options: read replicas settings for each worker.
+        :param metrics_options: metrics endpoint settings, each worker
+        listens on next port after metrics port.
+        :param dispatcher_options: reminder dispatcher settings
+        for each worker.
+        """
+        self.host: str = host
+        self.port: int = port
+        self.connection_url: str = connection_url
+        self.database_options: DatabaseOptions = database_options
+        self.workers_count: int = workers
+        self.replica_options: ReplicaOptions = (
+            replica_options or ReplicaOptions()
+        )
+        self.metrics_options: MetricsOptions = (
+            metrics_options or MetricsOptions()
+        )
+        self.dispatcher_options: DispatcherOptions = (
+            dispatcher_options or DispatcherOptions()
+        )
+        self.workers: list[BaseProcess] = []
+        self._context = get_context("fork")
+        self._stopping: bool = False
+        self._restart_requested: bool = False
+
+    def start_worker(self, index: int) -> BaseProcess:
+        """
+        Starts single worker process.
+
+        :param index: number of worker.
+        :return: started process.
+        """
+        # Workers share application port, so each one needs own port
+        # for metrics to be scraped from every process
+        metrics_options: MetricsOptions = replace(
+            self.metrics_options,
+            port=self.metrics_options.port + index,
+            on_application_port=False
+        )
+
+        worker: BaseProcess = self._context.Process(
+            target=run_worker,
+            args=(
+                self.host, self.port,
+                self.connection_url, self.database_options,
+                self.replica_options, metrics_options,
+                self.dispatcher_options, index
+            ),
+            daemon=False
+        )
+        worker.start()
+        logger.info("Started worker with pid %s", worker.pid)
+        return worker
+
+    @staticmethod
+    def stop_worker(worker: BaseProcess) -> None:
+        """
+        Asks worker to finish gracefully and kills it on timeout.
+
+        :param worker: worker process.
+        :return: nothing.
+        """
+        if worker.is_alive():
+            worker.terminate()
+
+        worker.join(SHUTDOWN_TIMEOUT)
+        if worker.is_alive():
+            logger.warning("Worker %s did not stop in time", worker.pid)
+            worker.kill()
+            worker.join()
+
+    def restart_workers(self) -> None:
+        """
+        Replaces workers one at a time, so port is always served.
+
+        :return: nothing.
+        """
+        logger.info("Restarting workers")
+        for index, old_worker in enumerate(list(self.workers)):
+            self.workers[index] = self.start_worker(index)
+            self.stop_worker(old_worker)
+
+    def shutdown(self) -> None:
+        """
+        Stops all workers.
+
+        :return: nothing.
+        """
+        logger.info("Shutting down workers")
+        for worker in self.workers:
+            if worker.is_alive():
+                worker.terminate()
+
+        for worker in self.workers:
+            self.stop_worker(worker)
+
+        self.workers.clear()
+
+    def _handle_stop(self, signum: int, frame: FrameType | None) -> None:
+        self._stopping = True
+
+    def _handle_restart(self, signum: int, frame: FrameType | None) -> None:
+        self._restart_requested = True
+
+    def run(self) -> None:
+        """
+        Starts workers and supervises them until stop signal is received.
+
+        :return: nothing.
+        """
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_restart)
+
+        self.workers = [
+            self.start_worker(index) for index in range(self.workers_count)
+        ]
+
+        try:
+            while not self._stopping:
+                wait([worker.sentinel for worker in self.workers], 1.0)
+
+                if self._stopping:
+                    break
+
+                if self._restart_requested:
+                    self._restart_requested = False
+                    self.restart_workers()
+                    continue
+
+                for index, worker in enumerate(self.workers):
+                    if not worker.is_alive():
+                        logger.warning(
+                            "Worker %s exited with code %s, restarting",
+                            worker.pid, worker.exitcode
+                        )
+                        time.sleep(RESTART_DELAY)
+                        self.workers[index] = self.start_worker(index)
+
+        finally:
+            self.shutdown()
@@ -3,8 +3,13 @@ from aiohttp import web
 from .active_reminders import handle_fetching_active_reminders
 from .authenticate_user import handle_authentication
 from .create_new_reminder import handle_creating_reminder
+from .create_reminders_batch import handle_creating_reminders_batch
 from .logout_from_account import handle_logout
 from .register_user import handle_registration
+from .reminders_batch_actions import (
+    handle_deactivating_reminders_batch,
+    handle_updating_reminders_batch
+)
 from .reminder_specific_actions import (
     handle_fetching_specific_reminder,
     handle_deactivating_specific_reminder,
@@ -40,6 +45,21 @@ def init_application_routes(app: web.Application) -> None:
                 "/reminders/",
                 handle_creating_reminder
             ),
+            web.route(
+                "post",
+                "/reminders/batch",
+                handle_creating_reminders_batch
+            ),
+            web.route(
+                "patch",
+                "/reminders/batch",
+                handle_updating_reminders_batch
+            ),
+            web.route(
+                "delete",
+                "/reminders/batch",
+                handle_deactivating_reminders_batch
+            ),
             web.route(
                 "get",
                 r"/reminders/{reminderId:\d+}",
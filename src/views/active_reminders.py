@@ -1,20 +1,148 @@
+from datetime import datetime, UTC
+
 import orjson
-from aiohttp import web
+from aiohttp import hdrs, web
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.DTO.reminder_DTO import ReminderDTO
-from src.controllers.fetch_all_reminders import fetch_all_reminders
+from src.DTO.codecs import (
+    Codec, JSON_CODEC, MSGPACK_CODEC,
+    encode_msgpack_array_header, encode_msgpack_items
+)
+from src.DTO.reminder_page_DTO import ReminderPageDTO
+from src.DTO.reminder_sync_DTO import ReminderSyncDTO
+from src.controllers.fetch_all_reminders import (
+    fetch_active_reminders_state, fetch_cached_reminders,
+    fetch_encoded_reminders, fetch_reminders_page, stream_all_reminders,
+    stream_counted_reminders
+)
+from src.controllers.fetch_changed_reminders import fetch_changed_reminders
 from src.models.exceptions import InvalidCredentials
-from .inject_session import inject_session
+from src.models.reminders_list_cache import CachedList
+from .compression import compressed_response
+from .content_negotiation import response_codec
+from .conditional_requests import (
+    NEGOTIATED_HEADERS, is_not_modified, not_modified_response, with_etag
+)
+from .inject_session import inject_read_session, release_connection
+from .query_budget import query_budget
+
+# Lists with more reminders are streamed in chunks instead of single body
+STREAM_THRESHOLD: int = 500
+STREAM_CHUNK_SIZE: int = 200
+MAX_PAGE_LIMIT: int = 1000
+
+
+async def prepare_stream(
+    request: web.Request, version: str, content_type: str
+) -> web.StreamResponse:
+    """
+    Starts streamed response with list of reminders.
+
+    :param request: http request.
+    :param version: version of reminders list.
+    :param content_type: media type of list.
+    :return: prepared stream response.
+    """
+    response = with_etag(web.StreamResponse(), version, content_type)
+    response.content_type = content_type
+    response.headers[hdrs.VARY] = NEGOTIATED_HEADERS
+    # Chunks are compressed by aiohttp with gzip or deflate if client
+    # accepts them
+    response.enable_compression()
+    await response.prepare(request)
+    return response
+
+
+async def stream_reminders(
+    request: web.Request, user_token: str,
+    version: str, session: AsyncSession
+) -> web.StreamResponse:
+    """
+    Writes JSON array of all users active reminders chunk by chunk.
+
+    :param request: http request.
+    :param user_token: users token.
+    :param version: version of reminders list.
+    :param session: SQLAlchemy session.
+    :return: finished stream response.
+    """
+    response = await prepare_stream(
+        request, version, JSON_CODEC.content_type
+    )
+    await response.write(b"[")
+
+    is_first_chunk: bool = True
+    async for chunk in stream_all_reminders(
+        user_token, STREAM_CHUNK_SIZE, session
+    ):
+        if not chunk:
+            continue
+
+        # Array brackets are stripped to join chunks into one array
+        body: bytes = orjson.dumps(chunk)[1:-1]
+        if not is_first_chunk:
+            body = b"," + body
+
+        is_first_chunk = False
+        await response.write(body)
+
+    await response.write_eof(b"]")
+    return response
+
+
+async def stream_msgpack_reminders(
+    request: web.Request, user_token: str,
+    version: str, session: AsyncSession
+) -> web.StreamResponse:
+    """
+    Writes msgpack array of all users active reminders chunk by chunk.
+    Array header needs amount of items, which comes with first chunk,
+    so response starts once it's read.
+
+    :param request: http request.
+    :param user_token: users token.
+    :param version: version of reminders list.
+    :param session: SQLAlchemy session.
+    :return: finished stream response.
+    """
+    response: web.StreamResponse | None = None
+    async for total, chunk in stream_counted_reminders(
+        user_token, STREAM_CHUNK_SIZE, session
+    ):
+        if response is None:
+            response = await prepare_stream(
+                request, version, MSGPACK_CODEC.content_type
+            )
+            await response.write(encode_msgpack_array_header(total))
+
+        await response.write(encode_msgpack_items(chunk))
+
+    if response is None:
+        # All reminders were deactivated after their amount was read
+        response = await prepare_stream(
+            request, version, MSGPACK_CODEC.content_type
+        )
+        await response.write(encode_msgpack_array_header(0))
+
+    await response.write_eof()
+    return response
 
 
 # get /reminders/
-@inject_session
+@query_budget(3)
+@inject_read_session
 async def handle_fetching_active_reminders(
     request: web.Request, session: AsyncSession
-) -> web.Response:
+) -> web.StreamResponse:
     """
-    Fetches all users active reminders.
+    Fetches all users active reminders, or only reminders changed since
+    provided moment if "since" query parameter is present, or single page
+    of reminders if "limit" (and optional "cursor") parameter is present.
+    Full list is sent with ETag, and If-None-Match matching it
+    gets 304 response without loading reminders. Encoded list is cached
+    per user and served while its version matches database. Large bodies
+    are compressed with encoding accepted by client. Body is encoded
+    as JSON or msgpack according to Accept header.
 
     :param request: http request.
     :param session: SQLAlchemy session.
@@ -22,14 +150,85 @@ async def handle_fetching_active_reminders(
     """
 
     try:
-        reminders: list[ReminderDTO] = await fetch_all_reminders(
-            request.cookies["UserToken"],
-            session
+        user_token: str = request.cookies["UserToken"]
+
+    except KeyError:
+        return web.Response(
+            status=401,
+            reason="Client is not authorized"
         )
 
-        return web.Response(body=orjson.dumps(reminders))
+    codec: Codec = response_codec(request)
+    try:
+        if "since" in request.query:
+            since: datetime = datetime.fromisoformat(request.query["since"])
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=UTC)
+
+            changes: ReminderSyncDTO = await fetch_changed_reminders(
+                user_token, since.astimezone(UTC), session
+            )
+            await release_connection(session)
+            return await compressed_response(
+                request, codec.encode(changes), codec.content_type
+            )
+
+        if "limit" in request.query:
+            limit: int = int(request.query["limit"])
+            if limit not in range(1, MAX_PAGE_LIMIT + 1):
+                raise ValueError("Page limit is out of range")
+
+            page: ReminderPageDTO = await fetch_reminders_page(
+                user_token, limit, request.query.get("cursor"), session
+            )
+            await release_connection(session)
+            return await compressed_response(
+                request, codec.encode(page), codec.content_type
+            )
+
+        count, version = await fetch_active_reminders_state(
+            user_token, session
+        )
+        if is_not_modified(request, version, codec.content_type):
+            return not_modified_response(version, codec.content_type)
+
+        cached: CachedList | None = await fetch_cached_reminders(
+            user_token, codec.content_type, version, session
+        )
+        if cached is not None:
+            await release_connection(session)
+            return with_etag(
+                await compressed_response(
+                    request, cached.body, cached.content_type, cached
+                ),
+                cached.version, cached.content_type
+            )
+
+        if count > STREAM_THRESHOLD:
+            return await (
+                stream_msgpack_reminders if codec is MSGPACK_CODEC
+                else stream_reminders
+            )(request, user_token, version, session)
+
+        encoded: CachedList = await fetch_encoded_reminders(
+            user_token, codec, session
+        )
+        await release_connection(session)
+
+        return with_etag(
+            await compressed_response(
+                request, encoded.body, encoded.content_type, encoded
+            ),
+            encoded.version, encoded.content_type
+        )
+
+    except ValueError:
+        return web.Response(
+            status=400,
+            reason="Invalid query parameters"
+        )
 
-    except (InvalidCredentials, KeyError):
+    except InvalidCredentials:
         return web.Response(
             status=401,
             reason="Client is not authorized"
@@ -1,13 +1,16 @@
-import orjson
 from aiohttp import web
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.controllers.user_authentication import authenticate_user
+from src.DTO.codecs import MalformedBody
+from .content_negotiation import encoded_response, read_body
 from .inject_session import inject_session
-from src.models.exceptions import InvalidCredentials
+from .query_budget import query_budget
+from src.models.exceptions import HashingQueueFull, InvalidCredentials
 
 
 # post /users/login
+@query_budget(3)
 @inject_session
 async def handle_authentication(
     request: web.Request, session: AsyncSession
@@ -21,27 +24,40 @@ async def handle_authentication(
     :return: web response with set-cookie header or error message.
     """
     try:
-        request_body: dict = await request.json(loads=orjson.loads)
+        request_body: dict = await read_body(request)
         username: str = str(request_body["username"]).strip()
         password: str = str(request_body["password"]).strip()
 
-    except (orjson.JSONDecodeError, KeyError, AttributeError):
-        return web.Response(status=400, body=orjson.dumps(
-            {"reason": "Invalid body format or missing fields from json"}
-        ))
+    except (MalformedBody, KeyError, AttributeError, TypeError):
+        return encoded_response(
+            request,
+            {"reason": "Invalid body format or missing fields from body"},
+            status=400
+        )
 
     try:
         access_token = await authenticate_user(username, password, session)
 
     except ValueError:
-        return web.Response(status=404, body=orjson.dumps(
-            {"reason": "User with provided login does not exists"}
-        ))
+        return encoded_response(
+            request,
+            {"reason": "User with provided login does not exists"},
+            status=404
+        )
 
     except InvalidCredentials:
-        return web.Response(status=401, body=orjson.dumps(
-            {"reason": "Invalid password provided"}
-        ))
+        return encoded_response(
+            request,
+            {"reason": "Invalid password provided"},
+            status=401
+        )
+
+    except HashingQueueFull:
+        return encoded_response(
+            request,
+            {"reason": "Server is busy, try again later"},
+            status=503
+        )
 
     response = web.Response()
     response.set_cookie("UserToken", access_token, httponly=True)
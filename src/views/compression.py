@@ -0,0 +1,196 @@
+import asyncio
+import importlib
+import zlib
+from functools import partial
+from types import ModuleType
+from typing import Callable, Protocol
+
+from aiohttp import hdrs, web
+
+
+def import_optional(name: str) -> ModuleType | None:
+    """
+    Imports optional dependency.
+
+    :param name: name of module.
+    :return: module or None if it's not installed.
+    """
+    try:
+        return importlib.import_module(name)
+
+    except ImportError:
+        return None
+
+
+brotli: ModuleType | None = import_optional("brotli")
+zstandard: ModuleType | None = import_optional("zstandard")
+
+
+class CompressedBodies(Protocol):
+    """
+    Storage of already compressed variants of one response body,
+    that lets response caches skip repeated compression.
+    """
+
+    def get_compressed(self, encoding: str) -> bytes | None:
+        ...
+
+    def put_compressed(self, encoding: str, data: bytes) -> None:
+        ...
+
+
+class ResponseCompressor:
+    """
+    Compresses response bodies with best encoding accepted by client.
+    Supports gzip, and also zstd and br if zstandard or brotli
+    packages are installed.
+    """
+
+    def __init__(
+        self, min_size: int = 1024, offload_size: int = 64 * 1024,
+        level: int = 6
+    ):
+        """
+        :param min_size: bodies smaller than that amount of bytes
+        are sent uncompressed (0 compresses everything).
+        :param offload_size: bodies of that amount of bytes and larger are
+        compressed in thread pool, so event loop isn't blocked.
+        :param level: compression level for gzip and zstd
+        (brotli quality is one lower and capped at 5 for similar speed).
+        """
+        self.min_size: int = min_size
+        self.offload_size: int = offload_size
+        self.level: int = level
+        # Encodings in order of preference when client accepts several
+        self.compressors: dict[str, Callable[[bytes], bytes]] = {}
+        self.configure(min_size, offload_size, level)
+
+    def configure(self, min_size: int, offload_size: int, level: int) -> None:
+        """
+        Changes compression settings.
+
+        :param min_size: minimal size of body to compress in bytes.
+        :param offload_size: minimal size of body in bytes to be compressed
+        outside of event loop.
+        :param level: compression level from 1 to 9.
+        :return: nothing.
+        """
+        self.min_size = min_size
+        self.offload_size = offload_size
+        self.level = level
+        self.compressors = {}
+
+        if zstandard is not None:
+            self.compressors["zstd"] = self._compress_zstd
+
+        if brotli is not None:
+            self.compressors["br"] = partial(
+                brotli.compress, quality=min(level - 1, 5)
+            )
+
+        self.compressors["gzip"] = self._compress_gzip
+
+    def _compress_zstd(self, body: bytes) -> bytes:
+        # Compressor objects can't be shared between threads
+        assert zstandard is not None
+        data: bytes = zstandard.ZstdCompressor(level=self.level).compress(
+            body
+        )
+        return data
+
+    def _compress_gzip(self, body: bytes) -> bytes:
+        compressor = zlib.compressobj(self.level, wbits=16 + zlib.MAX_WBITS)
+        return compressor.compress(body) + compressor.flush()
+
+    def negotiate(self, accept_encoding: str) -> str | None:
+        """
+        Picks encoding from Accept-Encoding header value.
+
+        :param accept_encoding: value of Accept-Encoding header.
+        :return: name of encoding or None if client accepts
+        none of supported ones.
+        """
+        weights: dict[str, float] = {}
+        for item in accept_encoding.lower().split(","):
+            name, _, params = item.partition(";")
+            weight: float = 1.0
+            params = params.strip()
+            if params.startswith("q="):
+                try:
+                    weight = float(params[2:])
+
+                except ValueError:
+                    weight = 0.0
+
+            weights[name.strip()] = weight
+
+        best: str | None = None
+        best_weight: float = 0.0
+        for encoding in self.compressors:
+            weight = weights.get(encoding, weights.get("*", 0.0))
+            if weight > best_weight:
+                best, best_weight = encoding, weight
+
+        return best
+
+    async def compress(self, body: bytes, encoding: str) -> bytes:
+        """
+        Compresses body, in thread pool if it's large.
+
+        :param body: body of response.
+        :param encoding: name of negotiated encoding.
+        :return: compressed body.
+        """
+        compress: Callable[[bytes], bytes] = self.compressors[encoding]
+        if len(body) < self.offload_size:
+            return compress(body)
+
+        # zlib, brotli and zstandard release GIL while compressing
+        return await asyncio.get_running_loop().run_in_executor(
+            None, compress, body
+        )
+
+
+async def compressed_response(
+    request: web.Request, body: bytes, content_type: str,
+    compressed_bodies: CompressedBodies | None = None
+) -> web.Response:
+    """
+    Creates response with body compressed by encoding negotiated
+    with client, if body is large enough.
+
+    :param request: http request.
+    :param body: encoded body of response.
+    :param content_type: media type of body.
+    :param compressed_bodies: cache of compressed variants of body.
+    :return: web response.
+    """
+    encoding: str | None = None
+    if len(body) >= response_compressor.min_size:
+        encoding = response_compressor.negotiate(
+            request.headers.get(hdrs.ACCEPT_ENCODING, "")
+        )
+
+    if encoding is None:
+        response = web.Response(body=body, content_type=content_type)
+
+    else:
+        data: bytes | None = None
+        if compressed_bodies is not None:
+            data = compressed_bodies.get_compressed(encoding)
+
+        if data is None:
+            data = await response_compressor.compress(body, encoding)
+            if compressed_bodies is not None:
+                compressed_bodies.put_compressed(encoding, data)
+
+        response = web.Response(body=data, content_type=content_type)
+        response.headers[hdrs.CONTENT_ENCODING] = encoding
+
+    # Body also depends on media type negotiated by Accept
+    response.headers[hdrs.VARY] = f"{hdrs.ACCEPT}, {hdrs.ACCEPT_ENCODING}"
+    return response
+
+
+# Shared by whole process, configured on application startup
+response_compressor: ResponseCompressor = ResponseCompressor()
@@ -0,0 +1,70 @@
+from typing import TypeVar
+
+from aiohttp import ETag, hdrs, web
+
+ResponseType = TypeVar("ResponseType", bound=web.StreamResponse)
+
+# Headers that select representation of negotiated responses
+NEGOTIATED_HEADERS: str = f"{hdrs.ACCEPT}, {hdrs.ACCEPT_ENCODING}"
+
+
+def entity_tag(version: str, content_type: str) -> str:
+    """
+    Builds ETag value of resource encoded with specific media type,
+    so representations of different formats never match each other.
+
+    :param version: current version of resource.
+    :param content_type: media type of response body.
+    :return: ETag value.
+    """
+    return f"{version}-{content_type.rpartition('/')[2]}"
+
+
+def is_not_modified(
+    request: web.Request, version: str | None, content_type: str
+) -> bool:
+    """
+    Checks if client already has current version of resource.
+
+    :param request: http request.
+    :param version: current version of resource.
+    :param content_type: media type of response body.
+    :return: True if If-None-Match header matches version.
+    """
+    if version is None or request.if_none_match is None:
+        return False
+
+    tag: str = entity_tag(version, content_type)
+    return any(
+        etag.value in (tag, "*") for etag in request.if_none_match
+    )
+
+
+def not_modified_response(version: str, content_type: str) -> web.Response:
+    """
+    Creates response telling client to use cached resource.
+
+    :param version: current version of resource.
+    :param content_type: media type of response body.
+    :return: web response with 304 status.
+    """
+    response: web.Response = with_etag(
+        web.Response(status=304), version, content_type
+    )
+    response.headers[hdrs.VARY] = NEGOTIATED_HEADERS
+    return response
+
+
+def with_etag(
+    response: ResponseType, version: str, content_type: str
+) -> ResponseType:
+    """
+    Adds ETag header to response.
+
+    :param response: web response.
+    :param version: current version of resource.
+    :param content_type: media type of response body.
+    :return: same response.
+    """
+    response.etag = ETag(value=entity_tag(version, content_type))
+    return response
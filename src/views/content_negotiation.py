@@ -0,0 +1,82 @@
+from typing import Any
+
+from aiohttp import hdrs, web
+
+from src.DTO.codecs import CODECS, Codec, JSON_CODEC
+
+
+def response_codec(request: web.Request) -> Codec:
+    """
+    Picks codec for response body by Accept header (JSON by default).
+
+    :param request: http request.
+    :return: codec of response.
+    """
+    accept: str = request.headers.get(hdrs.ACCEPT, "")
+    if not accept:
+        return JSON_CODEC
+
+    best: Codec = JSON_CODEC
+    best_weight: float = 0.0
+    for item in accept.lower().split(","):
+        media_type, *params = item.split(";")
+        codec: Codec | None = CODECS.get(media_type.strip())
+        if codec is None:
+            continue
+
+        weight: float = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    weight = float(value)
+
+                except ValueError:
+                    weight = 0.0
+
+        if weight > best_weight:
+            best, best_weight = codec, weight
+
+    return best
+
+
+def request_codec(request: web.Request) -> Codec:
+    """
+    Picks codec for request body by Content-Type header
+    (JSON by default).
+
+    :param request: http request.
+    :return: codec of request body.
+    """
+    return CODECS.get(request.content_type, JSON_CODEC)
+
+
+async def read_body(request: web.Request) -> Any:
+    """
+    Reads and decodes request body.
+
+    :param request: http request.
+    :return: decoded body.
+    :raise MalformedBody: if body can't be decoded.
+    """
+    return request_codec(request).decode(await request.read())
+
+
+def encoded_response(
+    request: web.Request, value: Any, status: int = 200
+) -> web.Response:
+    """
+    Creates response with value encoded by codec client accepts.
+
+    :param request: http request.
+    :param value: DTO or other value to encode.
+    :param status: http status of response.
+    :return: web response.
+    """
+    codec: Codec = response_codec(request)
+    response = web.Response(
+        status=status, body=codec.encode(value),
+        content_type=codec.content_type
+    )
+    response.headers[hdrs.VARY] = hdrs.ACCEPT
+    return response
@@ -1,17 +1,45 @@
-from datetime import datetime
 from typing import Any
 
-import orjson
 from aiohttp import web
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.DTO.codecs import decode_datetime
 from src.DTO.reminder_created_DTO import ReminderCreatedDTO
 from src.controllers.create_reminder import create_reminder
 from src.models.exceptions import InvalidCredentials
+from .content_negotiation import encoded_response, read_body
 from .inject_session import inject_session
+from .query_budget import query_budget
+
+
+def parse_new_reminder_body(body: dict[str, Any]) -> dict[str, Any]:
+    """
+    Extracts fields of new reminder from request body.
+
+    :param body: decoded object describing reminder.
+    :return: dict with arguments for creating reminder.
+    :raise KeyError: if required field is missing.
+    :raise TypeError: if field has invalid type.
+    :raise ValueError: if field has invalid value.
+    :raise AttributeError: if string field is not a string.
+    """
+    new_event_data: dict[str, Any] = {
+        "title": body["title"].strip(),
+        "description": body["description"].strip(),
+        "color_code": body["color_code"].strip(),
+        "triggered_at": decode_datetime(body["triggered_at"]),
+        "is_periodic": body["is_periodic"],
+        "trigger_period": int(body["trigger_period"])
+    }
+
+    if not isinstance(new_event_data["is_periodic"], bool):
+        raise TypeError("Invalid type for is_periodic variable")
+
+    return new_event_data
 
 
 # post /reminders/
+@query_budget(4)
 @inject_session
 async def handle_creating_reminder(
     request: web.Request, session: AsyncSession
@@ -33,26 +61,14 @@ async def handle_creating_reminder(
         )
 
     try:
-        body: dict[str, Any] = await request.json()
-        new_event_data: dict[str, Any] = {
-            "title": body["title"].strip(),
-            "description": body["description"].strip(),
-            "color_code": body["color_code"].strip(),
-            "triggered_at": datetime.fromisoformat(body["triggered_at"]),
-            "is_periodic": body["is_periodic"],
-            "trigger_period": int(body["trigger_period"])
-        }
-
-        if not isinstance(new_event_data["is_periodic"], bool):
-            raise TypeError("Invalid type for is_periodic variable")
+        body: dict[str, Any] = await read_body(request)
+        new_event_data: dict[str, Any] = parse_new_reminder_body(body)
 
         result: ReminderCreatedDTO = await create_reminder(
             user_token, session, **new_event_data
         )
 
-        return web.Response(
-            body=orjson.dumps(result)
-        )
+        return encoded_response(request, result)
 
     except (KeyError, TypeError, ValueError, AttributeError) as e:
         return web.Response(
@@ -0,0 +1,79 @@
+from typing import Any
+
+from aiohttp import web
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.DTO.reminder_batch_DTO import (
+    BatchItemErrorDTO, ReminderBatchCreatedDTO
+)
+from src.controllers.create_reminders_batch import create_reminders_batch
+from src.models.exceptions import InvalidCredentials
+from .create_new_reminder import parse_new_reminder_body
+from .content_negotiation import encoded_response, read_body
+from .inject_session import inject_session
+from .query_budget import query_budget
+
+MAX_BATCH_SIZE: int = 1000
+
+
+# post /reminders/batch
+@query_budget(2)
+@inject_session
+async def handle_creating_reminders_batch(
+    request: web.Request, session: AsyncSession
+) -> web.Response:
+    """
+    Creates several reminders from array of reminder bodies.
+
+    :param request: http request.
+    :param session: SQLAlchemy session.
+    :return: web response with ids of created reminders
+    and errors of rejected ones.
+    """
+
+    try:
+        user_token: str = request.cookies["UserToken"]
+
+    except KeyError:
+        return web.Response(
+            status=401,
+            reason="Client is not authorized"
+        )
+
+    try:
+        body: list[Any] = await read_body(request)
+        if not isinstance(body, list) or len(body) > MAX_BATCH_SIZE:
+            raise ValueError("Expected array of reminders")
+
+    except ValueError:
+        return web.Response(
+            status=400,
+            reason="Invalid request body"
+        )
+
+    new_reminders: dict[int, dict[str, Any]] = {}
+    parsing_errors: list[BatchItemErrorDTO] = []
+    for index, item in enumerate(body):
+        try:
+            new_reminders[index] = parse_new_reminder_body(item)
+
+        except (KeyError, TypeError, ValueError, AttributeError):
+            parsing_errors.append(
+                BatchItemErrorDTO(index, "Invalid reminder body")
+            )
+
+    try:
+        result: ReminderBatchCreatedDTO = await create_reminders_batch(
+            user_token, session, new_reminders
+        )
+
+    except InvalidCredentials:
+        return web.Response(
+            status=401,
+            reason="Client is not authorized"
+        )
+
+    result.errors = sorted(
+        parsing_errors + result.errors, key=lambda error: error.index
+    )
+    return encoded_response(request, result)
@@ -1,28 +1,128 @@
+import math
 from functools import wraps
 from typing import Callable, Awaitable
 
-from aiohttp import web
+from aiohttp import hdrs, web
 from aiohttp.web_request import Request
-from aiohttp.web_response import Response
+from aiohttp.web_response import StreamResponse
+from sqlalchemy import exc
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from src.models.replicas import Replica, ReplicaSet
+
+# Cookie telling that client has recently written data, so its reads
+# must see that write and are served by primary database
+RECENT_WRITE_COOKIE: str = "RecentWrite"
+SAFE_METHODS: frozenset[str] = frozenset((hdrs.METH_GET, hdrs.METH_HEAD))
+
 
 def inject_session(
-    handler: Callable[[web.Request, AsyncSession], Awaitable[web.Response]]
-) -> Callable[[Request], Awaitable[Response]]:
+    handler: Callable[
+        [web.Request, AsyncSession], Awaitable[web.StreamResponse]
+    ]
+) -> Callable[[Request], Awaitable[StreamResponse]]:
     """
-    Decorator that injects AsyncSession into aiohttp handler.
+    Decorator that injects AsyncSession of primary database into aiohttp
+    handler and commits its transaction after handler is done.
+    Successful writes mark client with cookie, so its following reads
+    are not routed to replicas that may lag behind.
 
     :param handler: request handler that needs async session.
     :return: decorated function.
     """
     @wraps(handler)
     async def handle_session(request: web.Request):
-        session_maker: async_sessionmaker[
-            AsyncSession
-        ] = request.app["session_maker"]
-        async with session_maker() as session:
-            async with session.begin():
-                resp = await handler(request, session)
+        resp = await run_with_session(
+            handler, request, request.app["session_maker"]
+        )
+
+        replicas: ReplicaSet = request.app["replicas"]
+        if (
+            replicas.replicas and request.method not in SAFE_METHODS
+            and resp.status < 400 and not resp.prepared
+        ):
+            resp.set_cookie(
+                RECENT_WRITE_COOKIE, "1", httponly=True,
+                max_age=math.ceil(replicas.options.read_after_write)
+            )
+
         return resp
     return handle_session
+
+
+def inject_read_session(
+    handler: Callable[
+        [web.Request, AsyncSession], Awaitable[web.StreamResponse]
+    ]
+) -> Callable[[Request], Awaitable[StreamResponse]]:
+    """
+    Decorator that injects AsyncSession for read-only aiohttp handler.
+    Session is bound to one of healthy replicas, or to primary database
+    if client has recently written data or no replica is available.
+    If replica fails before anything is sent to client, it's excluded
+    and request is handled again by primary database.
+
+    :param handler: read-only request handler that needs async session.
+    :return: decorated function.
+    """
+    @wraps(handler)
+    async def handle_read_session(request: web.Request):
+        replicas: ReplicaSet = request.app["replicas"]
+        replica: Replica | None = None
+        if RECENT_WRITE_COOKIE not in request.cookies:
+            replica = replicas.pick()
+
+        if replica is not None:
+            try:
+                return await run_with_session(
+                    handler, request, replica.session_maker
+                )
+
+            except (exc.OperationalError, exc.InterfaceError):
+                replicas.mark_unhealthy(replica)
+                if request.writer.output_size:
+                    raise
+
+        return await run_with_session(
+            handler, request, request.app["session_maker"]
+        )
+    return handle_read_session
+
+
+async def run_with_session(
+    handler: Callable[
+        [web.Request, AsyncSession], Awaitable[web.StreamResponse]
+    ],
+    request: web.Request,
+    session_maker: async_sessionmaker[AsyncSession]
+) -> web.StreamResponse:
+    """
+    Runs handler with new session and commits its transaction.
+
+    :param handler: request handler that needs async session.
+    :param request: http request.
+    :param session_maker: factory of sessions.
+    :return: response of handler.
+    """
+    # Session begins transaction and checks out connection only on
+    # first query, so requests rejected before that never touch pool.
+    # Exceptions roll transaction back when session is closed.
+    async with session_maker() as session:
+        resp = await handler(request, session)
+        if session.in_transaction():
+            await session.commit()
+
+    return resp
+
+
+async def release_connection(session: AsyncSession) -> None:
+    """
+    Commits transaction of request right after handlers database work
+    is done, so connection returns to pool before response is encoded
+    and compressed. Session checks out connection again if it's used later.
+
+    :param session: SQLAlchemy session.
+    :return: nothing.
+    """
+    if session.in_transaction():
+        await session.commit()
@@ -1,16 +1,30 @@
 from aiohttp import web
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.controllers.user_authentication import log_out_user
+from .inject_session import inject_session
+from .query_budget import query_budget
 
 
 # post /users/logout
-async def handle_logout(request: web.Request) -> web.Response:
+@query_budget(1)
+@inject_session
+async def handle_logout(
+    request: web.Request, session: AsyncSession
+) -> web.Response:
     """
-    Removes cookie on client side with authentication token if it's present.
+    Revokes authentication token and removes cookie with it
+    on client side if it's present.
 
     :param request: http request.
+    :param session: SQLAlchemy session.
     :return: web response with header that removes cookie.
     """
 
-    if request.cookies.get("UserToken"):
+    access_token: str | None = request.cookies.get("UserToken")
+    if access_token:
+        # Cookie with token that is already revoked is removed as well
+        await log_out_user(access_token, session)
         response: web.Response = web.Response()
         response.del_cookie("UserToken")
         return response
@@ -0,0 +1,36 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from aiohttp import web
+
+from src.loop_monitor import loop_monitor
+from .metrics import UNMATCHED_ROUTE
+
+
+@web.middleware
+async def register_task_route(
+    request: web.Request,
+    handler: Callable[[web.Request], Awaitable[web.StreamResponse]]
+) -> web.StreamResponse:
+    """
+    Remembers route of request handled by current task, so calls
+    blocking event loop are reported with route that made them.
+
+    :param request: http request.
+    :param handler: next handler.
+    :return: response of handler.
+    """
+    task: asyncio.Task | None = asyncio.current_task()
+    if task is None:
+        return await handler(request)
+
+    resource = request.match_info.route.resource
+    loop_monitor.task_routes[task] = (
+        f"{request.method} {resource.canonical}"
+        if resource is not None else UNMATCHED_ROUTE
+    )
+    try:
+        return await handler(request)
+
+    finally:
+        del loop_monitor.task_routes[task]
@@ -0,0 +1,261 @@
+import time
+from typing import Awaitable, Callable, Iterator
+
+from aiohttp import hdrs, web
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.loop_monitor import loop_monitor
+from src.metrics import escape_label, metrics
+from src.models.access_token_cache import access_token_cache
+from src.models.initialize_connector import InstrumentedQueuePool
+from src.models.password_hasher import password_hasher
+from src.models.reminder_dispatcher import ReminderDispatcher
+from src.models.reminders_list_cache import reminders_list_cache
+from src.models.replicas import ReplicaSet
+
+# Route label of requests that matched no route
+UNMATCHED_ROUTE: str = "unmatched"
+METRICS_CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@web.middleware
+async def collect_request_metrics(
+    request: web.Request,
+    handler: Callable[[web.Request], Awaitable[web.StreamResponse]]
+) -> web.StreamResponse:
+    """
+    Measures time spent handling request and records it
+    by route, method and response status.
+
+    :param request: http request.
+    :param handler: next handler.
+    :return: response of handler.
+    """
+    started_at: float = time.perf_counter()
+    status: int = 500
+    try:
+        response: web.StreamResponse = await handler(request)
+        status = response.status
+        return response
+
+    except web.HTTPException as e:
+        status = e.status
+        raise
+
+    finally:
+        resource = request.match_info.route.resource
+        metrics.observe_request(
+            resource.canonical if resource is not None else UNMATCHED_ROUTE,
+            request.method, status, time.perf_counter() - started_at
+        )
+
+
+def render_sample(name: str, value: float, labels: str = "") -> str:
+    return f"{name}{{{labels}}} {value}" if labels else f"{name} {value}"
+
+
+def render_header(name: str, kind: str, description: str) -> Iterator[str]:
+    yield f"# HELP {name} {description}"
+    yield f"# TYPE {name} {kind}"
+
+
+def instrumented_pools(
+    app: web.Application
+) -> Iterator[tuple[str, InstrumentedQueuePool]]:
+    """
+    Finds instrumented connection pools of primary database and replicas.
+
+    :param app: application whose pools are collected.
+    :return: pairs of database label and pool.
+    """
+    replicas: ReplicaSet = app["replicas"]
+    engines: list[tuple[str, AsyncEngine]] = [
+        ("primary", app["session_maker"].kw["bind"])
+    ]
+    engines.extend(
+        (replica.name, replica.engine) for replica in replicas.replicas
+    )
+    for database, engine in engines:
+        if isinstance(engine.pool, InstrumentedQueuePool):
+            yield f'database="{escape_label(database)}"', engine.pool
+
+
+def render_metrics(app: web.Application) -> Iterator[str]:
+    """
+    Formats all metrics of process in Prometheus text format.
+
+    :param app: application whose metrics are collected.
+    :return: lines of metrics.
+    """
+    yield from metrics.render()
+
+    pools: list[tuple[str, InstrumentedQueuePool]] = list(
+        instrumented_pools(app)
+    )
+    pool_gauges: tuple[
+        tuple[str, str, Callable[[InstrumentedQueuePool], int]], ...
+    ] = (
+        (
+            "remindme_db_pool_size", "Permanent connections of pool",
+            InstrumentedQueuePool.size
+        ),
+        (
+            "remindme_db_pool_in_use", "Checked out connections",
+            InstrumentedQueuePool.checkedout
+        ),
+        (
+            "remindme_db_pool_idle", "Connections waiting in pool",
+            InstrumentedQueuePool.checkedin
+        ),
+        (
+            "remindme_db_pool_overflow", "Connections above pool size",
+            InstrumentedQueuePool.overflow
+        ),
+    )
+    for name, description, read_value in pool_gauges:
+        yield from render_header(name, "gauge", description)
+        for labels, pool in pools:
+            yield render_sample(name, read_value(pool), labels)
+
+    yield from render_header(
+        "remindme_db_pool_timeouts_total", "counter",
+        "Checkouts that timed out"
+    )
+    for labels, pool in pools:
+        yield render_sample(
+            "remindme_db_pool_timeouts_total",
+            pool.statistics.timeouts, labels
+        )
+
+    yield from render_header(
+        "remindme_db_pool_wait_seconds", "histogram",
+        "Time spent waiting for connection"
+    )
+    for labels, pool in pools:
+        yield from pool.statistics.waits.render(
+            "remindme_db_pool_wait_seconds", labels
+        )
+
+    replicas: ReplicaSet = app["replicas"]
+    if replicas.replicas:
+        yield from render_header(
+            "remindme_db_replica_healthy", "gauge",
+            "Replica is used for reads"
+        )
+        for replica in replicas.replicas:
+            yield render_sample(
+                "remindme_db_replica_healthy", int(replica.healthy),
+                f'database="{escape_label(replica.name)}"'
+            )
+
+        yield from render_header(
+            "remindme_db_replica_lag_seconds", "gauge",
+            "Replication lag measured by last health check"
+        )
+        for replica in replicas.replicas:
+            yield render_sample(
+                "remindme_db_replica_lag_seconds", replica.lag,
+                f'database="{escape_label(replica.name)}"'
+            )
+
+    dispatcher: ReminderDispatcher | None = app.get("dispatcher")
+    if dispatcher is not None and dispatcher.options.enabled:
+        yield from render_header(
+            "remindme_reminders_dispatched_total", "counter",
+            "Due reminders delivered to sink"
+        )
+        yield render_sample(
+            "remindme_reminders_dispatched_total", dispatcher.dispatched
+        )
+        yield from render_header(
+            "remindme_reminders_dispatch_failures_total", "counter",
+            "Failed attempts to dispatch due reminders"
+        )
+        yield render_sample(
+            "remindme_reminders_dispatch_failures_total", dispatcher.failures
+        )
+        yield from render_header(
+            "remindme_reminders_dead_lettered_total", "counter",
+            "Due reminders given up on after failed deliveries"
+        )
+        yield render_sample(
+            "remindme_reminders_dead_lettered_total", dispatcher.dead_lettered
+        )
+
+    if loop_monitor.enabled:
+        yield from render_header(
+            "remindme_event_loop_lag_seconds", "histogram",
+            "Delay of scheduled callbacks of event loop"
+        )
+        yield from loop_monitor.lag.render("remindme_event_loop_lag_seconds")
+        yield from render_header(
+            "remindme_event_loop_stalls_total", "counter",
+            "Times event loop was blocked longer than stall threshold"
+        )
+        yield render_sample(
+            "remindme_event_loop_stalls_total", loop_monitor.stalls
+        )
+
+    yield from render_header(
+        "remindme_password_hashing_queue", "gauge",
+        "Password hashes being computed or waiting for executor"
+    )
+    yield render_sample(
+        "remindme_password_hashing_queue", password_hasher.pending
+    )
+    yield from render_header(
+        "remindme_password_hashing_rejected_total", "counter",
+        "Hashing requests rejected because queue was full"
+    )
+    yield render_sample(
+        "remindme_password_hashing_rejected_total", password_hasher.rejected
+    )
+
+    caches = (
+        ("access_token", access_token_cache),
+        ("reminders_list", reminders_list_cache),
+    )
+    for name, kind, description, attribute in (
+        ("remindme_cache_hits_total", "counter", "Cache hits", "hits"),
+        ("remindme_cache_misses_total", "counter", "Cache misses", "misses"),
+        (
+            "remindme_cache_hit_ratio", "gauge",
+            "Ratio of hits to all lookups", "hit_ratio"
+        ),
+    ):
+        yield from render_header(name, kind, description)
+        for cache_name, cache in caches:
+            yield render_sample(
+                name, getattr(cache, attribute), f'cache="{cache_name}"'
+            )
+
+    yield from render_header(
+        "remindme_cache_entries", "gauge", "Entries stored in cache"
+    )
+    for cache_name, cache in caches:
+        yield render_sample(
+            "remindme_cache_entries", len(cache), f'cache="{cache_name}"'
+        )
+
+    yield from render_header(
+        "remindme_reminders_list_cache_bytes", "gauge",
+        "Memory taken by cached reminders lists"
+    )
+    yield render_sample(
+        "remindme_reminders_list_cache_bytes", reminders_list_cache.size_bytes
+    )
+
+
+# get /metrics
+async def handle_metrics(request: web.Request) -> web.Response:
+    """
+    Responds with metrics of process in Prometheus text format.
+
+    :param request: http request.
+    :return: web response with metrics.
+    """
+    app: web.Application = request.app.get("metered_app", request.app)
+    return web.Response(
+        text="\n".join(render_metrics(app)) + "\n",
+        headers={hdrs.CONTENT_TYPE: METRICS_CONTENT_TYPE}
+    )
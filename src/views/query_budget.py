@@ -0,0 +1,86 @@
+import logging
+from typing import Awaitable, Callable, TypeVar
+
+from aiohttp import web
+
+from src.metrics import (
+    RequestQueries, current_request_queries, query_log
+)
+from .metrics import UNMATCHED_ROUTE
+
+logger = logging.getLogger(__name__)
+
+Handler = TypeVar(
+    "Handler", bound=Callable[..., Awaitable[web.StreamResponse]]
+)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """
+    Raised when handler executed more statements than it declared.
+    """
+
+
+def query_budget(queries: int) -> Callable[[Handler], Handler]:
+    """
+    Declares maximum amount of statements handler executes per request
+    (in the worst case, when nothing is cached).
+
+    :param queries: maximum amount of statements.
+    :return: decorator that marks handler.
+    """
+    def declare_budget(handler: Handler) -> Handler:
+        # Copied to wrappers by functools.wraps
+        handler.query_budget = queries  # type: ignore[attr-defined]
+        return handler
+
+    return declare_budget
+
+
+@web.middleware
+async def track_request_queries(
+    request: web.Request,
+    handler: Callable[[web.Request], Awaitable[web.StreamResponse]]
+) -> web.StreamResponse:
+    """
+    Counts statements executed while handling request, checks them
+    against query budget of handler and reports them in Server-Timing
+    header if it's enabled.
+
+    :param request: http request.
+    :param handler: next handler.
+    :return: response of handler.
+    :raise QueryBudgetExceeded: if handler exceeded its budget
+    and budgets are enforced.
+    """
+    resource = request.match_info.route.resource
+    queries: RequestQueries = RequestQueries(
+        resource.canonical if resource is not None else UNMATCHED_ROUTE
+    )
+    token = current_request_queries.set(queries)
+    try:
+        response: web.StreamResponse = await handler(request)
+
+    finally:
+        current_request_queries.reset(token)
+
+    budget: int | None = getattr(
+        request.match_info.handler, "query_budget", None
+    )
+    if budget is not None and queries.count > budget:
+        message: str = (
+            f"{request.method} {queries.route} executed {queries.count} "
+            f"statements with budget of {budget}"
+        )
+        if query_log.enforce_budgets:
+            raise QueryBudgetExceeded(message)
+
+        logger.warning(message)
+
+    if query_log.server_timing and not response.prepared:
+        response.headers["Server-Timing"] = (
+            f"db;dur={queries.duration * 1000:.2f};"
+            f"desc=\"{queries.count} queries\""
+        )
+
+    return response
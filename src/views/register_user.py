@@ -1,17 +1,21 @@
 import re
 
-import orjson
 from aiohttp import web
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.controllers.user_registration import register_user
+from src.models.exceptions import HashingQueueFull
+from src.DTO.codecs import MalformedBody
+from .content_negotiation import encoded_response, read_body
 from .inject_session import inject_session
+from .query_budget import query_budget
 
 USERNAME_REGEX = re.compile(r"^[A-z0-9_]{8,}")
 USER_PASSWORD_REGEX = re.compile(r"^[A-z0-9_+\-=]{8,}")
 
 
 # post /users/register
+@query_budget(2)
 @inject_session
 async def handle_registration(
     request: web.Request, session: AsyncSession
@@ -24,66 +28,70 @@ async def handle_registration(
     :return: web response with reason or indication.
     """
     try:
-        request_body: dict = await request.json(loads=orjson.loads)
+        request_body: dict = await read_body(request)
         username: str = str(request_body["username"]).strip()
 
         if USERNAME_REGEX.fullmatch(username) is None:
-            return web.Response(
-                status=400,
-                body=orjson.dumps(
-                    {
-                        "reason":
-                            "Incorrect incoming body, expected ascii "
-                            "sequence of 8 symbols for username"
-                    }
-                )
+            return encoded_response(
+                request,
+                {
+                    "reason":
+                        "Incorrect incoming body, expected ascii "
+                        "sequence of 8 symbols for username"
+                },
+                status=400
             )
 
         password: str = str(request_body["password"]).strip()
 
         if USER_PASSWORD_REGEX.fullmatch(password) is None:
-            return web.Response(
-                status=400,
-                body=orjson.dumps(
-                    {
-                        "reason":
-                            "Incorrect incoming body, expected at least "
-                            "8 ascii characters as password"
-                    }
-                )
+            return encoded_response(
+                request,
+                {
+                    "reason":
+                        "Incorrect incoming body, expected at least "
+                        "8 ascii characters as password"
+                },
+                status=400
             )
 
         successful_registration = await register_user(
             username, password, session
         )
 
-    except (orjson.JSONDecodeError, KeyError, AttributeError):
-        return web.Response(
-            status=400,
-            body=orjson.dumps(
-                {
-                    "reason": "Incorrect incoming body, expected json"
-                }
-            )
+    except (MalformedBody, KeyError, AttributeError, TypeError):
+        return encoded_response(
+            request,
+            {
+                "reason": "Incorrect incoming body, expected object"
+            },
+            status=400
+        )
+
+    except HashingQueueFull:
+        return encoded_response(
+            request,
+            {
+                "reason": "Server is busy, try again later"
+            },
+            status=503
         )
 
     if successful_registration:
-        return web.Response(
-            body=orjson.dumps(
-                {
-                    "registered": successful_registration
-                }
-            )
+        return encoded_response(
+            request,
+            {
+                "registered": successful_registration
+            }
         )
 
     else:
-        return web.Response(
-            status=409,
-            body=orjson.dumps(
-                {
-                    "reason": "User is already registered in database "
-                              "with such login",
-                    "registered": successful_registration
-                }
-            )
+        return encoded_response(
+            request,
+            {
+                "reason": "User is already registered in database "
+                          "with such login",
+                "registered": successful_registration
+            },
+            status=409
         )
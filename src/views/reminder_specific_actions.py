@@ -1,27 +1,60 @@
-from datetime import datetime
 from typing import Any
 
-import orjson
 from aiohttp import web
 from sqlalchemy.exc import DataError, StatementError, ProgrammingError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.DTO.codecs import Codec, decode_datetime
 from src.DTO.reminder_DTO import ReminderDTO
 from src.controllers.deactivate_reminder import deactivate_specific_reminder
 from src.controllers.exceptions import ObjectNotFound
-from src.controllers.fetch_reminder import fetch_specific_reminder
+from src.controllers.fetch_reminder import (
+    fetch_specific_reminder, fetch_specific_reminder_version
+)
 from src.controllers.update_reminder import update_specific_reminder
 from src.models.exceptions import InvalidCredentials
-from .inject_session import inject_session
+from .conditional_requests import (
+    is_not_modified, not_modified_response, with_etag
+)
+from .content_negotiation import (
+    encoded_response, read_body, response_codec
+)
+from .inject_session import inject_read_session, inject_session
+from .query_budget import query_budget
+
+
+def parse_reminder_update_body(body: dict[str, Any]) -> dict[str, Any]:
+    """
+    Converts fields of reminder update from request body.
+
+    :param body: decoded object with fields to update.
+    :return: same dict with converted values.
+    :raise ValueError: if triggered_at field is invalid.
+    :raise TypeError: if body is not an object.
+    """
+    if "triggered_at" in body:
+        try:
+            body["triggered_at"] = decode_datetime(body["triggered_at"])
+
+        except TypeError as e:
+            raise ValueError(
+                f"Invalid triggered_at field type "
+                f"(got {type(body['triggered_at'])}"
+            ) from e
+
+    return body
 
 
 # get /reminders/{reminderId:\d+}
-@inject_session
+@query_budget(2)
+@inject_read_session
 async def handle_fetching_specific_reminder(
     request: web.Request, session: AsyncSession
 ) -> web.Response:
     """
-    Fetches specified users reminder.
+    Fetches specified users reminder. Reminder is sent with ETag,
+    and If-None-Match matching it gets 304 response without loading
+    reminder.
 
     :param request: http request.
     :param session: SQLAlchemy session.
@@ -38,13 +71,26 @@ async def handle_fetching_specific_reminder(
         )
 
     try:
+        reminder_id: int = int(request.match_info["reminderId"])
+        codec: Codec = response_codec(request)
+
+        if request.if_none_match is not None:
+            version: str | None = await fetch_specific_reminder_version(
+                user_token, reminder_id, session
+            )
+            if version is not None and is_not_modified(
+                request, version, codec.content_type
+            ):
+                return not_modified_response(version, codec.content_type)
+
         # Fetching reminder by url variable
         reminder: ReminderDTO = await fetch_specific_reminder(
-            user_token, int(request.match_info["reminderId"]), session
+            user_token, reminder_id, session
         )
 
-        return web.Response(
-            body=orjson.dumps(reminder)
+        return with_etag(
+            encoded_response(request, reminder),
+            reminder.version, codec.content_type
         )
 
     except (DataError, ValueError, KeyError):
@@ -60,16 +106,18 @@ async def handle_fetching_specific_reminder(
         )
 
     except (AttributeError, ObjectNotFound):
-        return web.Response(
-            status=404,
-            body=orjson.dumps({
+        return encoded_response(
+            request,
+            {
                 "reason":
                     "Provided ID in URL parameter is not found for that user"
-            })
+            },
+            status=404
         )
 
 
 # delete /reminders/{reminderId:\d+}
+@query_budget(2)
 @inject_session
 async def handle_deactivating_specific_reminder(
     request: web.Request, session: AsyncSession
@@ -97,9 +145,7 @@ async def handle_deactivating_specific_reminder(
             user_token, int(request.match_info["reminderId"]), session
         )
 
-        return web.Response(
-            body=orjson.dumps(body)
-        )
+        return encoded_response(request, body)
 
     except (DataError, ValueError, KeyError):
         return web.Response(
@@ -114,16 +160,18 @@ async def handle_deactivating_specific_reminder(
         )
 
     except (AttributeError, ObjectNotFound):
-        return web.Response(
-            status=404,
-            body=orjson.dumps({
+        return encoded_response(
+            request,
+            {
                 "reason":
                     "Provided ID in URL parameter is not found for that user"
-            })
+            },
+            status=404
         )
 
 
 # patch /reminders/{reminderId:\d+}
+@query_budget(2)
 @inject_session
 async def handle_updating_specific_reminder(
     request: web.Request, session: AsyncSession
@@ -146,28 +194,16 @@ async def handle_updating_specific_reminder(
         )
 
     try:
-        body: dict[str, Any] = await request.json()
-
-        if "triggered_at" in body:
-            try:
-                body["triggered_at"] = datetime.fromisoformat(
-                    body["triggered_at"]
-                )
-
-            except TypeError as e:
-                raise ValueError(
-                    f"Invalid triggered_at field type "
-                    f"(got {type(body['triggered_at'])}"
-                ) from e
+        body: dict[str, Any] = parse_reminder_update_body(
+            await read_body(request)
+        )
 
         updated_fields: list[str] = await update_specific_reminder(
             user_token, int(request.match_info["reminderId"]), session,
             **body
         )
 
-        return web.Response(
-            body=orjson.dumps(updated_fields)
-        )
+        return encoded_response(request, updated_fields)
 
     except (
         DataError, StatementError, ProgrammingError,
@@ -185,13 +221,11 @@ async def handle_updating_specific_reminder(
         )
 
     except (KeyError, ObjectNotFound):
-        return web.Response(
-            status=404,
-            body=orjson.dumps(
-                {
-                    "reason":
-                        "Provided ID in URL parameter is "
-                        "not found for that user"
-                }
-            )
+        return encoded_response(
+            request,
+            {
+                "reason":
+                    "Provided ID in URL parameter is not found for that user"
+            },
+            status=404
         )
@@ -0,0 +1,170 @@
+from typing import Any
+
+from aiohttp import web
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.DTO.reminder_batch_DTO import (
+    BatchReminderErrorDTO, ReminderBatchUpdatedDTO
+)
+from src.controllers.update_reminders_batch import (
+    deactivate_reminders_batch, update_reminders_batch
+)
+from src.models.exceptions import InvalidCredentials
+from .create_reminders_batch import MAX_BATCH_SIZE
+from .content_negotiation import encoded_response, read_body
+from .inject_session import inject_session
+from .query_budget import query_budget
+from .reminder_specific_actions import parse_reminder_update_body
+
+
+def parse_reminder_ids(ids: Any) -> list[int]:
+    """
+    Checks list of reminder ids from request body and removes duplicates.
+
+    :param ids: decoded value of request body.
+    :return: list of unique ids.
+    :raise ValueError: if value is not a list of integers
+    or it's too long.
+    """
+    if (
+        not isinstance(ids, list) or len(ids) > MAX_BATCH_SIZE
+        or not all(
+            isinstance(reminder_id, int)
+            and not isinstance(reminder_id, bool)
+            for reminder_id in ids
+        )
+    ):
+        raise ValueError("Expected array of reminder ids")
+
+    return list(dict.fromkeys(ids))
+
+
+# patch /reminders/batch
+@query_budget(3)
+@inject_session
+async def handle_updating_reminders_batch(
+    request: web.Request, session: AsyncSession
+) -> web.Response:
+    """
+    Updates several users reminders. Body is either
+    {"ids": [...], "fields": {...}} to set same fields on all reminders,
+    or {"updates": [{"id": ..., ...fields}, ...]} for per-reminder fields.
+
+    :param request: http request.
+    :param session: SQLAlchemy session.
+    :return: web response with per-reminder results or error message.
+    """
+
+    try:
+        user_token: str = request.cookies["UserToken"]
+
+    except KeyError:
+        return web.Response(
+            status=401,
+            reason="Client is not authorized"
+        )
+
+    updates: dict[int, dict[str, Any]] = {}
+    errors: list[BatchReminderErrorDTO] = []
+    try:
+        body: dict[str, Any] = await read_body(request)
+        if not isinstance(body, dict):
+            raise ValueError("Expected object")
+
+        if "updates" in body:
+            items: Any = body["updates"]
+            if not isinstance(items, list) or len(items) > MAX_BATCH_SIZE:
+                raise ValueError("Expected array of updates")
+
+            ids: list[int] = parse_reminder_ids([
+                item.get("id") if isinstance(item, dict) else None
+                for item in items
+            ])
+            for item in items:
+                fields: dict[str, Any] = dict(item)
+                reminder_id: int = fields.pop("id")
+                try:
+                    updates[reminder_id] = parse_reminder_update_body(fields)
+
+                except ValueError:
+                    updates.pop(reminder_id, None)
+                    errors.append(BatchReminderErrorDTO(
+                        reminder_id, "Invalid triggered_at value"
+                    ))
+
+        else:
+            ids = parse_reminder_ids(body["ids"])
+            if not isinstance(body["fields"], dict):
+                raise ValueError("Expected object with fields")
+
+            shared_fields: dict[str, Any] = parse_reminder_update_body(
+                body["fields"]
+            )
+            updates = {reminder_id: shared_fields for reminder_id in ids}
+
+    except (KeyError, TypeError, ValueError):
+        return web.Response(
+            status=400,
+            reason="Invalid request body"
+        )
+
+    try:
+        result: ReminderBatchUpdatedDTO = await update_reminders_batch(
+            user_token, session, updates
+        )
+
+    except InvalidCredentials:
+        return web.Response(
+            status=401,
+            reason="Client is not authorized"
+        )
+
+    result.errors = errors + result.errors
+    return encoded_response(request, result)
+
+
+# delete /reminders/batch
+@query_budget(2)
+@inject_session
+async def handle_deactivating_reminders_batch(
+    request: web.Request, session: AsyncSession
+) -> web.Response:
+    """
+    Deactivates several users reminders, listed in {"ids": [...]} body.
+
+    :param request: http request.
+    :param session: SQLAlchemy session.
+    :return: web response with per-reminder results or error message.
+    """
+
+    try:
+        user_token: str = request.cookies["UserToken"]
+
+    except KeyError:
+        return web.Response(
+            status=401,
+            reason="Client is not authorized"
+        )
+
+    try:
+        body: dict[str, Any] = await read_body(request)
+        ids: list[int] = parse_reminder_ids(body["ids"])
+
+    except (KeyError, TypeError, ValueError):
+        return web.Response(
+            status=400,
+            reason="Invalid request body"
+        )
+
+    try:
+        result: ReminderBatchUpdatedDTO = await deactivate_reminders_batch(
+            user_token, session, ids
+        )
+
+    except InvalidCredentials:
+        return web.Response(
+            status=401,
+            reason="Client is not authorized"
+        )
+
+    return encoded_response(request, result)
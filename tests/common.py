@@ -0,0 +1,69 @@
+import tempfile
+
+from aiohttp import web
+from aiohttp.test_utils import AioHTTPTestCase
+
+from src.metrics import instrument_queries, query_log
+from src.models.access_token_cache import access_token_cache
+from src.models.initialize_connector import (
+    create_engine, create_session_factory, reinitialize_db
+)
+from src.models.reminders_list_cache import reminders_list_cache
+from src.models.replicas import ReplicaOptions, ReplicaSet
+from src.views import init_application_routes
+from src.views.query_budget import track_request_queries
+
+CREDENTIALS: dict[str, str] = {
+    "username": "someuser1", "password": "password1"
+}
+NEW_REMINDER: dict[str, object] = {
+    "title": "Title",
+    "description": "Description",
+    "color_code": "00FF00",
+    "triggered_at": "2030-01-01T10:00:00+00:00",
+    "is_periodic": False,
+    "trigger_period": 0
+}
+
+
+class ApplicationTestCase(AioHTTPTestCase):
+    """
+    Runs application on fresh SQLite database with enforced query
+    budgets. Token and list caches are disabled, so every request
+    reaches database.
+    """
+
+    async def get_application(self) -> web.Application:
+        self.directory = tempfile.TemporaryDirectory()
+        self.engine = create_engine(
+            f"sqlite+aiosqlite:///{self.directory.name}/remindme.sqlite"
+        )
+        await reinitialize_db(self.engine)
+
+        app: web.Application = web.Application()
+        app["session_maker"] = create_session_factory(self.engine)
+        app["replicas"] = ReplicaSet(app["session_maker"], ReplicaOptions())
+        init_application_routes(app)
+        instrument_queries()
+        app.middlewares.append(track_request_queries)
+        return app
+
+    async def asyncSetUp(self) -> None:
+        access_token_cache.configure(max_size=0, ttl=0)
+        reminders_list_cache.configure(max_bytes=0, ttl=0)
+        query_log.configure(
+            enabled=True, slow_query_threshold=0,
+            server_timing=True, enforce_budgets=True
+        )
+        await super().asyncSetUp()
+
+    async def asyncTearDown(self) -> None:
+        await super().asyncTearDown()
+        await self.engine.dispose()
+        self.directory.cleanup()
+        access_token_cache.configure(max_size=10000, ttl=300)
+        reminders_list_cache.configure(max_bytes=64 * 1024 * 1024, ttl=60)
+        query_log.configure(
+            enabled=True, slow_query_threshold=0.5,
+            server_timing=False, enforce_budgets=False
+        )
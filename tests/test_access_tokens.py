@@ -0,0 +1,71 @@
+from src.models.access_token_cache import access_token_cache
+from src.models.user import MAX_ACCESS_TOKENS_PER_USER
+from .common import ApplicationTestCase, CREDENTIALS
+
+
+class AccessTokensTestCase(ApplicationTestCase):
+    """
+    Checks that every login gets its own access token.
+    """
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        await self.client.post("/users/register", json=CREDENTIALS)
+
+    async def login(self) -> str:
+        response = await self.client.post("/users/login", json=CREDENTIALS)
+        self.assertEqual(response.status, 200)
+        return response.cookies["UserToken"].value
+
+    async def list_reminders(self, access_token: str) -> int:
+        response = await self.client.get(
+            "/reminders/", cookies={"UserToken": access_token}
+        )
+        return response.status
+
+    async def test_login_keeps_other_devices_signed_in(self) -> None:
+        first_token: str = await self.login()
+        second_token: str = await self.login()
+
+        self.assertNotEqual(first_token, second_token)
+        self.assertEqual(await self.list_reminders(first_token), 200)
+        self.assertEqual(await self.list_reminders(second_token), 200)
+
+    async def test_oldest_tokens_stop_working(self) -> None:
+        tokens: list[str] = [
+            await self.login()
+            for _ in range(MAX_ACCESS_TOKENS_PER_USER + 1)
+        ]
+
+        self.assertEqual(await self.list_reminders(tokens[0]), 401)
+        self.assertEqual(await self.list_reminders(tokens[1]), 200)
+        self.assertEqual(await self.list_reminders(tokens[-1]), 200)
+
+    async def test_dropped_tokens_are_removed_from_cache(self) -> None:
+        access_token_cache.configure(max_size=100, ttl=300)
+        first_token: str = await self.login()
+        self.assertEqual(await self.list_reminders(first_token), 200)
+
+        for _ in range(MAX_ACCESS_TOKENS_PER_USER):
+            await self.login()
+
+        self.assertEqual(await self.list_reminders(first_token), 401)
+
+    async def test_unknown_token_is_rejected(self) -> None:
+        await self.login()
+
+        self.assertEqual(await self.list_reminders("unknown"), 401)
+
+    async def test_logout_revokes_cached_token(self) -> None:
+        access_token_cache.configure(max_size=100, ttl=300)
+        first_token: str = await self.login()
+        second_token: str = await self.login()
+        self.assertEqual(await self.list_reminders(first_token), 200)
+
+        response = await self.client.post(
+            "/users/logout", cookies={"UserToken": first_token}
+        )
+        self.assertEqual(response.status, 200)
+
+        self.assertEqual(await self.list_reminders(first_token), 401)
+        self.assertEqual(await self.list_reminders(second_token), 200)
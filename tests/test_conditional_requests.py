@@ -0,0 +1,61 @@
+from src.DTO.codecs import MSGPACK_CODEC
+from .common import ApplicationTestCase, CREDENTIALS, NEW_REMINDER
+
+
+class ConditionalRequestsTestCase(ApplicationTestCase):
+    """
+    Checks ETag and If-None-Match handling of reminders routes.
+    """
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        await self.client.post("/users/register", json=CREDENTIALS)
+        await self.client.post("/users/login", json=CREDENTIALS)
+        response = await self.client.post("/reminders/", json=NEW_REMINDER)
+        self.assertEqual(response.status, 200)
+        self.reminder_id: int = (await response.json())["event_id"]
+
+    async def check_revalidation(self, url: str) -> None:
+        response = await self.client.get(url)
+        self.assertEqual(response.status, 200)
+        etag: str = response.headers["ETag"]
+
+        response = await self.client.get(
+            url, headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status, 304)
+        self.assertEqual(response.headers["ETag"], etag)
+        self.assertIn("Accept", response.headers["Vary"])
+        self.assertEqual(await response.read(), b"")
+
+        response = await self.client.get(url, headers={"If-None-Match": "*"})
+        self.assertEqual(response.status, 304)
+
+        response = await self.client.patch(
+            f"/reminders/{self.reminder_id}", json={"title": "New title"}
+        )
+        self.assertEqual(response.status, 200)
+
+        response = await self.client.get(
+            url, headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    async def test_list_is_revalidated(self) -> None:
+        await self.check_revalidation("/reminders/")
+
+    async def test_reminder_is_revalidated(self) -> None:
+        await self.check_revalidation(f"/reminders/{self.reminder_id}")
+
+    async def test_etag_differs_between_formats(self) -> None:
+        for url in ("/reminders/", f"/reminders/{self.reminder_id}"):
+            response = await self.client.get(url)
+            etag: str = response.headers["ETag"]
+
+            response = await self.client.get(url, headers={
+                "If-None-Match": etag,
+                "Accept": MSGPACK_CODEC.content_type
+            })
+            self.assertEqual(response.status, 200)
+            self.assertNotEqual(response.headers["ETag"], etag)
@@ -0,0 +1,116 @@
+import datetime
+import unittest
+
+import msgpack  # type: ignore[import-untyped]
+
+from src.DTO.codecs import MSGPACK_CODEC
+from .common import ApplicationTestCase, CREDENTIALS, NEW_REMINDER
+
+MSGPACK_HEADERS: dict[str, str] = {
+    "Content-Type": MSGPACK_CODEC.content_type,
+    "Accept": MSGPACK_CODEC.content_type
+}
+TRIGGERED_AT: datetime.datetime = datetime.datetime(
+    2030, 1, 1, 10, 0, 0, 123456, tzinfo=datetime.UTC
+)
+
+
+class ContentNegotiationTestCase(ApplicationTestCase):
+    """
+    Checks that requests and responses round-trip through msgpack.
+    """
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        for path in ("/users/register", "/users/login"):
+            response = await self.client.post(
+                path, data=MSGPACK_CODEC.encode(CREDENTIALS),
+                headers=MSGPACK_HEADERS
+            )
+            self.assertEqual(response.status, 200)
+
+    async def create_reminder(self, triggered_at: object) -> int:
+        response = await self.client.post(
+            "/reminders/",
+            data=MSGPACK_CODEC.encode(
+                {**NEW_REMINDER, "triggered_at": triggered_at}
+            ),
+            headers=MSGPACK_HEADERS
+        )
+        self.assertEqual(response.status, 200)
+        self.assertEqual(
+            response.headers["Content-Type"], MSGPACK_CODEC.content_type
+        )
+        return MSGPACK_CODEC.decode(await response.read())["event_id"]
+
+    async def fetch_reminder(self, reminder_id: int) -> dict[str, object]:
+        response = await self.client.get(
+            f"/reminders/{reminder_id}", headers=MSGPACK_HEADERS
+        )
+        self.assertEqual(response.status, 200)
+        self.assertEqual(
+            response.headers["Content-Type"], MSGPACK_CODEC.content_type
+        )
+        data: bytes = await response.read()
+        # Datetimes are sent as timestamp extension type
+        self.assertIn(msgpack.Timestamp, [
+            type(value) for value in msgpack.unpackb(data).values()
+        ])
+        return MSGPACK_CODEC.decode(data)
+
+    async def test_timestamp_round_trip(self) -> None:
+        reminder_id: int = await self.create_reminder(TRIGGERED_AT)
+
+        reminder = await self.fetch_reminder(reminder_id)
+
+        self.assertEqual(reminder["title"], NEW_REMINDER["title"])
+        self.assertEqual(reminder["triggered_at"], TRIGGERED_AT)
+
+    async def test_iso_string_is_accepted(self) -> None:
+        reminder_id: int = await self.create_reminder(
+            TRIGGERED_AT.isoformat()
+        )
+
+        reminder = await self.fetch_reminder(reminder_id)
+
+        self.assertEqual(reminder["triggered_at"], TRIGGERED_AT)
+
+    async def test_json_and_msgpack_lists_match(self) -> None:
+        reminder_id: int = await self.create_reminder(TRIGGERED_AT)
+
+        response = await self.client.get(
+            "/reminders/", headers=MSGPACK_HEADERS
+        )
+        msgpack_list = MSGPACK_CODEC.decode(await response.read())
+        response = await self.client.get("/reminders/")
+        json_list = await response.json()
+
+        self.assertEqual(
+            [reminder["id"] for reminder in msgpack_list], [reminder_id]
+        )
+        self.assertEqual(msgpack_list[0]["triggered_at"], TRIGGERED_AT)
+        # SQLite doesn't keep time zones, values are in UTC
+        self.assertEqual(
+            datetime.datetime.fromisoformat(
+                json_list[0]["triggered_at"]
+            ).replace(tzinfo=datetime.UTC),
+            TRIGGERED_AT
+        )
+
+
+class MsgpackCodecTestCase(unittest.TestCase):
+    """
+    Checks encoding of datetimes by msgpack codec.
+    """
+
+    def test_naive_datetime_is_packed_as_utc(self) -> None:
+        naive: datetime.datetime = TRIGGERED_AT.replace(tzinfo=None)
+
+        self.assertEqual(
+            MSGPACK_CODEC.encode({"at": naive}),
+            MSGPACK_CODEC.encode({"at": TRIGGERED_AT})
+        )
+        self.assertEqual(
+            MSGPACK_CODEC.decode(MSGPACK_CODEC.encode([naive])),
+            [TRIGGERED_AT]
+        )
@@ -0,0 +1,119 @@
+from unittest import mock
+
+from src.metrics import query_log
+from src.views.reminder_specific_actions import (
+    handle_fetching_specific_reminder
+)
+from .common import ApplicationTestCase, CREDENTIALS, NEW_REMINDER
+
+
+class QueryBudgetsTestCase(ApplicationTestCase):
+    """
+    Runs every route with enforced query budgets, which declare
+    the worst case.
+    """
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        await self.client.post("/users/register", json=CREDENTIALS)
+        await self.client.post("/users/login", json=CREDENTIALS)
+
+    async def create_reminders(self, amount: int) -> list[int]:
+        response = await self.client.post(
+            "/reminders/batch", json=[NEW_REMINDER] * amount
+        )
+        self.assertEqual(response.status, 200)
+        return [
+            item["event_id"] for item in (await response.json())["created"]
+        ]
+
+    async def test_routes_stay_within_budgets(self) -> None:
+        response = await self.client.post("/reminders/", json=NEW_REMINDER)
+        self.assertEqual(response.status, 200)
+        ids: list[int] = await self.create_reminders(3)
+
+        response = await self.client.get("/reminders/")
+        self.assertEqual(response.status, 200)
+        response = await self.client.get(
+            "/reminders/", headers={"If-None-Match": response.headers["ETag"]}
+        )
+        self.assertEqual(response.status, 304)
+        response = await self.client.get(
+            "/reminders/", params={"since": "2000-01-01T00:00:00+00:00"}
+        )
+        self.assertEqual(response.status, 200)
+        response = await self.client.get("/reminders/", params={"limit": 2})
+        self.assertEqual(response.status, 200)
+        response = await self.client.get(
+            "/reminders/",
+            params={
+                "limit": 2, "cursor": (await response.json())["next_cursor"]
+            }
+        )
+        self.assertEqual(response.status, 200)
+
+        response = await self.client.get(f"/reminders/{ids[0]}")
+        self.assertEqual(response.status, 200)
+        response = await self.client.get(
+            f"/reminders/{ids[0]}",
+            headers={"If-None-Match": response.headers["ETag"]}
+        )
+        self.assertEqual(response.status, 304)
+        response = await self.client.patch(
+            f"/reminders/{ids[0]}", json={"title": "New title"}
+        )
+        self.assertEqual(response.status, 200)
+        response = await self.client.patch(
+            "/reminders/batch",
+            json={"ids": ids, "fields": {"description": "New description"}}
+        )
+        self.assertEqual(response.status, 200)
+        response = await self.client.delete(f"/reminders/{ids[0]}")
+        self.assertEqual(response.status, 200)
+        response = await self.client.delete(
+            "/reminders/batch", json={"ids": ids[1:]}
+        )
+        self.assertEqual(response.status, 200)
+
+        # Missing reminders cost an extra statement telling them apart
+        # from invalid token
+        response = await self.client.get("/reminders/999")
+        self.assertEqual(response.status, 404)
+        response = await self.client.patch(
+            "/reminders/999", json={"title": "New title"}
+        )
+        self.assertEqual(response.status, 404)
+        response = await self.client.delete("/reminders/999")
+        self.assertEqual(response.status, 404)
+
+        response = await self.client.post("/users/logout")
+        self.assertEqual(response.status, 200)
+
+    async def test_server_timing_reports_statements(self) -> None:
+        ids: list[int] = await self.create_reminders(1)
+
+        response = await self.client.get(f"/reminders/{ids[0]}")
+        self.assertEqual(response.status, 200)
+        self.assertIn('desc="1 queries"', response.headers["Server-Timing"])
+
+    async def test_exceeding_budget_fails_request(self) -> None:
+        ids: list[int] = await self.create_reminders(1)
+
+        with mock.patch.object(
+            handle_fetching_specific_reminder, "query_budget", 0
+        ):
+            response = await self.client.get(f"/reminders/{ids[0]}")
+
+        self.assertEqual(response.status, 500)
+
+    async def test_exceeding_budget_is_logged_if_not_enforced(self) -> None:
+        ids: list[int] = await self.create_reminders(1)
+        query_log.enforce_budgets = False
+
+        with mock.patch.object(
+            handle_fetching_specific_reminder, "query_budget", 0
+        ), self.assertLogs("src.views.query_budget", "WARNING") as logs:
+            response = await self.client.get(f"/reminders/{ids[0]}")
+
+        self.assertEqual(response.status, 200)
+        self.assertIn("with budget of 0", logs.output[0])
@@ -0,0 +1,132 @@
+import datetime
+from typing import Sequence
+
+from src.DTO.due_reminder_DTO import DueReminderDTO
+from src.models.reminder import Reminder
+from src.models.reminder_dispatcher import (
+    DispatcherOptions, QueueSink, ReminderDispatcher, ReminderSink
+)
+from .common import ApplicationTestCase, CREDENTIALS, NEW_REMINDER
+
+LATER: datetime.datetime = datetime.datetime(2031, 1, 1, tzinfo=datetime.UTC)
+PERIODIC_REMINDER: dict[str, object] = {
+    **NEW_REMINDER, "triggered_at": "2020-01-01T10:00:00+00:00",
+    "is_periodic": True, "trigger_period": 7
+}
+
+
+class FailingSink(ReminderSink):
+    """
+    Sink that never manages to deliver reminders.
+    """
+
+    def __init__(self) -> None:
+        self.attempts: int = 0
+
+    async def deliver(self, reminders: Sequence[DueReminderDTO]) -> None:
+        self.attempts += 1
+        raise ConnectionError("Receiver is down")
+
+
+class ReminderDispatcherTestCase(ApplicationTestCase):
+    """
+    Checks rescheduling of fired reminders and retries of reminders
+    whose delivery keeps failing.
+    """
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        await self.client.post("/users/register", json=CREDENTIALS)
+        await self.client.post("/users/login", json=CREDENTIALS)
+        response = await self.client.post("/reminders/", json=NEW_REMINDER)
+        self.assertEqual(response.status, 200)
+        self.sink = FailingSink()
+        self.dispatcher = ReminderDispatcher(
+            self.app["session_maker"],
+            DispatcherOptions(max_attempts=3), self.sink
+        )
+
+    async def test_reminder_is_given_up_after_max_attempts(self) -> None:
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                await self.dispatcher.dispatch_due(LATER)
+
+        self.assertEqual(self.dispatcher.dead_lettered, 0)
+
+        with self.assertRaises(ConnectionError), self.assertLogs(
+            "src.models.reminder_dispatcher", "ERROR"
+        ) as logs:
+            await self.dispatcher.dispatch_due(LATER)
+
+        self.assertIn("Giving up on reminder", logs.output[0])
+        self.assertEqual(self.dispatcher.dead_lettered, 1)
+        self.assertEqual(await self.dispatcher.dispatch_due(LATER), 0)
+        self.assertEqual(self.sink.attempts, 3)
+
+    def test_retry_delay_doubles_up_to_limit(self) -> None:
+        self.dispatcher.options.max_retry_delay = 5.0
+        self.assertEqual(
+            [self.dispatcher.retry_delay(failed) for failed in (1, 2, 3, 4)],
+            [1.0, 2.0, 4.0, 5.0]
+        )
+        self.assertEqual(self.dispatcher.retry_delay(10000), 5.0)
+
+    async def fire_periodic_reminder(self) -> tuple[int, ReminderDispatcher]:
+        response = await self.client.post(
+            "/reminders/", json=PERIODIC_REMINDER
+        )
+        self.assertEqual(response.status, 200)
+        reminder_id: int = (await response.json())["event_id"]
+        dispatcher = ReminderDispatcher(
+            self.app["session_maker"], DispatcherOptions(), QueueSink()
+        )
+        self.assertEqual(await dispatcher.dispatch_due(), 1)
+        return reminder_id, dispatcher
+
+    async def next_trigger_at(
+        self, reminder_id: int
+    ) -> datetime.datetime | None:
+        async with self.app["session_maker"]() as session:
+            reminder: Reminder | None = await session.get(
+                Reminder, reminder_id
+            )
+            assert reminder is not None
+            if reminder.next_trigger_at is None:
+                return None
+
+            return reminder.next_trigger_at.replace(tzinfo=datetime.UTC)
+
+    async def test_reminder_made_non_periodic_is_not_claimed(self) -> None:
+        reminder_id, dispatcher = await self.fire_periodic_reminder()
+
+        response = await self.client.patch(
+            f"/reminders/{reminder_id}", json={"is_periodic": False}
+        )
+        self.assertEqual(response.status, 200)
+
+        self.assertIsNone(await self.next_trigger_at(reminder_id))
+        self.assertEqual(
+            await dispatcher.dispatch_due(
+                datetime.datetime.now(datetime.UTC)
+                + datetime.timedelta(days=30)
+            ),
+            0
+        )
+
+    async def test_period_change_moves_next_trigger(self) -> None:
+        reminder_id, _ = await self.fire_periodic_reminder()
+        now: datetime.datetime = datetime.datetime.now(datetime.UTC)
+
+        response = await self.client.patch(
+            f"/reminders/{reminder_id}", json={"trigger_period": 1}
+        )
+        self.assertEqual(response.status, 200)
+
+        next_trigger_at = await self.next_trigger_at(reminder_id)
+        assert next_trigger_at is not None
+        # Occurrences of new period start from triggered_at
+        self.assertEqual(next_trigger_at.time(), datetime.time(10))
+        self.assertGreater(next_trigger_at, now)
+        self.assertLessEqual(
+            next_trigger_at - now, datetime.timedelta(days=1)
+        )
@@ -0,0 +1,104 @@
+from .common import ApplicationTestCase, CREDENTIALS, NEW_REMINDER
+
+# Doesn't fit into integer column
+OVERSIZED_PERIOD: int = 2 ** 40
+
+
+class RemindersBatchTestCase(ApplicationTestCase):
+    """
+    Checks that invalid items of batch requests get their own errors
+    while valid ones are saved.
+    """
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        await self.client.post("/users/register", json=CREDENTIALS)
+        await self.client.post("/users/login", json=CREDENTIALS)
+
+    async def create_reminders(self, amount: int) -> list[int]:
+        response = await self.client.post(
+            "/reminders/batch", json=[NEW_REMINDER] * amount
+        )
+        self.assertEqual(response.status, 200)
+        return [
+            item["event_id"] for item in (await response.json())["created"]
+        ]
+
+    async def test_mixed_items_get_own_results(self) -> None:
+        response = await self.client.post("/reminders/batch", json=[
+            NEW_REMINDER,
+            {**NEW_REMINDER, "title": ""},
+            {key: NEW_REMINDER[key] for key in NEW_REMINDER if key != "title"},
+            {**NEW_REMINDER, "color_code": "XYZ"},
+            {**NEW_REMINDER, "title": "Second"}
+        ])
+        self.assertEqual(response.status, 200)
+        result = await response.json()
+
+        self.assertEqual(
+            [item["index"] for item in result["created"]], [0, 4]
+        )
+        self.assertEqual(result["errors"], [
+            {"index": 1, "reason": "Invalid title length"},
+            {"index": 2, "reason": "Invalid reminder body"},
+            {"index": 3, "reason": "Invalid color code"}
+        ])
+
+        response = await self.client.get("/reminders/")
+        self.assertEqual(
+            sorted(reminder["id"] for reminder in await response.json()),
+            [item["event_id"] for item in result["created"]]
+        )
+
+    async def test_oversized_period_of_new_reminder_is_rejected(
+        self
+    ) -> None:
+        response = await self.client.post("/reminders/batch", json=[
+            NEW_REMINDER,
+            {**NEW_REMINDER, "trigger_period": OVERSIZED_PERIOD}
+        ])
+        self.assertEqual(response.status, 200)
+        result = await response.json()
+        self.assertEqual([item["index"] for item in result["created"]], [0])
+        self.assertEqual(
+            result["errors"],
+            [{"index": 1, "reason": "Invalid trigger period"}]
+        )
+
+    async def test_oversized_period_of_update_is_rejected(self) -> None:
+        ids: list[int] = await self.create_reminders(2)
+
+        response = await self.client.patch("/reminders/batch", json={
+            "updates": [
+                {"id": ids[0], "title": "New title"},
+                {"id": ids[1], "trigger_period": OVERSIZED_PERIOD}
+            ]
+        })
+        self.assertEqual(response.status, 200)
+        result = await response.json()
+        self.assertEqual(result["updated"], [ids[0]])
+        self.assertEqual(
+            result["errors"],
+            [{"id": ids[1], "reason": "Invalid trigger period"}]
+        )
+
+    async def test_mixed_updates_get_own_results(self) -> None:
+        ids: list[int] = await self.create_reminders(2)
+        missing_id: int = ids[-1] + 100
+
+        response = await self.client.patch("/reminders/batch", json={
+            "updates": [
+                {"id": ids[0], "title": "New title"},
+                {"id": ids[1], "unknown": "value"},
+                {"id": missing_id, "title": "New title"}
+            ]
+        })
+        self.assertEqual(response.status, 200)
+        result = await response.json()
+
+        self.assertEqual(result["updated"], [ids[0]])
+        self.assertEqual(result["not_found"], [missing_id])
+        self.assertEqual(
+            result["errors"],
+            [{"id": ids[1], "reason": "Unknown or missing fields"}]
+        )
@@ -0,0 +1,48 @@
+import datetime
+
+from sqlalchemy import update
+
+from src.models.reminder import Reminder
+from src.models.reminders_list_cache import reminders_list_cache
+from .common import ApplicationTestCase, CREDENTIALS, NEW_REMINDER
+
+
+class RemindersListCacheTestCase(ApplicationTestCase):
+    """
+    Checks that cached lists aren't served after reminders were changed
+    by another worker, whose invalidations don't reach this process.
+    """
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        reminders_list_cache.configure(max_bytes=1024 * 1024, ttl=60)
+        await self.client.post("/users/register", json=CREDENTIALS)
+        await self.client.post("/users/login", json=CREDENTIALS)
+        response = await self.client.post("/reminders/", json=NEW_REMINDER)
+        self.assertEqual(response.status, 200)
+
+    async def change_titles_elsewhere(self, title: str) -> None:
+        async with self.app["session_maker"]() as session:
+            await session.execute(update(Reminder).values(
+                title=title,
+                last_edited_at=datetime.datetime.now(datetime.UTC)
+            ))
+            await session.commit()
+
+    async def test_list_changed_by_other_worker_is_not_served(self) -> None:
+        response = await self.client.get("/reminders/")
+        self.assertEqual(response.status, 200)
+        etag: str = response.headers["ETag"]
+        response = await self.client.get("/reminders/")
+        self.assertEqual(reminders_list_cache.hits, 1)
+
+        await self.change_titles_elsewhere("Changed elsewhere")
+
+        response = await self.client.get(
+            "/reminders/", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertEqual(
+            (await response.json())[0]["title"], "Changed elsewhere"
+        )
@@ -0,0 +1,41 @@
+from src.DTO.codecs import MSGPACK_CODEC
+from src.views.active_reminders import STREAM_THRESHOLD
+from .common import ApplicationTestCase, CREDENTIALS, NEW_REMINDER
+
+
+class RemindersStreamingTestCase(ApplicationTestCase):
+    """
+    Checks that long lists are streamed in every negotiated format.
+    """
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        await self.client.post("/users/register", json=CREDENTIALS)
+        await self.client.post("/users/login", json=CREDENTIALS)
+        response = await self.client.post(
+            "/reminders/batch", json=[NEW_REMINDER] * (STREAM_THRESHOLD + 1)
+        )
+        self.assertEqual(response.status, 200)
+
+    async def test_msgpack_list_is_streamed(self) -> None:
+        response = await self.client.get(
+            "/reminders/", headers={"Accept": MSGPACK_CODEC.content_type}
+        )
+        self.assertEqual(response.status, 200)
+        self.assertIsNone(response.content_length)
+        self.assertEqual(
+            response.headers["Content-Type"], MSGPACK_CODEC.content_type
+        )
+        reminders = MSGPACK_CODEC.decode(await response.read())
+
+        response = await self.client.get("/reminders/")
+        self.assertEqual(response.status, 200)
+        self.assertIsNone(response.content_length)
+        json_reminders = await response.json()
+
+        self.assertEqual(len(reminders), STREAM_THRESHOLD + 1)
+        self.assertEqual(
+            [reminder["id"] for reminder in reminders],
+            [reminder["id"] for reminder in json_reminders]
+        )
+        self.assertEqual(reminders[0]["title"], NEW_REMINDER["title"])
@@ -0,0 +1,98 @@
+import datetime
+from typing import Any
+
+from sqlalchemy import update
+
+from src.controllers.fetch_changed_reminders import SYNC_WATERMARK_MARGIN
+from src.models.reminder import Reminder
+from .common import ApplicationTestCase, CREDENTIALS, NEW_REMINDER
+
+EPOCH: str = "2000-01-01T00:00:00+00:00"
+
+
+class RemindersSyncTestCase(ApplicationTestCase):
+    """
+    Checks delta sync of reminders changed since watermark.
+    """
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        await self.client.post("/users/register", json=CREDENTIALS)
+        await self.client.post("/users/login", json=CREDENTIALS)
+        response = await self.client.post(
+            "/reminders/batch", json=[NEW_REMINDER] * 2
+        )
+        self.assertEqual(response.status, 200)
+        self.ids: list[int] = [
+            item["event_id"] for item in (await response.json())["created"]
+        ]
+
+    async def sync(self, since: str) -> tuple[dict[int, Any], str]:
+        response = await self.client.get(
+            "/reminders/", params={"since": since}
+        )
+        self.assertEqual(response.status, 200)
+        changes = await response.json()
+        return (
+            {reminder["id"]: reminder for reminder in changes["reminders"]},
+            changes["watermark"]
+        )
+
+    async def age_edits(self, delta: datetime.timedelta) -> datetime.datetime:
+        edited_at: datetime.datetime = (
+            datetime.datetime.now(datetime.UTC) - delta
+        )
+        async with self.app["session_maker"]() as session:
+            await session.execute(
+                update(Reminder).values(last_edited_at=edited_at)
+            )
+            await session.commit()
+
+        return edited_at
+
+    async def test_deactivated_reminders_are_sent_as_tombstones(
+        self
+    ) -> None:
+        response = await self.client.delete(f"/reminders/{self.ids[0]}")
+        self.assertEqual(response.status, 200)
+
+        reminders, _ = await self.sync(EPOCH)
+
+        self.assertEqual(sorted(reminders), self.ids)
+        self.assertFalse(reminders[self.ids[0]]["is_active"])
+        self.assertTrue(reminders[self.ids[1]]["is_active"])
+
+    async def test_recent_edits_stay_behind_watermark(self) -> None:
+        started_at: datetime.datetime = datetime.datetime.now(datetime.UTC)
+
+        reminders, watermark = await self.sync(EPOCH)
+
+        self.assertEqual(sorted(reminders), self.ids)
+        self.assertLessEqual(
+            datetime.datetime.fromisoformat(watermark),
+            started_at - SYNC_WATERMARK_MARGIN + datetime.timedelta(seconds=1)
+        )
+        # Edits within margin may race with commits, so they are sent again
+        reminders, _ = await self.sync(watermark)
+        self.assertEqual(sorted(reminders), self.ids)
+
+    async def test_watermark_follows_last_edit(self) -> None:
+        edited_at: datetime.datetime = await self.age_edits(
+            datetime.timedelta(hours=1)
+        )
+
+        reminders, watermark = await self.sync(EPOCH)
+        self.assertEqual(len(reminders), 2)
+        self.assertEqual(datetime.datetime.fromisoformat(watermark), edited_at)
+
+        reminders, watermark = await self.sync(watermark)
+        self.assertEqual(reminders, {})
+
+        response = await self.client.patch(
+            f"/reminders/{self.ids[1]}", json={"title": "New title"}
+        )
+        self.assertEqual(response.status, 200)
+
+        reminders, _ = await self.sync(watermark)
+        self.assertEqual(list(reminders), [self.ids[1]])
+        self.assertEqual(reminders[self.ids[1]]["title"], "New title")
@@ -0,0 +1,68 @@
+import shutil
+from pathlib import Path
+
+from aiohttp import web
+
+from src.models.replicas import ReplicaOptions, ReplicaSet
+from src.views.inject_session import RECENT_WRITE_COOKIE
+from .common import ApplicationTestCase, CREDENTIALS, NEW_REMINDER
+
+
+class ReplicasTestCase(ApplicationTestCase):
+    """
+    Checks routing of reads to replica, which is a copy of primary
+    SQLite database taken before the last write, so reads of replica
+    are told apart by outdated data.
+    """
+
+    async def get_application(self) -> web.Application:
+        app: web.Application = await super().get_application()
+        self.replica_path: Path = Path(self.directory.name) / "replica.sqlite"
+        self.replicas = ReplicaSet(
+            app["session_maker"],
+            ReplicaOptions(connections=[
+                f"sqlite+aiosqlite:///{self.replica_path}"
+            ])
+        )
+        app["replicas"] = self.replicas
+        return app
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        await self.client.post("/users/register", json=CREDENTIALS)
+        await self.client.post("/users/login", json=CREDENTIALS)
+        response = await self.client.post("/reminders/", json=NEW_REMINDER)
+        self.assertEqual(response.status, 200)
+        self.reminder_id: int = (await response.json())["event_id"]
+
+        # Replica receives everything written so far
+        shutil.copyfile(
+            Path(self.directory.name) / "remindme.sqlite", self.replica_path
+        )
+        await self.replicas.check_health()
+        self.assertTrue(self.replicas.replicas[0].healthy)
+
+        response = await self.client.patch(
+            f"/reminders/{self.reminder_id}", json={"title": "New title"}
+        )
+        self.assertEqual(response.status, 200)
+        self.assertIn(RECENT_WRITE_COOKIE, response.cookies)
+
+    async def asyncTearDown(self) -> None:
+        await self.replicas.stop()
+        await super().asyncTearDown()
+
+    async def fetch_title(self) -> str:
+        response = await self.client.get(f"/reminders/{self.reminder_id}")
+        self.assertEqual(response.status, 200)
+        return (await response.json())["title"]
+
+    async def test_read_after_write_goes_to_primary(self) -> None:
+        self.assertEqual(await self.fetch_title(), "New title")
+
+    async def test_reads_go_to_replica(self) -> None:
+        self.client.session.cookie_jar.clear(
+            lambda cookie: cookie.key == RECENT_WRITE_COOKIE
+        )
+
+        self.assertEqual(await self.fetch_title(), NEW_REMINDER["title"])
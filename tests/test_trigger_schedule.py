@@ -0,0 +1,68 @@
+import datetime
+import time
+from typing import Any, Sequence
+from unittest import mock
+
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.reminder import Reminder
+from src.models.trigger_schedule import TriggerSchedule
+from .common import ApplicationTestCase, CREDENTIALS, NEW_REMINDER
+
+
+class TriggerScheduleTestCase(ApplicationTestCase):
+    """
+    Checks that trigger times committed while schedule loads
+    upcoming reminders are not lost.
+    """
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        await self.client.post("/users/register", json=CREDENTIALS)
+        await self.client.post("/users/login", json=CREDENTIALS)
+        self.now: float = time.time()
+        response = await self.client.post("/reminders/", json={
+            **NEW_REMINDER,
+            "triggered_at": datetime.datetime.fromtimestamp(
+                self.now + 3600, datetime.UTC
+            ).isoformat()
+        })
+        self.assertEqual(response.status, 200)
+        self.reminder_id: int = (await response.json())["event_id"]
+        self.schedule = TriggerSchedule(enabled=True, horizon=7200)
+        self.schedule.loaded_until = self.now
+
+    async def load_with_update(self, when: float | None) -> None:
+        get_triggers_between = Reminder.get_triggers_between
+
+        async def commit_during_load(
+            after: datetime.datetime, until: datetime.datetime,
+            session: AsyncSession
+        ) -> Sequence[Row[Any]]:
+            rows: Sequence[Row[Any]] = await get_triggers_between(
+                after, until, session
+            )
+            self.schedule.update(self.reminder_id, when)
+            return rows
+
+        with mock.patch.object(
+            Reminder, "get_triggers_between", commit_during_load
+        ):
+            await self.schedule.load(
+                self.app["session_maker"], self.now + 7200
+            )
+
+    async def test_update_during_load_replaces_loaded_row(self) -> None:
+        await self.load_with_update(self.now + 60)
+
+        self.assertIn(self.reminder_id, self.schedule.wheel)
+        self.assertEqual(self.schedule.wheel.advance(self.now + 30), [])
+        self.assertEqual(
+            self.schedule.wheel.advance(self.now + 61), [self.reminder_id]
+        )
+
+    async def test_cancel_during_load_is_kept(self) -> None:
+        await self.load_with_update(None)
+
+        self.assertNotIn(self.reminder_id, self.schedule.wheel)